@@ -0,0 +1,149 @@
+"""
+Checklist miss-rate aggregates.
+
+`checklist_item_stats` holds, per (scenario, language, week, item), how many
+completed sessions reached the item and how many matched or missed it, so
+dashboards never have to decode turn or report JSON. Rows are bumped in the
+same transaction that completes a session (exactly once: only the write
+that moves completed_at from NULL counts), adjusted when rescoring
+replaces a completed session's report (`replace_reports`), and can be
+rebuilt from stored reports with `rebuild_checklist_stats`
+(backfill_analytics.py, migrations).
+"""
+
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import delete, insert, select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import Session, ChecklistItemStat
+
+_COUNTS = ("sessions", "matched", "missed", "critical_missed")
+
+
+def week_of(day: date | datetime | None) -> str:
+    """Monday of the week `day` falls in (default: today), as YYYY-MM-DD."""
+    if day is None:
+        day = datetime.now(timezone.utc)
+    if isinstance(day, datetime):
+        day = day.date()
+    return (day - timedelta(days=day.weekday())).isoformat()
+
+
+def _accumulate(
+    totals: dict, scenario_id: str, language: str, started_at: datetime | None, report: dict, sign: int = 1,
+) -> None:
+    week = week_of(started_at)
+    for result in report.get("checklist_results", []):
+        key = (scenario_id, language, week, result["item"])
+        counts = totals.get(key)
+        if counts is None:
+            counts = totals[key] = [result.get("is_critical", False), 0, 0, 0, 0]
+        counts[1] += sign
+        if result["status"] == "done":
+            counts[2] += sign
+        else:
+            counts[3] += sign
+            if result.get("is_critical"):
+                counts[4] += sign
+
+
+def _rows(totals: dict) -> list[dict]:
+    return [
+        {
+            "scenario_id": scenario_id, "language": language, "week": week, "item": item,
+            "is_critical": counts[0], **dict(zip(_COUNTS, counts[1:])),
+        }
+        for (scenario_id, language, week, item), counts in totals.items()
+    ]
+
+
+def _upsert():
+    stmt = sqlite_insert(ChecklistItemStat)
+    return stmt.on_conflict_do_update(
+        index_elements=["scenario_id", "language", "week", "item"],
+        set_={c: getattr(ChecklistItemStat, c) + getattr(stmt.excluded, c) for c in _COUNTS},
+    )
+
+
+async def record_completions(
+    db: AsyncSession,
+    completed: Iterable[tuple[str, str, datetime | None, dict]],
+) -> None:
+    """
+    Add newly completed sessions, given as (scenario_id, language, started_at,
+    report), to the aggregates. Call inside the completing transaction.
+    """
+    totals: dict = {}
+    for scenario_id, language, started_at, report in completed:
+        _accumulate(totals, scenario_id, language, started_at, report)
+    if totals:
+        await db.execute(_upsert(), _rows(totals))
+
+
+async def replace_reports(
+    db: AsyncSession,
+    replaced: Iterable[tuple[str, str, datetime | None, dict | None, dict]],
+) -> None:
+    """
+    Swap the reports of completed sessions, given as (scenario_id, language,
+    started_at, old report, new report), in the aggregates: the old report
+    is subtracted (None: it was never counted) and the new one added. Call
+    inside the transaction that stores the new reports.
+    """
+    totals: dict = {}
+    for scenario_id, language, started_at, old, new in replaced:
+        if old is not None:
+            _accumulate(totals, scenario_id, language, started_at, old, sign=-1)
+        _accumulate(totals, scenario_id, language, started_at, new)
+    rows = [row for row in _rows(totals) if any(row[c] for c in _COUNTS)]
+    if not rows:
+        return
+    await db.execute(_upsert(), rows)
+    # Drop rows no session reaches any more, as a rebuild would
+    stat = ChecklistItemStat
+    await db.execute(
+        delete(stat)
+        .where(stat.sessions <= 0)
+        .where(tuple_(stat.scenario_id, stat.language, stat.week, stat.item).in_(list(totals)))
+    )
+
+
+def rebuild_checklist_stats(conn: Connection, scenario_ids: list[str] | None = None, chunk_size: int = 1000) -> int:
+    """
+    Recompute the aggregates (for `scenario_ids`, or all) from the reports of
+    completed sessions. Synchronous, for migrations and `run_sync`. Returns
+    the number of sessions counted.
+    """
+    clear = delete(ChecklistItemStat)
+    if scenario_ids:
+        clear = clear.where(ChecklistItemStat.scenario_id.in_(scenario_ids))
+    conn.execute(clear)
+
+    totals: dict = {}
+    counted = 0
+    last_id = ""
+    while True:
+        query = (
+            select(Session.id, Session.scenario_id, Session.language, Session.started_at, Session.report_json)
+            .where(Session.id > last_id, Session.completed_at.is_not(None), Session.report_json.is_not(None))
+            .order_by(Session.id)
+            .limit(chunk_size)
+        )
+        if scenario_ids:
+            query = query.where(Session.scenario_id.in_(scenario_ids))
+        chunk = conn.execute(query).all()
+        if not chunk:
+            break
+        last_id = chunk[-1].id
+        for row in chunk:
+            if row.report_json:
+                _accumulate(totals, row.scenario_id, row.language, row.started_at, row.report_json)
+                counted += 1
+
+    if totals:
+        conn.execute(insert(ChecklistItemStat), _rows(totals))
+    return counted
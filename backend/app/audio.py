@@ -0,0 +1,289 @@
+"""
+Turn recordings stored on local disk.
+
+A client uploads the recording of a turn to POST /sessions/{id}/audio
+before submitting the turn, then sends the returned `url` as the turn's
+`user_audio_url`; the turn write attaches the recording to its
+SessionTurn row. The request body is streamed to disk as it arrives
+(WRITE_BUFFER bytes at a time, through anyio's worker threads), so an
+upload never holds more than that in memory, and MAX_CONCURRENT_UPLOADS
+caps how many are written at once.
+
+Files live at AUDIO_DIR/<first 2 chars of id>/<id>, written as `<id>.part`
+and renamed into place once complete; the audio_recordings row is
+inserted only after that, so a row always has its whole file behind it.
+Recordings never change after upload, which is what lets them be served
+with immutable cache headers.
+
+`AudioJanitor` deletes, every AUDIO_CLEANUP_INTERVAL seconds (0 turns it
+off), recordings still not attached to a turn AUDIO_ORPHAN_TTL seconds
+after upload, and files with no row (uploads interrupted by a crash).
+A recording some turn links to is kept even if it was never attached:
+turns only attach recordings of their own session, so batch-evaluated
+turns and turns pointing at another session's recording link to it
+without claiming it.
+
+Limits (environment):
+    AUDIO_MAX_BYTES               one recording (default 10 MB)
+    AUDIO_SESSION_QUOTA_BYTES     all recordings of one session (default 100 MB)
+    AUDIO_MIN_FREE_BYTES          free disk below which uploads are refused (default 512 MB)
+    AUDIO_MAX_CONCURRENT_UPLOADS  uploads written at once; more wait (default 8)
+"""
+
+import asyncio
+import logging
+import os
+import re
+import shutil
+import time
+import uuid
+from collections.abc import AsyncIterator
+from datetime import datetime, timedelta, timezone
+
+import anyio
+from sqlalchemy import bindparam, delete, exists, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import DB_DIR, async_session
+from .metrics import Counter, gauge
+from .models import AudioRecording, SessionTurn
+from .write_queue import write_queue
+
+logger = logging.getLogger("sushrusha.audio")
+
+AUDIO_DIR = os.getenv("AUDIO_DIR", os.path.join(DB_DIR, "audio"))
+MAX_RECORDING_BYTES = int(os.getenv("AUDIO_MAX_BYTES", str(10 * 1024 * 1024)))
+SESSION_QUOTA_BYTES = int(os.getenv("AUDIO_SESSION_QUOTA_BYTES", str(100 * 1024 * 1024)))
+MIN_FREE_BYTES = int(os.getenv("AUDIO_MIN_FREE_BYTES", str(512 * 1024 * 1024)))
+MAX_CONCURRENT_UPLOADS = int(os.getenv("AUDIO_MAX_CONCURRENT_UPLOADS", "8"))
+
+# Fewer, larger writes: each one is a hop to a worker thread
+WRITE_BUFFER = 256 * 1024
+
+# Media types accepted for upload (parameters such as codecs are dropped)
+AUDIO_TYPES = frozenset({
+    "audio/aac", "audio/flac", "audio/mp4", "audio/mpeg", "audio/ogg",
+    "audio/wav", "audio/webm", "audio/x-m4a", "audio/x-wav",
+})
+
+URL_PREFIX = "/audio/"
+_URL = re.compile(r"/audio/([0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})")
+
+uploads = Counter("sushrusha_audio_uploads", "Recordings stored")
+upload_bytes = Counter("sushrusha_audio_upload_bytes", "Bytes of recordings stored")
+rejected_uploads = Counter("sushrusha_audio_rejected_uploads", "Uploads refused for size, quota or disk space")
+orphans_removed = Counter("sushrusha_audio_orphans_removed", "Unattached recordings and stray files deleted")
+
+_upload_slots = asyncio.Semaphore(MAX_CONCURRENT_UPLOADS)
+_writing = 0
+gauge("sushrusha_audio_uploads_active", "Uploads being written to disk", lambda: _writing)
+
+
+class RecordingTooLarge(Exception):
+    pass
+
+
+def recording_url(audio_id: str) -> str:
+    return URL_PREFIX + audio_id
+
+
+def recording_id(url: str | None) -> str | None:
+    """Id of the stored recording `url` points to; None for anything else (e.g. external URLs)."""
+    if not url:
+        return None
+    match = _URL.fullmatch(url)
+    return match.group(1) if match else None
+
+
+def recording_path(audio_id: str) -> str:
+    return os.path.join(AUDIO_DIR, audio_id[:2], audio_id)
+
+
+def disk_has_room() -> bool:
+    os.makedirs(AUDIO_DIR, exist_ok=True)
+    return shutil.disk_usage(AUDIO_DIR).free >= MIN_FREE_BYTES
+
+
+async def session_audio_bytes(db: AsyncSession, session_id: str) -> int:
+    """Bytes of recordings already stored for a session, counted against its quota."""
+    result = await db.execute(
+        select(func.coalesce(func.sum(AudioRecording.size), 0)).where(AudioRecording.session_id == session_id)
+    )
+    return result.scalar_one()
+
+
+async def save_stream(chunks: AsyncIterator[bytes], max_bytes: int = MAX_RECORDING_BYTES) -> tuple[str, int]:
+    """
+    Write a streamed body to a new recording file; returns (id, size).
+    Raises RecordingTooLarge (leaving nothing behind) past `max_bytes`.
+    """
+    global _writing
+    audio_id = str(uuid.uuid4())
+    path = recording_path(audio_id)
+    partial = f"{path}.part"
+    await anyio.Path(path).parent.mkdir(parents=True, exist_ok=True)
+    size = 0
+    try:
+        async with _upload_slots:
+            _writing += 1
+            try:
+                async with await anyio.open_file(partial, "wb") as f:
+                    buffer = bytearray()
+                    async for chunk in chunks:
+                        size += len(chunk)
+                        if size > max_bytes:
+                            raise RecordingTooLarge()
+                        buffer += chunk
+                        if len(buffer) >= WRITE_BUFFER:
+                            await f.write(buffer)
+                            buffer.clear()
+                    if buffer:
+                        await f.write(buffer)
+            finally:
+                _writing -= 1
+        await anyio.Path(partial).rename(path)
+    except BaseException:  # including a client that disconnects mid-upload
+        await anyio.Path(partial).unlink(missing_ok=True)
+        raise
+    return audio_id, size
+
+
+async def delete_files(audio_ids: list[str]) -> None:
+    def unlink_all() -> None:
+        for audio_id in audio_ids:
+            try:
+                os.remove(recording_path(audio_id))
+            except FileNotFoundError:
+                pass
+    await asyncio.to_thread(unlink_all)
+
+
+async def attach_recordings(db: AsyncSession, session_id: str, turns: list[tuple[str, str | None]]) -> None:
+    """
+    Attach stored recordings to the turns that reference them, given
+    (turn id, user_audio_url) pairs. Only unattached recordings of the same
+    session are claimed; other URLs are left as plain links.
+    """
+    attached = [
+        {"b_id": audio_id, "b_turn_id": turn_id}
+        for turn_id, url in turns
+        if (audio_id := recording_id(url)) is not None
+    ]
+    if not attached:
+        return
+    table = AudioRecording.__table__
+    await db.execute(
+        update(table)
+        .where(
+            table.c.id == bindparam("b_id"),
+            table.c.session_id == session_id,
+            table.c.turn_id.is_(None),
+        )
+        .values(turn_id=bindparam("b_turn_id")),
+        attached,
+    )
+
+
+# ── Orphan cleanup ─────────────────────────────────────────────
+
+
+async def _delete_unattached(cutoff: datetime, chunk_size: int = 500) -> list[str]:
+    """Delete rows of recordings uploaded before `cutoff`, never attached and not linked to; returns their ids."""
+    removed: list[str] = []
+    linked = exists().where(SessionTurn.user_audio_url == literal(URL_PREFIX) + AudioRecording.id)
+    while True:
+        async def op(db: AsyncSession) -> list[str]:
+            stale = (
+                select(AudioRecording.id)
+                .where(AudioRecording.turn_id.is_(None), AudioRecording.created_at < cutoff, ~linked)
+                .limit(chunk_size)
+            )
+            result = await db.execute(
+                delete(AudioRecording).where(AudioRecording.id.in_(stale)).returning(AudioRecording.id)
+            )
+            return list(result.scalars())
+        # Small transactions, so turns are not held up behind the cleanup
+        ids = await write_queue.submit(op)
+        removed += ids
+        if len(ids) < chunk_size:
+            return removed
+
+
+def _stray_files(cutoff: float) -> tuple[list[str], list[str]]:
+    """(ids of complete files, paths of partial uploads) last modified before `cutoff`."""
+    files, partials = [], []
+    if not os.path.isdir(AUDIO_DIR):
+        return files, partials
+    for shard in os.scandir(AUDIO_DIR):
+        if not shard.is_dir():
+            continue
+        for entry in os.scandir(shard.path):
+            if entry.stat().st_mtime >= cutoff:
+                continue
+            if entry.name.endswith(".part"):
+                partials.append(entry.path)
+            else:
+                files.append(entry.name)
+    return files, partials
+
+
+async def cleanup_orphans(ttl: float) -> int:
+    """Delete recordings unattached for `ttl` seconds and files without a row; returns how many."""
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=ttl)
+    removed = await _delete_unattached(cutoff)
+    await delete_files(removed)
+
+    # Rows are inserted after their file is complete, so an old file
+    # without a row was never acknowledged to any client
+    files, partials = await asyncio.to_thread(_stray_files, time.time() - ttl)
+    stray = []
+    async with async_session() as db:
+        for i in range(0, len(files), 500):
+            chunk = files[i:i + 500]
+            known = set((await db.execute(select(AudioRecording.id).where(AudioRecording.id.in_(chunk)))).scalars())
+            stray += [audio_id for audio_id in chunk if audio_id not in known]
+    await delete_files(stray)
+    for path in partials:
+        await anyio.Path(path).unlink(missing_ok=True)
+
+    count = len(removed) + len(stray) + len(partials)
+    orphans_removed.inc(count)
+    return count
+
+
+class AudioJanitor:
+    def __init__(self, interval: float = 600.0, ttl: float = 86400.0):
+        self.interval = interval
+        self.ttl = ttl
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                removed = await cleanup_orphans(self.ttl)
+            except Exception:  # keep cleaning up
+                logger.exception("Audio cleanup failed")
+                continue
+            if removed:
+                logger.info("Removed %d orphaned recording(s)", removed)
+
+
+audio_janitor = AudioJanitor(
+    interval=float(os.getenv("AUDIO_CLEANUP_INTERVAL", "600")),
+    ttl=float(os.getenv("AUDIO_ORPHAN_TTL", "86400")),
+)
@@ -0,0 +1,181 @@
+"""
+Stable integer ids for checklist items, and per-turn outcomes as rows.
+
+Every distinct checklist item name of a scenario gets an ordinal in the
+`checklist_items` table the first time it is seen. Ordinals are never
+reused or renumbered, so stored outcomes stay decodable after items are
+reworded, reordered or removed, and a scenario may accumulate any number
+of them. A turn's matched / missed / critical-missed lists are stored in
+`turn_outcomes` as one narrow (turn_id, ordinal, outcome) row per item,
+`outcome` being MATCHED / MISSED / CRITICAL_MISSED flags, instead of JSON
+lists of item names. Reads fetch a turn's rows packed into one column
+(`outcomes_column`), which `decode_outcome` turns back into the lists the
+API returns.
+"""
+
+import logging
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.engine import Connection
+
+from .models import ScenarioChecklistItem, TurnOutcome
+from .scenario_graph import CompiledScenario
+from .scenario_loader import get_compiled_scenarios
+
+logger = logging.getLogger("sushrusha.checklist")
+
+MATCHED, MISSED, CRITICAL_MISSED = 1, 2, 4
+
+OUTCOME_FIELDS = (
+    ("matched_items", MATCHED),
+    ("missed_items", MISSED),
+    ("critical_missed", CRITICAL_MISSED),
+)
+
+# outcomes_column packs each row as ordinal * _PACK + outcome
+_PACK = 8
+
+
+class ChecklistIndex:
+    """Item name <-> ordinal mapping of one scenario."""
+
+    __slots__ = ("scenario_id", "ordinals", "names")
+
+    def __init__(self, scenario_id: str, rows: Iterable[tuple[int, str]]):
+        self.scenario_id = scenario_id
+        self.ordinals: dict[str, int] = {}
+        self.names: dict[int, str] = {}
+        for ordinal, name in rows:
+            self.ordinals[name] = ordinal
+            self.names[ordinal] = name
+
+    def encode(self, eval_result: dict) -> dict[int, int]:
+        """ordinal -> outcome flags for an evaluate_turn result."""
+        ordinals = self.ordinals
+        outcome: dict[int, int] = {}
+        for names, flag in OUTCOME_FIELDS:
+            for name in eval_result[names]:
+                ordinal = ordinals[name]
+                outcome[ordinal] = outcome.get(ordinal, 0) | flag
+        return outcome
+
+    def decode(self, outcome: Mapping[int, int]) -> dict:
+        """
+        The lists of item names, in ordinal order (checklist order for
+        unedited scenarios). Ordinals without a name (rows written under
+        another database's checklist_items, say) are skipped with a warning.
+        """
+        lists = {names: [] for names, _ in OUTCOME_FIELDS}
+        for ordinal in sorted(outcome):
+            name = self.names.get(ordinal)
+            if name is None:
+                logger.warning("Skipping unknown checklist item ordinal %d of scenario %s", ordinal, self.scenario_id)
+                continue
+            flags = outcome[ordinal]
+            for names, flag in OUTCOME_FIELDS:
+                if flags & flag:
+                    lists[names].append(name)
+        return lists
+
+
+_indexes: dict[str, ChecklistIndex] = {}
+_EMPTY = ChecklistIndex("", ())
+
+
+def get_index(scenario_id: str) -> ChecklistIndex:
+    return _indexes.get(scenario_id, _EMPTY)
+
+
+def encode_outcome(scenario_id: str, eval_result: dict) -> dict[int, int]:
+    """ordinal -> outcome flags for an evaluate_turn result."""
+    return _indexes[scenario_id].encode(eval_result)
+
+
+def outcome_rows(turn_id: str, outcome: Mapping[int, int]) -> list[dict]:
+    """turn_outcomes rows for one turn's encoded outcome."""
+    return [{"turn_id": turn_id, "ordinal": ordinal, "outcome": flags} for ordinal, flags in outcome.items()]
+
+
+def outcomes_column(turn_id):
+    """A turn's outcome rows packed into one text column, selectable next to the turn."""
+    return (
+        select(func.group_concat(TurnOutcome.ordinal * _PACK + TurnOutcome.outcome))
+        .where(TurnOutcome.turn_id == turn_id)
+        .scalar_subquery()
+        .label("outcomes")
+    )
+
+
+def parse_outcomes(packed: str | None) -> dict[int, int]:
+    """ordinal -> outcome flags from an outcomes_column value."""
+    if not packed:
+        return {}
+    return {code // _PACK: code % _PACK for code in map(int, packed.split(","))}
+
+
+def decode_outcome(scenario_id: str, packed: str | None) -> dict:
+    """matched_items / missed_items / critical_missed lists from an outcomes_column value."""
+    return get_index(scenario_id).decode(parse_outcomes(packed))
+
+
+def sync_checklist_items(
+    conn: Connection,
+    extra: dict[str, set[str]] | None = None,
+    scenarios: Mapping[str, CompiledScenario] | None = None,
+) -> None:
+    """
+    Give every checklist item of `scenarios` (default: the published set),
+    plus `extra` names per scenario (e.g. items only found in stored turns),
+    an ordinal, and load the mappings. Synchronous, for init_db, migrations
+    and `run_sync`. Ordinals only ever get added, so the loaded mappings
+    keep covering scenario sets published earlier.
+    """
+    table = ScenarioChecklistItem.__table__
+    known: dict[str, dict[str, list]] = {}  # scenario -> item -> [ordinal, is_critical]
+    for r in conn.execute(select(table.c.scenario_id, table.c.ordinal, table.c.item, table.c.is_critical)):
+        known.setdefault(r.scenario_id, {})[r.item] = [r.ordinal, r.is_critical]
+
+    # is_critical None: keep whatever is stored
+    wanted: dict[str, dict[str, bool | None]] = {}
+    for scenario in (scenarios if scenarios is not None else get_compiled_scenarios()).values():
+        items = wanted.setdefault(scenario.id, {})
+        for node in scenario.nodes.values():
+            for check in node.checklist:
+                items.setdefault(check.item, check.is_critical)
+    for scenario_id, names in (extra or {}).items():
+        items = wanted.setdefault(scenario_id, {})
+        for name in names:
+            items.setdefault(name, None)
+
+    new_rows, changed = [], []
+    for scenario_id, items in wanted.items():
+        existing = known.setdefault(scenario_id, {})
+        next_ordinal = max((o for o, _ in existing.values()), default=-1) + 1
+        for name, is_critical in items.items():
+            if name in existing:
+                if is_critical is not None and existing[name][1] != is_critical:
+                    existing[name][1] = is_critical
+                    changed.append({"b_scenario_id": scenario_id, "b_item": name, "is_critical": is_critical})
+                continue
+            existing[name] = [next_ordinal, bool(is_critical)]
+            new_rows.append({
+                "scenario_id": scenario_id, "ordinal": next_ordinal, "item": name, "is_critical": bool(is_critical),
+            })
+            next_ordinal += 1
+
+    if new_rows:
+        conn.execute(insert(table), new_rows)
+    if changed:
+        conn.execute(
+            update(table)
+            .where(table.c.scenario_id == bindparam("b_scenario_id"), table.c.item == bindparam("b_item"))
+            .values(is_critical=bindparam("is_critical")),
+            changed,
+        )
+
+    _indexes.clear()
+    _indexes.update({
+        scenario_id: ChecklistIndex(scenario_id, ((ordinal, name) for name, (ordinal, _) in items.items()))
+        for scenario_id, items in known.items()
+    })
@@ -1,6 +1,8 @@
 """SQLAlchemy async engine and session factory for SQLite."""
 
+import json
 import os
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.orm import DeclarativeBase
 
@@ -8,19 +10,57 @@ DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data")
 os.makedirs(DB_DIR, exist_ok=True)
 DATABASE_URL = os.getenv("DATABASE_URL", f"sqlite+aiosqlite:///{os.path.join(DB_DIR, 'sushrusha.db')}")
 
-engine = create_async_engine(DATABASE_URL, echo=False)
-async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
+def _json_serializer(obj) -> str:
+    # Compact and UTF-8 as-is: smaller rows, and report_json can be sent verbatim
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+
+
+engine = create_async_engine(DATABASE_URL, echo=False, json_serializer=_json_serializer)
+
+# Applied to every new SQLite connection. WAL lets readers proceed while a
+# writer commits; NORMAL sync is durable across app crashes in WAL mode.
+SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    "cache_size": -32000,  # KiB, i.e. ~32 MB page cache
+    "mmap_size": 256 * 1024 * 1024,
+}
+
+if engine.url.get_backend_name() == "sqlite":
+    @event.listens_for(engine.sync_engine, "connect")
+    def _configure_sqlite(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in SQLITE_PRAGMAS.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+async_session = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
 
 class Base(DeclarativeBase):
     pass
 
 
 async def init_db():
-    """Create all tables."""
+    """
+    Create or migrate the schema unless the database is already at the
+    current schema version, then load checklist item ids and record the
+    loaded scenario versions.
+    """
     from . import models  # noqa: F401
+    from .migrations import SCHEMA_VERSION, get_schema_version, migrate
+    from .checklist_items import sync_checklist_items
+    from .scenario_versions import record_versions
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+        # A database at SCHEMA_VERSION matches the models, so a restart costs
+        # one PRAGMA instead of create_all's reflection of every table
+        if await conn.run_sync(get_schema_version) != SCHEMA_VERSION:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.run_sync(migrate)
+        await conn.run_sync(sync_checklist_items)
+        await conn.run_sync(record_versions)
 
 
 async def get_db():
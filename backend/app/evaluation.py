@@ -5,22 +5,344 @@ Each scenario node defines expected checklist items with keywords.
 Worker text is matched against those keywords to produce deterministic results.
 """
 
-import re
-from typing import Any
+from collections import Counter
+from collections.abc import Sequence
+from dataclasses import dataclass
+from itertools import chain
+
+from .normalization import fold_keys, is_indic, match_keys, trigrams
+
+
+@dataclass(frozen=True, slots=True)
+class ChecklistItem:
+    """A checklist entry with its type and keywords normalized up front."""
+
+    item: str
+    is_critical: bool
+    keywords: tuple[str, ...]
+    max_edits: int | None = None  # fuzzy matching threshold; None follows the scenario
+    romanized: tuple[str, ...] = ()  # romanized Hindi keywords, matched with spelling folds
+
+    @classmethod
+    def from_dict(cls, check: dict) -> "ChecklistItem":
+        return cls(
+            item=check.get("item", ""),
+            is_critical=check.get("type", "normal") == "critical",
+            keywords=tuple(kw.lower() for kw in check.get("keywords", [])),
+            max_edits=check.get("max_edits"),
+            romanized=tuple(kw.lower() for kw in check.get("romanized_keywords", [])),
+        )
+
+
+# Keywords shorter than this (as match keys), and numbers, only match whole words
+MIN_PREFIX = 3
+
+# Fuzzy matching never allows more edits than this per word
+MAX_EDITS = 2
+
+# What may follow a keyword's last word inside a text word: inflections
+# ("kick" -> "kicks", "bleed" -> "bleeding"), not any continuation ("rest"
+# -> "restaurant"), optionally after a doubled final letter ("stop" ->
+# "stopped"). Romanized endings are noun and adjective inflections, as
+# folded keys ("dard" -> "dardon").
+ENGLISH_ENDINGS = frozenset({"s", "es", "ed", "d", "ing", "ings", "er", "ers", "est", "ly"})
+ROMANIZED_ENDINGS = frozenset({"a", "e", "i", "o", "on", "en", "yan", "yon", "iyan", "iyon"})
 
+# Romanized keyword words shorter than this (as folded keys) only match
+# whole words: a short stem plus a vowel ending spells too many English
+# words ("laat" -> "late", "taap" -> "tape", "haath" -> "hate")
+ROMANIZED_MIN_STEM = 5
+
+
+def _inflects(stem: str, rest: str, endings: frozenset[str]) -> bool:
+    """Whether a text word `stem + rest` is an inflected form of keyword word `stem`."""
+    return not rest or rest in endings or (len(rest) > 1 and rest[0] == stem[-1] and rest[1:] in endings)
+
+
+def fuzzy_edits(key: str, max_edits: int = MAX_EDITS) -> int:
+    """
+    Edits allowed for keyword word `key` under a threshold of `max_edits`.
+
+    1 edit from 7 letters, 2 from 11. Shorter words are too close to other
+    words to tolerate typos ("fever" is one edit from "never", "bleed" from
+    "breed"), so they only match exactly, as do words with digits ("108",
+    "2nd"). This also keeps the trigram filter selective (see
+    KeywordMatcher): a word within d edits shares at least 3 trigrams with
+    the keyword.
+    """
+    if any(ch.isdigit() for ch in key):
+        return 0
+    return max(0, min(max_edits, MAX_EDITS, (len(key) - 3) // 4))
 
-def _normalize(text: str) -> str:
-    """Lowercase, strip extra whitespace, remove common punctuation."""
-    text = text.lower().strip()
-    text = re.sub(r"[.,!?;:'\"-]+", " ", text)
-    text = re.sub(r"\s+", " ", text)
-    return text
 
+class KeywordMatcher:
+    """
+    Inverted index from word match keys to the checklist items of one node.
+
+    Built once per node. Keywords and worker text are reduced to match keys
+    with the same pipeline (see normalization.py). `match` then does one
+    dictionary lookup per word of the text (plus one per prefix length for
+    inflected forms) instead of scanning the text for every keyword.
+
+    Romanized Hindi keywords (an item's `romanized_keywords`, and keywords
+    in native script) are kept in a second index under folded keys and
+    looked up with the folded keys of the text, so "khoon", "khun" and
+    "खून" meet there while English keywords and words are never folded.
+    Text words that are words of the node's English keywords are left out
+    of that lookup, whatever they fold to.
+
+    A keyword matches at word boundaries only: "rest" matches "rest" and
+    "resting" but not "interest" or "restaurant". Its last word may be
+    followed by an inflection (ENGLISH_ENDINGS, ROMANIZED_ENDINGS: "kick"
+    matches "kicks") unless it is shorter than MIN_PREFIX (ROMANIZED_MIN_STEM
+    for romanized keywords) or a number; multi-word keywords match
+    consecutive words.
+
+    `triggers` are extra (keywords, romanized keywords) groups (the node's
+    keyword branches, see scenario_graph) indexed after the checklist
+    items, so one `match` call answers both.
+
+    Fuzzy matching (typos, speech-to-text slips: "hedache") is opt-in, per
+    scenario with `fuzzy` or per item with `max_edits`, for keyword words
+    of 7 letters or more (see fuzzy_edits), never on the first letter. Single-word
+    keywords of those items also go into a trigram index; a text word is
+    compared by edit distance only with the keywords it shares enough
+    trigrams with to be within their threshold, so the cost stays a few
+    lookups per word rather than a comparison with every keyword. Phrases
+    still match exactly.
+    """
 
-def evaluate_turn(user_text: str, expected_checklist: list[dict]) -> dict:
+    __slots__ = ("items", "size", "_always", "_english", "_english_words", "_romanized")
+
+    def __init__(
+        self,
+        expected_checklist: Sequence[dict | ChecklistItem],
+        triggers: Sequence[tuple[Sequence[str], Sequence[str]]] = (),
+        fuzzy: bool = False,
+    ):
+        self.items = tuple(
+            c if isinstance(c, ChecklistItem) else ChecklistItem.from_dict(c)
+            for c in expected_checklist
+        )
+        default_edits = MAX_EDITS if fuzzy else 0
+        groups = [
+            (check.keywords, check.romanized, default_edits if check.max_edits is None else check.max_edits)
+            for check in self.items
+        ]
+        groups += [
+            (tuple(kw.lower() for kw in keywords), tuple(kw.lower() for kw in romanized), default_edits)
+            for keywords, romanized in triggers
+        ]
+        self.size = len(groups)
+        always: set[int] = set()
+        # (index, word keys, edits allowed) per keyword
+        english: list[tuple[int, list[str], int]] = []
+        romanized: list[tuple[int, list[str], int]] = []
+
+        for idx, (keywords, romanized_keywords, max_edits) in enumerate(groups):
+            tagged = [(kw, False) for kw in keywords] + [(kw, True) for kw in romanized_keywords]
+            for kw, is_romanized in tagged:
+                if not kw.strip():
+                    # An empty keyword has always matched every text
+                    always.add(idx)
+                    continue
+                keys = match_keys(kw)
+                if not keys:
+                    continue  # punctuation only; validation flags these
+                if is_romanized or is_indic(kw):
+                    romanized.append((idx, fold_keys(keys), max_edits))
+                else:
+                    english.append((idx, keys, max_edits))
+
+        self._always = frozenset(always)
+        self._english = _KeyIndex(english, ENGLISH_ENDINGS, MIN_PREFIX)
+        self._english_words = frozenset(key for _, keys, _ in english for key in keys)
+        self._romanized = _KeyIndex(romanized, ROMANIZED_ENDINGS, ROMANIZED_MIN_STEM) if romanized else None
+
+    def match(self, keys: Sequence[str]) -> set[int]:
+        """Return indices of checklist items (and triggers) with a keyword in the text with match keys `keys`."""
+        found = set(self._always)
+        if self._english.match(keys, found, self.size):
+            return found
+        folded = None
+        if self._romanized is not None:
+            # "" never matches: keeps an English keyword's word out of the romanized lookup
+            english_words = self._english_words
+            folded = fold_keys(["" if key in english_words else key for key in keys])
+            if self._romanized.match(folded, found, self.size):
+                return found
+        self._english.match_fuzzy(keys, found)
+        if folded is not None:
+            self._romanized.match_fuzzy(folded, found)
+        return found
+
+
+class _KeyIndex:
+    """Exact, prefix and fuzzy lookups over the word keys of one kind of keyword (see KeywordMatcher)."""
+
+    __slots__ = (
+        "_endings", "_exact", "_prefix", "_prefix_lengths", "_stems",
+        "_fuzzy", "_fuzzy_needed", "_grams", "_fuzzy_min_length",
+    )
+
+    def __init__(self, keywords: Sequence[tuple[int, list[str], int]], endings: frozenset[str], min_stem: int):
+        self._endings = endings
+        # first word key -> [(index, keys of the remaining words, last word may be inflected)]
+        exact: dict[str, list[tuple[int, tuple[str, ...], bool]]] = {}
+        prefix: dict[str, set[int]] = {}
+        # keyword word key -> {index: edits allowed}
+        fuzzy_keys: dict[str, dict[int, int]] = {}
+
+        for idx, keys, max_edits in keywords:
+            last = keys[-1]
+            open_ended = len(last) >= min_stem and not last.isdigit()
+            if len(keys) == 1 and open_ended:
+                prefix.setdefault(last, set()).add(idx)
+            else:
+                exact.setdefault(keys[0], []).append((idx, tuple(keys[1:]), open_ended))
+            edits = fuzzy_edits(last, max_edits) if len(keys) == 1 else 0
+            if edits:
+                allowed = fuzzy_keys.setdefault(last, {})
+                allowed[idx] = max(edits, allowed.get(idx, 0))
+
+        self._exact = {k: tuple(v) for k, v in exact.items()}
+        self._prefix = {k: frozenset(v) for k, v in prefix.items()}
+        self._prefix_lengths = tuple(sorted({len(k) for k in prefix}))
+        # First MIN_PREFIX characters of every prefix key: most words of a
+        # text start with none of them and cost a single lookup
+        self._stems = frozenset(k[:MIN_PREFIX] for k in prefix)
+
+        # Fuzzy entries: (key, edits allowed for any index, ((index, edits
+        # allowed), ...)), the trigrams each needs a word to share, and
+        # trigram -> entry numbers. An edit changes at most 3 trigrams, so a
+        # word within d edits of a key shares all but 3d of the key's.
+        fuzzy_entries = []
+        needed = []
+        grams: dict[str, list[int]] = {}
+        for key, allowed in fuzzy_keys.items():
+            edits = max(allowed.values())
+            key_grams = trigrams(key)
+            for gram in key_grams:
+                grams.setdefault(gram, []).append(len(fuzzy_entries))
+            fuzzy_entries.append((key, edits, tuple(allowed.items())))
+            needed.append(len(key_grams) - 3 * edits)
+        self._fuzzy = tuple(fuzzy_entries)
+        self._fuzzy_needed = tuple(needed)
+        self._grams = {g: tuple(v) for g, v in grams.items()}
+        self._fuzzy_min_length = min((len(key) - edits for key, edits, _ in fuzzy_entries), default=0)
+
+    def match(self, keys: Sequence[str], found: set[int], size: int) -> bool:
+        """Add the indices with a keyword in `keys` to `found`; True once all `size` are there."""
+        exact, prefix, lengths, stems, endings = self._exact, self._prefix, self._prefix_lengths, self._stems, self._endings
+        n = len(keys)
+        for i, key in enumerate(keys):
+            if key[:MIN_PREFIX] in stems:
+                for length in lengths:
+                    if length > len(key):
+                        break
+                    hits = prefix.get(key[:length])
+                    if hits and _inflects(key[:length], key[length:], endings):
+                        found |= hits
+            entries = exact.get(key)
+            if entries:
+                for idx, rest, open_ended in entries:
+                    if idx in found or i + len(rest) >= n:
+                        continue
+                    if _phrase_at(keys, i + 1, rest, open_ended, endings):
+                        found.add(idx)
+            if len(found) == size:
+                return True
+        return False
+
+    def match_fuzzy(self, keys: Sequence[str], found: set[int]) -> None:
+        entries, needed, grams, min_length = self._fuzzy, self._fuzzy_needed, self._grams, self._fuzzy_min_length
+        if not entries:
+            return
+        for key in set(keys):
+            if len(key) < min_length:
+                continue
+            postings = [grams[g] for g in trigrams(key) if g in grams]
+            if not postings:
+                continue
+            shared = Counter(chain.from_iterable(postings)) if len(postings) > 1 else dict.fromkeys(postings[0], 1)
+            for e, count in shared.items():
+                if count < needed[e]:
+                    continue
+                target, edits, allowed = entries[e]
+                if target == key:
+                    continue  # matched exactly already
+                distance = _prefix_edit_distance(target, key, edits, self._endings)
+                if distance is not None:
+                    found.update(idx for idx, limit in allowed if distance <= limit)
+
+
+def _prefix_edit_distance(
+    keyword: str, word: str, limit: int, endings: frozenset[str] = ENGLISH_ENDINGS,
+) -> int | None:
+    """
+    Levenshtein distance from `keyword` to the closest inflected form of it
+    that `word` spells (see _inflects), or None if it is above `limit`.
+    The first letter is never edited: slips rarely hit it, and words that
+    differ there are usually other words ("bleeding", "pleading").
+    """
+    if not word or word[0] != keyword[0]:
+        return None
+    return _prefix_edits(keyword, 1, word, 1, limit, endings)
+
+
+def _prefix_edits(keyword: str, i: int, word: str, j: int, limit: int, endings: frozenset[str]) -> int | None:
+    # Equal characters are always matched (never worse than editing them),
+    # so only mismatches branch, and limit <= MAX_EDITS keeps that to 3^limit
+    n, m = len(keyword), len(word)
+    while i < n and j < m and keyword[i] == word[j]:
+        i += 1
+        j += 1
+    if i == n:
+        # Keyword used up: what is left of the word must be an inflection,
+        # after at most `limit` inserted letters
+        for inserted in range(min(limit, m - j) + 1):
+            if _inflects(keyword, word[j + inserted:], endings):
+                return inserted
+        return None
+    if j == m:
+        return n - i if n - i <= limit else None
+    if limit == 0:
+        return None
+    best = None
+    for di, dj in ((1, 1), (1, 0), (0, 1)):  # substitute, delete, insert
+        edits = _prefix_edits(keyword, i + di, word, j + dj, limit - 1, endings)
+        if edits is not None and (best is None or edits < best):
+            best = edits
+    return None if best is None else best + 1
+
+
+def _phrase_at(
+    keys: Sequence[str], start: int, rest: tuple[str, ...], open_ended: bool, endings: frozenset[str],
+) -> bool:
+    """Whether `rest` follows at `start` (the last word possibly inflected)."""
+    if not rest:
+        return True
+    last = len(rest) - 1
+    for j, want in enumerate(rest):
+        got = keys[start + j]
+        if got != want and not (
+            j == last and open_ended and got.startswith(want) and _inflects(want, got[len(want):], endings)
+        ):
+            return False
+    return True
+
+
+def evaluate_turn(
+    user_text: str,
+    expected_checklist: Sequence[dict | ChecklistItem],
+    matcher: KeywordMatcher | None = None,
+) -> dict:
     """
     Evaluate a single turn against the node's checklist.
 
+    `matcher` should be the precompiled KeywordMatcher for this checklist
+    (see scenario_graph); one is built on the fly when omitted.
+
     Each checklist item has:
         {
             "item": "Ask about danger signs",
@@ -36,25 +358,25 @@ def evaluate_turn(user_text: str, expected_checklist: list[dict]) -> dict:
             "notes": "..."
         }
     """
-    normalized = _normalize(user_text)
+    if matcher is None:
+        matcher = KeywordMatcher(expected_checklist)
+    # An item is matched if ANY of its keywords appear in the user text
+    return evaluate_hits(matcher, matcher.match(match_keys(user_text)))
+
+
+def evaluate_hits(matcher: KeywordMatcher, hits: set[int]) -> dict:
+    """The evaluate_turn result for the indices `matcher.match` returned."""
     matched = []
     missed = []
     critical_missed = []
 
-    for check in expected_checklist:
-        item_name = check.get("item", "")
-        keywords = check.get("keywords", [])
-        item_type = check.get("type", "normal")
-
-        # An item is matched if ANY of its keywords appear in the user text
-        is_matched = any(kw.lower() in normalized for kw in keywords)
-
-        if is_matched:
-            matched.append(item_name)
+    for idx, check in enumerate(matcher.items):
+        if idx in hits:
+            matched.append(check.item)
         else:
-            missed.append(item_name)
-            if item_type == "critical":
-                critical_missed.append(item_name)
+            missed.append(check.item)
+            if check.is_critical:
+                critical_missed.append(check.item)
 
     notes = ""
     if critical_missed:
@@ -72,85 +394,82 @@ def evaluate_turn(user_text: str, expected_checklist: list[dict]) -> dict:
     }
 
 
-def generate_report(turns: list[dict], scenario_data: dict) -> dict:
+def new_report_state() -> dict:
     """
-    Generate final session report from all turn evaluations.
+    Empty running aggregate for a session (see update_report_state). It
+    holds per-item state and weights only, so it stays the same size however
+    many turns are played; the transcript is built from the turn rows when
+    the report is finalized.
+    """
+    return {
+        "items": {},  # item_name -> { matched, is_critical }, in first-seen order
+        "earned_weight": 0.0,
+        "total_weight": 0.0,
+    }
+
+
+def update_report_state(state: dict, turn: dict, checklist: Sequence[ChecklistItem]) -> None:
+    """
+    Fold one evaluated turn into a session's running report aggregate.
 
     Args:
-        turns: list of { node_key, matched_items, missed_items, critical_missed, user_text }
-        scenario_data: the full scenario JSON with nodes
+        state: aggregate from new_report_state(), updated in place
+        turn: { matched_items, ... } as returned by evaluate_turn
+        checklist: the turn node's checklist
+    """
+    items = state["items"]
+    matched_items = turn.get("matched_items", [])
 
-    Returns:
-        {
-            "score": 0-100,
-            "checklist_results": [{ "item", "status", "is_critical" }],
-            "critical_misses": [...],
-            "suggestions": [...],
-            "transcript": [...]
-        }
+    for check in checklist:
+        info = items.get(check.item)
+        if info is None:
+            info = items[check.item] = {"matched": False, "is_critical": check.is_critical}
+            state["total_weight"] += 2.0 if check.is_critical else 1.0
+        # If matched in any turn, mark as matched
+        if not info["matched"] and check.item in matched_items:
+            info["matched"] = True
+            state["earned_weight"] += 2.0 if info["is_critical"] else 1.0
+
+
+def transcript_entry(turn: dict, patient_text: str) -> dict:
     """
-    # Aggregate all checklist items across all visited nodes
-    all_items: dict[str, dict[str, Any]] = {}  # item_name -> { matched, is_critical }
-    nodes_map = scenario_data.get("nodes", {})
+    One report transcript line.
 
-    for turn in turns:
-        node_key = turn.get("node_key", "")
-        node = nodes_map.get(node_key, {})
-        checklist = node.get("expected_checklist", [])
-
-        for check in checklist:
-            item_name = check.get("item", "")
-            item_type = check.get("type", "normal")
-            if item_name not in all_items:
-                all_items[item_name] = {
-                    "matched": False,
-                    "is_critical": item_type == "critical",
-                }
-            # If matched in any turn, mark as matched
-            if item_name in turn.get("matched_items", []):
-                all_items[item_name]["matched"] = True
-
-    # Build checklist results
+    Args:
+        turn: { turn_index, user_text, matched_items, missed_items }
+        patient_text: the turn node's English patient text
+    """
+    return {
+        "turn": turn.get("turn_index", 0),
+        "patient": patient_text,
+        "worker": turn.get("user_text", ""),
+        "matched": turn.get("matched_items", []),
+        "missed": turn.get("missed_items", []),
+    }
+
+
+def finalize_report(state: dict, transcript: list[dict]) -> dict:
+    """Build the final report from a running aggregate and the session's transcript entries."""
     checklist_results = []
     critical_misses = []
-    total_weight = 0
-    earned_weight = 0
-
-    for item_name, info in all_items.items():
-        weight = 2.0 if info["is_critical"] else 1.0
-        total_weight += weight
 
+    for item_name, info in state["items"].items():
         status = "done" if info["matched"] else "missed"
         checklist_results.append({
             "item": item_name,
             "status": status,
             "is_critical": info["is_critical"],
         })
-
-        if info["matched"]:
-            earned_weight += weight
-        elif info["is_critical"]:
+        if not info["matched"] and info["is_critical"]:
             critical_misses.append(item_name)
 
     # Score calculation
-    score = round((earned_weight / total_weight) * 100, 1) if total_weight > 0 else 0
+    total_weight = state["total_weight"]
+    score = round((state["earned_weight"] / total_weight) * 100, 1) if total_weight > 0 else 0
 
     # Generate suggestions based on misses
     suggestions = _generate_suggestions(checklist_results, critical_misses)
 
-    # Build transcript
-    transcript = []
-    for turn in turns:
-        node_key = turn.get("node_key", "")
-        node = nodes_map.get(node_key, {})
-        transcript.append({
-            "turn": turn.get("turn_index", 0),
-            "patient": node.get("patient_text", {}).get("en", ""),
-            "worker": turn.get("user_text", ""),
-            "matched": turn.get("matched_items", []),
-            "missed": turn.get("missed_items", []),
-        })
-
     return {
         "score": score,
         "checklist_results": checklist_results,
@@ -160,6 +479,36 @@ def generate_report(turns: list[dict], scenario_data: dict) -> dict:
     }
 
 
+def generate_report(turns: list[dict], scenario_data: dict) -> dict:
+    """
+    Generate final session report from all turn evaluations.
+
+    Args:
+        turns: list of { node_key, matched_items, missed_items, critical_missed, user_text }
+        scenario_data: the full scenario JSON with nodes
+
+    Returns:
+        {
+            "score": 0-100,
+            "checklist_results": [{ "item", "status", "is_critical" }],
+            "critical_misses": [...],
+            "suggestions": [...],
+            "transcript": [...]
+        }
+    """
+    state = new_report_state()
+    transcript = []
+    nodes_map = scenario_data.get("nodes", {})
+
+    for turn in turns:
+        node = nodes_map.get(turn.get("node_key", ""), {})
+        checklist = [ChecklistItem.from_dict(c) for c in node.get("expected_checklist", [])]
+        update_report_state(state, turn, checklist)
+        transcript.append(transcript_entry(turn, node.get("patient_text", {}).get("en", "")))
+
+    return finalize_report(state, transcript)
+
+
 def _generate_suggestions(checklist_results: list[dict], critical_misses: list[str]) -> list[str]:
     """Generate actionable suggestions based on missed items."""
     suggestions = []
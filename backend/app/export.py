@@ -0,0 +1,194 @@
+"""
+Streaming export of sessions and their turns as NDJSON or CSV.
+
+Sessions are read in keyset pages of `page_size` (with their turns), each
+in its own short read transaction, and encoded chunk by chunk, so memory
+stays flat however many sessions match and a long export never pins a WAL
+snapshot (which would block checkpoints while the server keeps writing).
+Filters are applied in SQL. Used by GET /export/sessions and
+export_sessions.py.
+
+NDJSON is one object per session, with its turns nested under "turns".
+CSV is one row per turn, with the session columns repeated, or one row per
+session when turns are left out. List columns are joined with "; ".
+"""
+
+import csv
+import io
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import and_, or_, select
+
+from .checklist_items import OUTCOME_FIELDS, decode_outcome, outcomes_column
+from .database import async_session
+from .fast_json import dumps
+from .models import Session, SessionTurn
+
+SESSION_COLUMNS = (
+    Session.id.label("session_id"), Session.device_id, Session.user_id,
+    Session.scenario_id, Session.scenario_version, Session.language, Session.started_at, Session.completed_at,
+    Session.score, Session.turn_count,
+)
+TURN_COLUMNS = (
+    SessionTurn.turn_index, SessionTurn.node_key, SessionTurn.user_text, outcomes_column(SessionTurn.id),
+    SessionTurn.created_at.label("turn_created_at"),
+)
+SESSION_FIELDS = tuple(c.key for c in SESSION_COLUMNS)
+# Outcomes are exported as the lists of item names the API returns
+TURN_FIELDS = (
+    "turn_index", "node_key", "user_text", *(names for names, _ in OUTCOME_FIELDS), "turn_created_at",
+)
+
+FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+
+@dataclass
+class ExportFilters:
+    since: datetime | None = None  # started_at >= since
+    until: datetime | None = None  # started_at < until
+    scenario_ids: list[str] | None = None
+    languages: list[str] | None = None
+    completed_only: bool = False
+
+    def __post_init__(self):
+        # started_at is stored as naive UTC
+        self.since = _naive_utc(self.since)
+        self.until = _naive_utc(self.until)
+
+
+def _naive_utc(value: datetime | None) -> datetime | None:
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def _page_query(filters: ExportFilters, include_turns: bool, after: tuple[datetime, str] | None, page_size: int):
+    """The next `page_size` matching sessions after the keyset cursor `after`, with their turns."""
+    page = select(Session.id).order_by(Session.started_at, Session.id).limit(page_size)
+    if after is not None:
+        started_at, session_id = after
+        page = page.where(or_(
+            Session.started_at > started_at,
+            and_(Session.started_at == started_at, Session.id > session_id),
+        ))
+    if filters.since:
+        page = page.where(Session.started_at >= filters.since)
+    if filters.until:
+        page = page.where(Session.started_at < filters.until)
+    if filters.scenario_ids:
+        page = page.where(Session.scenario_id.in_(filters.scenario_ids))
+    if filters.languages:
+        page = page.where(Session.language.in_(filters.languages))
+    if filters.completed_only:
+        page = page.where(Session.completed_at.is_not(None))
+    page = page.subquery()
+
+    columns = SESSION_COLUMNS + (TURN_COLUMNS if include_turns else ())
+    query = select(*columns).select_from(Session).join(page, page.c.id == Session.id)
+    if include_turns:
+        query = query.outerjoin(SessionTurn, SessionTurn.session_id == Session.id)
+    order = (Session.started_at, Session.id) + ((SessionTurn.turn_index,) if include_turns else ())
+    return query.order_by(*order)
+
+
+def _value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _csv_value(value):
+    if isinstance(value, list):
+        return "; ".join(value)
+    return "" if value is None else _value(value)
+
+
+def _turn(row) -> dict:
+    if row.turn_index is None:  # session without turns (outer join)
+        return dict.fromkeys(TURN_FIELDS)
+    return {
+        "turn_index": row.turn_index,
+        "node_key": row.node_key,
+        "user_text": row.user_text,
+        **decode_outcome(row.scenario_id, row.outcomes),
+        "turn_created_at": _value(row.turn_created_at),
+    }
+
+
+class _NDJSONEncoder:
+    """Groups consecutive turn rows of a session into one JSON line."""
+
+    def __init__(self, include_turns: bool):
+        self.include_turns = include_turns
+        self.current: dict | None = None
+
+    def encode(self, rows) -> bytes:
+        out = []
+        for row in rows:
+            if self.current is None or self.current["session_id"] != row.session_id:
+                if self.current is not None:
+                    out.append(dumps(self.current))
+                self.current = {f: _value(getattr(row, f)) for f in SESSION_FIELDS}
+                if not self.include_turns:
+                    continue
+                self.current["turns"] = []
+            if self.include_turns and row.turn_index is not None:
+                self.current["turns"].append(_turn(row))
+        return b"".join(line + b"\n" for line in out)
+
+    def finish(self) -> bytes:
+        return dumps(self.current) + b"\n" if self.current is not None else b""
+
+
+class _CSVEncoder:
+    def __init__(self, include_turns: bool):
+        self.include_turns = include_turns
+        self.fields = SESSION_FIELDS + (TURN_FIELDS if include_turns else ())
+        self.header_sent = False
+
+    def encode(self, rows) -> bytes:
+        buf = io.StringIO()
+        writer = csv.writer(buf)
+        if not self.header_sent:
+            writer.writerow(self.fields)
+            self.header_sent = True
+        for row in rows:
+            values = [getattr(row, f) for f in SESSION_FIELDS]
+            if self.include_turns:
+                values.extend(_turn(row).values())
+            writer.writerow([_csv_value(v) for v in values])
+        return buf.getvalue().encode("utf-8")
+
+    def finish(self) -> bytes:
+        return b"" if self.header_sent else self.encode(())
+
+
+async def iter_export(
+    fmt: str,
+    filters: ExportFilters,
+    include_turns: bool = True,
+    chunk_size: int = 1000,
+    page_size: int = 1000,
+) -> AsyncIterator[bytes]:
+    """Yield the export as encoded chunks of about `chunk_size` rows, reading `page_size` sessions per transaction."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    encoder = _NDJSONEncoder(include_turns) if fmt == "ndjson" else _CSVEncoder(include_turns)
+
+    after = None
+    while True:
+        # Fetch the page and end the transaction before yielding to a possibly slow client
+        async with async_session() as db:
+            rows = (await db.execute(_page_query(filters, include_turns, after, page_size))).all()
+        if not rows:
+            break
+        for start in range(0, len(rows), chunk_size):
+            chunk = encoder.encode(rows[start:start + chunk_size])
+            if chunk:
+                yield chunk
+        after = (rows[-1].started_at, rows[-1].session_id)
+    tail = encoder.finish()
+    if tail:
+        yield tail
@@ -0,0 +1,53 @@
+"""
+Fast-path JSON serialization for trusted response data.
+
+Session endpoints build their payloads from our own evaluation output and
+database rows, so re-validating them through nested Pydantic models only
+costs CPU. These helpers serialize plain dicts straight to bytes, with
+orjson when it is installed and the stdlib otherwise. Routes keep their
+response_model for the OpenAPI schema.
+"""
+
+import json
+from typing import Any
+
+from fastapi import Response
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+if orjson is not None:
+    from fastapi.responses import ORJSONResponse as DefaultJSONResponse
+
+    def dumps(content: Any) -> bytes:
+        return orjson.dumps(content)
+else:
+    DefaultJSONResponse = JSONResponse
+
+    def dumps(content: Any) -> bytes:
+        return json.dumps(content, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def json_response(content: Any, status_code: int = 200) -> Response:
+    """Serialize already-trusted data without response_model validation."""
+    return Response(content=dumps(content), status_code=status_code, media_type="application/json")
+
+
+def splice_json(head: dict, key: str, raw: str | bytes | None) -> Response:
+    """
+    Respond with `head` plus `key` set to a pre-serialized JSON document.
+
+    `raw` is inserted verbatim (e.g. a JSON column read as text), so the
+    stored document is never decoded and re-encoded.
+    """
+    if isinstance(raw, str):
+        raw = raw.encode("utf-8")
+    body = dumps(head)
+    sep = b"," if head else b""
+    return Response(
+        content=body[:-1] + sep + dumps(key) + b":" + (raw or b"null") + b"}",
+        media_type="application/json",
+    )
@@ -0,0 +1,38 @@
+"""
+Pre-serialized JSON responses with strong ETags.
+
+Used by endpoints whose payload only changes when scenario files change:
+the body is rendered once, and a request whose If-None-Match carries the
+current ETag gets a bodiless 304 without anything being rebuilt.
+"""
+
+import hashlib
+
+from fastapi import Request, Response
+
+
+class CachedJSON:
+    """A rendered JSON body and its ETag."""
+
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes, etag: str | None = None):
+        self.body = body
+        self.etag = etag or f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Whether an If-None-Match header value matches `etag`."""
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    bare = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == bare for tag in if_none_match.split(","))
+
+
+def cached_response(request: Request, cached: CachedJSON, cache_control: str) -> Response:
+    headers = {"ETag": cached.etag, "Cache-Control": cache_control}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, cached.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=cached.body, media_type="application/json", headers=headers)
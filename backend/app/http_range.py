@@ -0,0 +1,131 @@
+"""
+Byte-range file responses (RFC 9110 Range / If-Range / 206 / 416).
+
+Used for immutable files, so the ETag never changes for a given URL and
+a client can resume or seek within a download. Only single ranges are
+served; a multi-range request gets the whole file, which RFC 9110 allows.
+
+The body is sent with the ASGI zero-copy extension when the server offers
+it (the kernel copies file pages straight to the socket); otherwise it is
+read and sent in CHUNK_SIZE pieces, so memory per download stays bounded
+either way.
+"""
+
+import anyio
+from fastapi import Request, Response
+
+from .http_cache import etag_matches
+
+CHUNK_SIZE = 64 * 1024
+
+
+def parse_range(header: str, size: int) -> tuple[int, int] | None:
+    """
+    Inclusive (first, last) byte positions of a single `bytes=` range over
+    a file of `size` bytes; None to serve the whole file. Raises ValueError
+    if the range cannot be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in spec:
+        return None
+    first, sep, last = spec.strip().partition("-")
+    if not sep:
+        return None
+    try:
+        start = int(first) if first else None
+        end = int(last) if last else None
+    except ValueError:
+        return None  # malformed ranges are ignored, not rejected
+    if start is None:  # suffix: the last `end` bytes
+        if end is None:
+            return None
+        if end == 0 or size == 0:
+            raise ValueError("Empty suffix range")
+        return max(size - end, 0), size - 1
+    if end is None:
+        end = size - 1
+    if start >= size:
+        raise ValueError("Range starts past the end of the file")
+    if end < start:
+        return None
+    return start, min(end, size - 1)
+
+
+class FileRangeResponse(Response):
+    """`length` bytes of the file at `path` from `offset`, streamed without loading it."""
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int = 200,
+        headers: dict[str, str] | None = None,
+        media_type: str | None = None,
+        send_body: bool = True,
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.send_body = send_body
+        super().__init__(content=None, status_code=status_code, headers=headers, media_type=media_type)
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope, receive, send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b""})
+            return
+        if "http.response.zerocopysend" in scope.get("extensions", {}):
+            # Opened in a worker thread like the chunked path: open() can block on disk
+            async with await anyio.open_file(self.path, "rb") as f:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": f.wrapped,
+                    "offset": self.offset,
+                    "count": self.length,
+                })
+            return
+        async with await anyio.open_file(self.path, "rb") as f:
+            await f.seek(self.offset)
+            remaining = self.length
+            while remaining:
+                chunk = await f.read(min(CHUNK_SIZE, remaining))
+                if not chunk:  # truncated underneath us; the client sees a short body
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+        if remaining:
+            await send({"type": "http.response.body", "body": b""})
+
+
+def file_response(
+    request: Request, path: str, size: int, etag: str, media_type: str, headers: dict[str, str]
+) -> Response:
+    """
+    200, 206, 304 or 416 for a GET/HEAD of an immutable file, honouring
+    If-None-Match, Range and If-Range.
+    """
+    headers = {"ETag": etag, "Accept-Ranges": "bytes", **headers}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers=headers)
+
+    send_body = request.method != "HEAD"
+    byte_range = None
+    range_header = request.headers.get("range")
+    if_range = request.headers.get("if-range")
+    # If-Range needs a strong match; a stale validator means "send it all"
+    if range_header and (if_range is None or if_range.strip() == etag):
+        try:
+            byte_range = parse_range(range_header, size)
+        except ValueError:
+            return Response(status_code=416, headers={**headers, "Content-Range": f"bytes */{size}"})
+
+    if byte_range is None:
+        return FileRangeResponse(path, 0, size, headers=headers, media_type=media_type, send_body=send_body)
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{size}"
+    return FileRangeResponse(
+        path, first, last - first + 1, status_code=206, headers=headers, media_type=media_type, send_body=send_body,
+    )
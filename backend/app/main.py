@@ -1,15 +1,46 @@
+import logging
 import os
+import time
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from sqlalchemy.orm import configure_mappers
+from .audio import audio_janitor
 from .database import init_db
-from .routers import languages, scenarios, sessions
+from .scenario_loader import load_scenarios
+from .scenario_reload import scenario_watcher
+from .fast_json import DefaultJSONResponse
+from .metrics import MetricsMiddleware
+from .write_queue import write_queue
+from .routers import languages, scenarios, sessions, session_ws, analytics, admin, export, metrics, audio
+
+
+logger = logging.getLogger("sushrusha")
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    t0 = time.perf_counter()
+    # Scenarios first (from the prebuilt bundle when it is current):
+    # init_db records their versions
+    load_scenarios()
+    t1 = time.perf_counter()
     await init_db()
+    t2 = time.perf_counter()
+    # Otherwise done lazily by the first ORM query, i.e. the first request
+    configure_mappers()
+    scenarios.prerender()
+    scenario_watcher.start()
+    audio_janitor.start()
+    logger.info(
+        "Ready: scenarios %.1f ms, database %.1f ms, warm-up %.1f ms",
+        (t1 - t0) * 1000, (t2 - t1) * 1000, (time.perf_counter() - t2) * 1000,
+    )
     yield
+    await scenario_watcher.stop()
+    await audio_janitor.stop()
+    # Commit turns still waiting in the write-behind queue
+    await write_queue.stop()
 
 
 app = FastAPI(
@@ -17,6 +48,7 @@ app = FastAPI(
     description="Protocol-based ASHA training simulator backend",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultJSONResponse,
 )
 
 # Setup CORS for production
@@ -35,9 +67,18 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Outermost, so recorded latency covers CORS and error handling too
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(languages.router)
 app.include_router(scenarios.router)
 app.include_router(sessions.router)
+app.include_router(session_ws.router)
+app.include_router(analytics.router)
+app.include_router(admin.router)
+app.include_router(export.router)
+app.include_router(audio.router)
+app.include_router(metrics.router)
 
 
 @app.get("/")
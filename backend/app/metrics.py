@@ -0,0 +1,184 @@
+"""
+In-process latency metrics, exposed in Prometheus text format on /metrics.
+
+- MetricsMiddleware records a latency histogram per (method, route
+  template, status).
+- `span("name")` times a named phase of a request (evaluation, DB execute,
+  commit, serialization, ...) into its own histogram.
+- With SLOW_REQUEST_MS set, requests slower than that are logged with the
+  spans they went through.
+- `Counter`s and `gauge` callbacks export plain numbers (cache hits,
+  entries, ...).
+
+Recording is a perf_counter pair, a bisect and a few integer adds, so it is
+cheap enough to leave on in production. Metrics are per process; with
+several workers, scrape each one.
+"""
+
+import logging
+import os
+import time
+from bisect import bisect_left
+from collections.abc import Callable
+from contextvars import ContextVar
+
+logger = logging.getLogger("sushrusha.metrics")
+
+# Upper bounds in seconds; +Inf is implicit
+BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+SLOW_REQUEST_MS = float(os.getenv("SLOW_REQUEST_MS", "0"))
+
+
+class Histogram:
+    __slots__ = ("counts", "sum", "count")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, seconds: float) -> None:
+        self.counts[bisect_left(BUCKETS, seconds)] += 1
+        self.sum += seconds
+        self.count += 1
+
+
+class Counter:
+    """Monotonic count exported as `<name>_total`; create once at import time."""
+
+    __slots__ = ("name", "help", "value")
+
+    def __init__(self, name: str, help: str):
+        self.name = name
+        self.help = help
+        self.value = 0
+        counters[name] = self
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+counters: dict[str, Counter] = {}
+gauges: dict[str, tuple[str, Callable[[], float]]] = {}
+
+
+def gauge(name: str, help: str, read: Callable[[], float]) -> None:
+    """Export `read()` as gauge `name`, sampled at scrape time."""
+    gauges[name] = (help, read)
+
+
+request_latency: dict[tuple[str, str, str], Histogram] = {}
+span_latency: dict[str, Histogram] = {}
+
+# Spans of the current request, collected only while slow-request logging is on
+_request_spans: ContextVar[list | None] = ContextVar("_request_spans", default=None)
+
+
+def observe_span(name: str, seconds: float) -> None:
+    hist = span_latency.get(name)
+    if hist is None:
+        hist = span_latency[name] = Histogram()
+    hist.observe(seconds)
+    spans = _request_spans.get()
+    if spans is not None:
+        spans.append((name, seconds))
+
+
+class span:
+    """Time a block into the `name` span histogram: `with span("db.commit"): ...`."""
+
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        observe_span(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route request latency."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            return await self.app(scope, receive, send)
+
+        status = "500"
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        spans = [] if SLOW_REQUEST_MS > 0 else None
+        token = _request_spans.set(spans)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _request_spans.reset(token)
+            # FastAPI stores the matched route in the scope; use its template
+            # so /sessions/<uuid>/turn does not create one series per session
+            route = scope.get("route")
+            path = route.path if route is not None else "unmatched"
+            key = (scope["method"], path, status)
+            hist = request_latency.get(key)
+            if hist is None:
+                hist = request_latency[key] = Histogram()
+            hist.observe(elapsed)
+
+            if spans is not None and elapsed * 1000 >= SLOW_REQUEST_MS:
+                breakdown = " ".join(f"{name}={s * 1000:.1f}ms" for name, s in spans)
+                logger.warning(
+                    "slow request %s %s %.1fms status=%s %s",
+                    scope["method"], path, elapsed * 1000, status, breakdown,
+                )
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _render_histogram(lines: list[str], name: str, labels: str, hist: Histogram) -> None:
+    cumulative = 0
+    for bound, n in zip(BUCKETS, hist.counts):
+        cumulative += n
+        lines.append(f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}')
+    lines.append(f'{name}_bucket{{{labels},le="+Inf"}} {hist.count}')
+    lines.append(f"{name}_sum{{{labels}}} {hist.sum}")
+    lines.append(f"{name}_count{{{labels}}} {hist.count}")
+
+
+def render_prometheus() -> str:
+    lines = [
+        "# HELP sushrusha_http_request_duration_seconds Request latency by route.",
+        "# TYPE sushrusha_http_request_duration_seconds histogram",
+    ]
+    for (method, path, status), hist in sorted(request_latency.items()):
+        labels = f'method="{method}",route="{_label(path)}",status="{status}"'
+        _render_histogram(lines, "sushrusha_http_request_duration_seconds", labels, hist)
+
+    lines += [
+        "# HELP sushrusha_span_duration_seconds Latency of named request phases.",
+        "# TYPE sushrusha_span_duration_seconds histogram",
+    ]
+    for name, hist in sorted(span_latency.items()):
+        _render_histogram(lines, "sushrusha_span_duration_seconds", f'span="{_label(name)}"', hist)
+
+    for name, counter in sorted(counters.items()):
+        lines += [f"# HELP {name}_total {counter.help}", f"# TYPE {name}_total counter", f"{name}_total {counter.value}"]
+    for name, (help, read) in sorted(gauges.items()):
+        lines += [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {read()}"]
+
+    return "\n".join(lines) + "\n"
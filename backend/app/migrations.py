@@ -0,0 +1,200 @@
+"""
+Schema migrations for existing SQLite database files.
+
+`create_all` only creates missing tables, so columns and indexes added to
+the models later are applied here. The schema version is kept in SQLite's
+`PRAGMA user_version`; each entry in MIGRATIONS runs once, in order, for
+databases below its version. Run standalone with `python -m app.migrations`.
+
+init_db skips all of this for databases already at SCHEMA_VERSION, so any
+change to the models (even just a new column or index) needs a new
+MIGRATIONS entry to reach existing databases.
+"""
+
+import asyncio
+import json
+from collections.abc import Callable
+
+from sqlalchemy import insert, inspect, text, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateColumn
+
+from .database import Base
+from .models import Session, TurnOutcome
+
+
+def _add_missing_columns(conn: Connection) -> None:
+    """Add columns declared on the models but absent from an existing database file."""
+    insp = inspect(conn)
+    for table in Base.metadata.sorted_tables:
+        existing = {c["name"] for c in insp.get_columns(table.name)}
+        for column in table.columns:
+            if column.name not in existing:
+                ddl = CreateColumn(column).compile(dialect=conn.dialect)
+                conn.execute(text(f"ALTER TABLE {table.name} ADD COLUMN {ddl}"))
+
+
+def _add_missing_indexes(conn: Connection) -> None:
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(conn, checkfirst=True)
+
+
+def _renumber_duplicate_turns(conn: Connection) -> None:
+    """Give turns that raced to the same turn_index distinct, ordered indexes."""
+    conn.execute(text("""
+        UPDATE session_turns SET turn_index = (
+            SELECT r.rn FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY session_id ORDER BY turn_index, created_at, id
+                ) AS rn
+                FROM session_turns
+            ) AS r
+            WHERE r.id = session_turns.id
+        )
+        WHERE session_id IN (
+            SELECT session_id FROM session_turns
+            GROUP BY session_id, turn_index HAVING COUNT(*) > 1
+        )
+    """))
+
+
+def _backfill_turn_count(conn: Connection) -> None:
+    conn.execute(text("""
+        UPDATE sessions SET turn_count = (
+            SELECT COALESCE(MAX(turn_index), 0) FROM session_turns
+            WHERE session_turns.session_id = sessions.id
+        )
+    """))
+
+
+def _backfill_checklist_stats(conn: Connection) -> None:
+    from .analytics import rebuild_checklist_stats
+    rebuild_checklist_stats(conn)
+
+
+def _checklist_outcomes(conn: Connection, chunk_size: int = 2000) -> None:
+    """Convert turn outcomes from JSON lists of item names to turn_outcomes rows, then drop the JSON columns."""
+    json_columns = ("matched_items", "missed_items", "critical_missed")
+    existing = {c["name"] for c in inspect(conn).get_columns("session_turns")}
+    if not existing.issuperset(json_columns):
+        return
+    from .checklist_items import OUTCOME_FIELDS, get_index, outcome_rows, sync_checklist_items
+
+    def chunks():
+        last_id = ""
+        while True:
+            rows = conn.execute(text("""
+                SELECT t.id, s.scenario_id, t.matched_items, t.missed_items, t.critical_missed
+                FROM session_turns t JOIN sessions s ON s.id = t.session_id
+                WHERE t.id > :last_id ORDER BY t.id LIMIT :limit
+            """), {"last_id": last_id, "limit": chunk_size}).all()
+            if not rows:
+                return
+            last_id = rows[-1].id
+            yield [(r.id, r.scenario_id, [json.loads(r[i] or "[]") for i in (2, 3, 4)]) for r in rows]
+
+    # Items that only appear in stored turns (since removed from the scenario) get ordinals too
+    names: dict[str, set[str]] = {}
+    for rows in chunks():
+        for _, scenario_id, lists in rows:
+            names.setdefault(scenario_id, set()).update(*lists)
+    sync_checklist_items(conn, names)
+
+    for rows in chunks():
+        outcomes = []
+        for turn_id, scenario_id, lists in rows:
+            outcome = get_index(scenario_id).encode({field: names for (field, _), names in zip(OUTCOME_FIELDS, lists)})
+            outcomes += outcome_rows(turn_id, outcome)
+        if outcomes:
+            conn.execute(insert(TurnOutcome.__table__), outcomes)
+
+    for column in json_columns:
+        conn.exec_driver_sql(f"ALTER TABLE session_turns DROP COLUMN {column}")
+
+
+def _pin_scenario_versions(conn: Connection) -> None:
+    """
+    Pin open sessions started before versioning to the scenario content
+    loaded now. Completed ones stay unpinned: their reports are already
+    stored, and the content they were scored against is not known.
+    """
+    from .scenario_loader import get_compiled_scenarios
+    from .scenario_versions import record_versions
+    scenarios = get_compiled_scenarios()
+    record_versions(conn, scenarios)
+    table = Session.__table__
+    for scenario in scenarios.values():
+        conn.execute(
+            update(table)
+            .where(
+                table.c.scenario_id == scenario.id,
+                table.c.scenario_version.is_(None),
+                table.c.completed_at.is_(None),
+            )
+            .values(scenario_version=scenario.version)
+        )
+
+
+def _audio_recordings(conn: Connection) -> None:
+    """Nothing to backfill: earlier turns only link to audio hosted elsewhere."""
+
+
+def _drop_state_transcripts(conn: Connection) -> None:
+    """Running aggregates no longer carry the transcript; it is built from the turns at completion."""
+    conn.execute(text("""
+        UPDATE sessions SET report_state = json_remove(report_state, '$.transcript')
+        WHERE json_type(report_state, '$.transcript') IS NOT NULL
+    """))
+
+
+def _batch_client_ids(conn: Connection) -> None:
+    """Nothing to backfill: sessions uploaded earlier were not given their client_id."""
+
+
+def _audio_url_index(conn: Connection) -> None:
+    """Nothing to backfill: the index is created with the other missing ones."""
+
+
+# Index in this list + 1 is the schema version the step brings a database to.
+MIGRATIONS: list[Callable[[Connection], None]] = [
+    _renumber_duplicate_turns,  # 1: before uq_session_turns_session_turn
+    _backfill_turn_count,  # 2: sessions.turn_count
+    _backfill_checklist_stats,  # 3: checklist_item_stats
+    _checklist_outcomes,  # 4: turn_outcomes, checklist_items
+    _pin_scenario_versions,  # 5: sessions.scenario_version, scenario_versions
+    _audio_recordings,  # 6: audio_recordings (created by create_all)
+    _drop_state_transcripts,  # 7: sessions.report_state without transcript
+    _batch_client_ids,  # 8: sessions.client_id, uq_sessions_device_client
+    _audio_url_index,  # 9: ix_session_turns_audio_url
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
+
+
+def get_schema_version(conn: Connection) -> int:
+    return conn.exec_driver_sql("PRAGMA user_version").scalar() or 0
+
+
+def migrate(conn: Connection) -> None:
+    """Bring a database created by any earlier version up to the current models."""
+    _add_missing_columns(conn)
+    version = get_schema_version(conn)
+    for step_version, step in enumerate(MIGRATIONS, start=1):
+        if version < step_version:
+            step(conn)
+    _add_missing_indexes(conn)
+    if version != SCHEMA_VERSION:
+        conn.exec_driver_sql(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+
+if __name__ == "__main__":
+    from .database import init_db, engine
+
+    async def _main():
+        await init_db()
+        async with engine.connect() as conn:
+            version = await conn.run_sync(get_schema_version)
+        print(f"[OK] {engine.url} at schema version {version}")
+
+    asyncio.run(_main())
@@ -2,7 +2,7 @@
 
 import uuid
 from datetime import datetime, timezone
-from sqlalchemy import String, Integer, Float, Text, DateTime, ForeignKey, JSON
+from sqlalchemy import String, Integer, Float, Boolean, Text, DateTime, ForeignKey, JSON, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from .database import Base
 
@@ -29,16 +29,30 @@ class User(Base):
 
 class Session(Base):
     __tablename__ = "sessions"
+    __table_args__ = (
+        # History listing: newest first, optionally per device; id breaks ties
+        Index("ix_sessions_device_started", "device_id", "started_at", "id"),
+        Index("ix_sessions_started", "started_at", "id"),
+        # Re-uploads of an offline session are recognised by its device-side id
+        Index("uq_sessions_device_client", "device_id", "client_id", unique=True),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     user_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("users.id"), nullable=True)
     device_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
+    # Device-side id of a session uploaded through batch-evaluate
+    client_id: Mapped[str | None] = mapped_column(String(128), nullable=True)
     scenario_id: Mapped[str] = mapped_column(String(50))
+    # Scenario content the session is scored against (see scenario_versions.py)
+    scenario_version: Mapped[str | None] = mapped_column(String(16), nullable=True)
     language: Mapped[str] = mapped_column(String(10))
     started_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
     score: Mapped[float | None] = mapped_column(Float, nullable=True)
+    turn_count: Mapped[int] = mapped_column(Integer, default=0, server_default="0")
     report_json: Mapped[dict | None] = mapped_column(JSON, nullable=True)
+    # Running report aggregate, updated on every turn (see evaluation.update_report_state)
+    report_state: Mapped[dict | None] = mapped_column(JSON, nullable=True)
 
     user: Mapped["User | None"] = relationship(back_populates="sessions")
     turns: Mapped[list["SessionTurn"]] = relationship(back_populates="session", order_by="SessionTurn.created_at")
@@ -46,6 +60,12 @@ class Session(Base):
 
 class SessionTurn(Base):
     __tablename__ = "session_turns"
+    __table_args__ = (
+        # Also serves every lookup of a session's turns
+        Index("uq_session_turns_session_turn", "session_id", "turn_index", unique=True),
+        # Orphan cleanup: is a recording referenced by any turn (see audio.py)
+        Index("ix_session_turns_audio_url", "user_audio_url", sqlite_where=text("user_audio_url IS NOT NULL")),
+    )
 
     id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)
     session_id: Mapped[str] = mapped_column(String(36), ForeignKey("sessions.id"))
@@ -53,9 +73,77 @@ class SessionTurn(Base):
     node_key: Mapped[str] = mapped_column(String(100))
     user_text: Mapped[str] = mapped_column(Text)
     user_audio_url: Mapped[str | None] = mapped_column(String(500), nullable=True)
-    matched_items: Mapped[list] = mapped_column(JSON, default=list)
-    missed_items: Mapped[list] = mapped_column(JSON, default=list)
-    critical_missed: Mapped[list] = mapped_column(JSON, default=list)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
 
     session: Mapped["Session"] = relationship(back_populates="turns")
+
+
+class ScenarioVersion(Base):
+    """Every scenario content sessions may be pinned to, as canonical JSON."""
+
+    __tablename__ = "scenario_versions"
+
+    scenario_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    version: Mapped[str] = mapped_column(String(16), primary_key=True)
+    data: Mapped[str] = mapped_column(Text)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
+
+
+class ScenarioChecklistItem(Base):
+    """Checklist item dimension: a stable small ordinal per (scenario, item name)."""
+
+    __tablename__ = "checklist_items"
+    __table_args__ = (
+        Index("uq_checklist_items_scenario_item", "scenario_id", "item", unique=True),
+    )
+
+    scenario_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    ordinal: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    item: Mapped[str] = mapped_column(String(300))
+    is_critical: Mapped[bool] = mapped_column(Boolean, default=False)
+
+
+class TurnOutcome(Base):
+    """One checklist item's outcome in one turn (see checklist_items.py)."""
+
+    __tablename__ = "turn_outcomes"
+    # Clustered on the primary key: a turn's rows sit together and need no rowid
+    __table_args__ = {"sqlite_with_rowid": False}
+
+    turn_id: Mapped[str] = mapped_column(String(36), ForeignKey("session_turns.id"), primary_key=True)
+    ordinal: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)  # checklist_items.ordinal
+    outcome: Mapped[int] = mapped_column(Integer)  # MATCHED | MISSED | CRITICAL_MISSED flags
+
+
+class ChecklistItemStat(Base):
+    """Per-item outcome counts over completed sessions (see analytics.py)."""
+
+    __tablename__ = "checklist_item_stats"
+
+    scenario_id: Mapped[str] = mapped_column(String(50), primary_key=True)
+    language: Mapped[str] = mapped_column(String(10), primary_key=True)
+    week: Mapped[str] = mapped_column(String(10), primary_key=True)  # Monday of the session's start week
+    item: Mapped[str] = mapped_column(String(300), primary_key=True)
+    is_critical: Mapped[bool] = mapped_column(Boolean, default=False)
+    sessions: Mapped[int] = mapped_column(Integer, default=0)  # completed sessions that reached the item
+    matched: Mapped[int] = mapped_column(Integer, default=0)
+    missed: Mapped[int] = mapped_column(Integer, default=0)
+    critical_missed: Mapped[int] = mapped_column(Integer, default=0)
+
+
+class AudioRecording(Base):
+    """A turn recording stored under AUDIO_DIR (see audio.py)."""
+
+    __tablename__ = "audio_recordings"
+    __table_args__ = (
+        Index("ix_audio_recordings_session", "session_id"),
+        # Orphan cleanup: unattached recordings, oldest first
+        Index("ix_audio_recordings_turn_created", "turn_id", "created_at"),
+    )
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=_uuid)  # also the file name
+    session_id: Mapped[str] = mapped_column(String(36), ForeignKey("sessions.id"))
+    turn_id: Mapped[str | None] = mapped_column(String(36), ForeignKey("session_turns.id"), nullable=True)
+    content_type: Mapped[str] = mapped_column(String(100))
+    size: Mapped[int] = mapped_column(Integer)
+    created_at: Mapped[datetime] = mapped_column(DateTime, default=_now)
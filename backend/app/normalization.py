@@ -0,0 +1,207 @@
+"""
+Text normalization for keyword matching.
+
+Worker utterances arrive in English, romanized Hindi, or native script
+(Devanagari, Bengali, Tamil, Telugu), often from phone keyboards that mix
+Unicode forms. Both keywords and utterances go through the same pipeline:
+
+1. NFC, so precomposed and decomposed spellings compare equal
+2. zero-width joiners/non-joiners, BOMs and soft hyphens removed;
+   punctuation and symbols of any script (danda, double danda, quotes,
+   emoji) become word breaks
+3. casefold and split into words
+4. each word reduced to a *match key*: native-script words are romanized,
+   then spelling variants common in romanized Indic text are folded
+   (aspirates, long vowels written "ee"/"oo", doubled letters, w/v, z/j);
+   Latin words are kept as they are
+
+Folding only applies to words known to be Indic: those written in native
+script, and keywords a scenario tags as romanized Hindi
+(`romanized_keywords`). Folding English would make "ship" the key of
+"sip". Since worker text is not tagged, the romanized keywords are compared
+with the folded keys of every text word (`fold_keys`), and the rest with
+its match keys. So "खून", "khoon" and "khun" meet under "kun" when "khoon"
+is a romanized keyword, and keyword lookups become dictionary lookups on
+keys (see evaluation.KeywordMatcher).
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+
+def _word_breaks() -> dict[int, str | None]:
+    """str.translate table: punctuation, symbols and separators -> space, zero-width -> removed."""
+    table: dict[int, str | None] = {}
+    for start, end in ((0x0000, 0x3000), (0xFE00, 0x10000), (0x1F000, 0x1FB00)):
+        for cp in range(start, end):
+            if unicodedata.category(chr(cp))[0] in "PSZC":
+                table[cp] = " "
+    # Danda and double danda are punctuation already; the abbreviation sign is not
+    table[0x0970] = " "
+    for cp in (0x200B, 0x200C, 0x200D, 0x2060, 0xFEFF, 0x00AD):
+        table[cp] = None
+    return table
+
+
+_WORD_BREAKS = _word_breaks()
+
+# ── Romanization ──────────────────────────────────────────────
+# The Devanagari, Bengali, Tamil and Telugu blocks share the ISCII layout,
+# so one table indexed by offset inside the block covers all four.
+
+_BLOCKS = {0x0900: "deva", 0x0980: "beng", 0x0B80: "taml", 0x0C00: "telu"}
+
+_CONSONANTS = {
+    0x15: "k", 0x16: "kh", 0x17: "g", 0x18: "gh", 0x19: "n",
+    0x1A: "ch", 0x1B: "chh", 0x1C: "j", 0x1D: "jh", 0x1E: "n",
+    0x1F: "t", 0x20: "th", 0x21: "d", 0x22: "dh", 0x23: "n",
+    0x24: "t", 0x25: "th", 0x26: "d", 0x27: "dh", 0x28: "n", 0x29: "n",
+    0x2A: "p", 0x2B: "ph", 0x2C: "b", 0x2D: "bh", 0x2E: "m",
+    0x2F: "y", 0x30: "r", 0x31: "r", 0x32: "l", 0x33: "l", 0x34: "zh", 0x35: "v",
+    0x36: "sh", 0x37: "sh", 0x38: "s", 0x39: "h",
+    0x58: "q", 0x59: "kh", 0x5A: "g", 0x5B: "z", 0x5C: "r", 0x5D: "rh", 0x5E: "f", 0x5F: "y",
+    0x4E: "t",  # Bengali khanda ta
+}
+_INDEPENDENT_VOWELS = {
+    0x05: "a", 0x06: "aa", 0x07: "i", 0x08: "ii", 0x09: "u", 0x0A: "uu", 0x0B: "ri", 0x0C: "li",
+    0x0D: "e", 0x0E: "e", 0x0F: "e", 0x10: "ai", 0x11: "o", 0x12: "o", 0x13: "o", 0x14: "au",
+    0x60: "ri", 0x61: "li",
+}
+_VOWEL_SIGNS = {
+    0x3E: "aa", 0x3F: "i", 0x40: "ii", 0x41: "u", 0x42: "uu", 0x43: "ri", 0x44: "ri",
+    0x45: "e", 0x46: "e", 0x47: "e", 0x48: "ai", 0x49: "o", 0x4A: "o", 0x4B: "o", 0x4C: "au",
+    0x62: "li", 0x63: "li",
+}
+_NASALS = {0x01: "n", 0x02: "n", 0x03: "h"}  # candrabindu, anusvara, visarga
+_VIRAMA = 0x4D
+_NUKTA = 0x3C
+# Consonant + nukta, as NFC leaves them decomposed
+_NUKTA_FORMS = {"k": "q", "kh": "kh", "g": "g", "j": "z", "d": "r", "dh": "rh", "ph": "f", "y": "y"}
+# Scripts whose romanization drops unpronounced inherent vowels (schwa deletion)
+_SCHWA_DELETING = {"deva", "beng"}
+
+_CONSONANT, _VOWEL, _SCHWA = 0, 1, 2
+
+
+def _block(cp: int) -> tuple[int, str] | None:
+    base = cp & ~0x7F
+    script = _BLOCKS.get(base)
+    return (base, script) if script else None
+
+
+def is_indic(text: str) -> bool:
+    """Whether `text` has a character of one of the romanized scripts."""
+    return not text.isascii() and any(_block(ord(ch)) for ch in text)
+
+
+def romanize(word: str) -> str:
+    """Latin transliteration of a (normalized) word; non-Indic characters pass through."""
+    if word.isascii():
+        return word
+    segments: list[list] = []  # [kind, text]
+    script = None
+    for ch in word:
+        cp = ord(ch)
+        block = _block(cp)
+        if block is None:
+            segments.append([_VOWEL, ch])
+            continue
+        base, script = block
+        offset = cp - base
+        if offset in _CONSONANTS:
+            segments.append([_CONSONANT, _CONSONANTS[offset]])
+            segments.append([_SCHWA, "a"])
+        elif offset in _VOWEL_SIGNS:
+            if segments and segments[-1][0] == _SCHWA:
+                segments.pop()
+            segments.append([_VOWEL, _VOWEL_SIGNS[offset]])
+        elif offset == _VIRAMA:
+            if segments and segments[-1][0] == _SCHWA:
+                segments.pop()
+        elif offset == _NUKTA:
+            if len(segments) >= 2 and segments[-2][0] == _CONSONANT:
+                segments[-2][1] = _NUKTA_FORMS.get(segments[-2][1], segments[-2][1])
+        elif offset in _NASALS:
+            segments.append([_CONSONANT, _NASALS[offset]])
+        elif offset in _INDEPENDENT_VOWELS:
+            segments.append([_VOWEL, _INDEPENDENT_VOWELS[offset]])
+        elif 0x66 <= offset <= 0x6F:
+            segments.append([_VOWEL, str(offset - 0x66)])
+        # other signs (avagraha, length marks) carry no sound of their own
+
+    if script in _SCHWA_DELETING:
+        _delete_schwas(segments)
+    return "".join(text for kind, text in segments if kind is not None)
+
+
+def _delete_schwas(segments: list[list]) -> None:
+    """Hindi/Bengali schwa deletion: final, and between VC_CV (हलचल -> halchal)."""
+    if segments and segments[-1][0] == _SCHWA:
+        segments[-1][0] = None
+    kinds = [s[0] for s in segments]
+    for i, kind in enumerate(kinds):
+        if kind != _SCHWA or i < 2 or i + 2 >= len(kinds):
+            continue
+        if (
+            kinds[i - 1] == _CONSONANT and kinds[i - 2] in (_VOWEL, _SCHWA)
+            and kinds[i + 1] == _CONSONANT and kinds[i + 2] in (_VOWEL, _SCHWA)
+        ):
+            kinds[i] = segments[i][0] = None
+
+
+# ── Folding and keys ─────────────────────────────────────────
+
+_FOLDS = (
+    (re.compile(r"([kgcjtdpb])h+"), r"\1"),  # aspirates: kh/gh/chh/th/dh/bh...
+    (re.compile(r"sh"), "s"),
+    (re.compile(r"ee"), "i"),
+    (re.compile(r"oo"), "u"),
+)
+_LETTER_FOLDS = str.maketrans({"w": "v", "z": "j"})
+_DOUBLES = re.compile(r"(.)\1+")
+
+
+def fold(word: str) -> str:
+    """Collapse spelling variants of romanized words onto one form."""
+    while True:
+        folded = word.translate(_LETTER_FOLDS)
+        for pattern, repl in _FOLDS:
+            folded = pattern.sub(repl, folded)
+        folded = _DOUBLES.sub(r"\1", folded)
+        if folded == word:
+            return folded
+        # A fold can expose another ("shh" -> "sh"); keys are stable only once none apply
+        word = folded
+
+
+@lru_cache(maxsize=65536)
+def match_key(word: str) -> str:
+    """Key a normalized word is indexed and looked up under: folded if Indic, else the word itself."""
+    if not is_indic(word):
+        return word
+    return fold(romanize(word))
+
+
+@lru_cache(maxsize=65536)
+def folded_key(key: str) -> str:
+    """The key romanized keywords are compared under (a no-op for native-script keys)."""
+    return fold(key)
+
+
+@lru_cache(maxsize=65536)
+def trigrams(key: str) -> frozenset[str]:
+    """Character trigrams of a match key, anchored at its start, for fuzzy matching."""
+    padded = "^" + key
+    return frozenset(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def match_keys(text: str) -> list[str]:
+    """Match keys of every word of `text`, in order."""
+    words = unicodedata.normalize("NFC", text).translate(_WORD_BREAKS).casefold().split()
+    return [match_key(w) for w in words]
+
+
+def fold_keys(keys: list[str]) -> list[str]:
+    """`keys` (from match_keys) as romanized Hindi: every word folded."""
+    return [folded_key(k) for k in keys]
@@ -0,0 +1,255 @@
+"""
+Re-evaluate stored turns against the current scenario files.
+
+Editing keywords in data/scenarios/*.json leaves the matched/missed lists of
+existing turns, and the reports and scores built from them, stale. `rescore`
+walks the sessions table in keyset-ordered chunks, re-evaluates each chunk's
+turns as one batch with the precompiled node matchers (optionally fanned out
+over a process pool) and writes turns, running aggregates and reports back
+with bulk UPDATEs, re-pinning each session to the current scenario version.
+Every chunk's writes go through the write queue as one op, so memory use
+and the time other writers wait stay bounded no matter how many turns are
+stored. The op also moves the checklist aggregates (analytics.py) from
+each changed report to its replacement, so they are never rebuilt from
+the whole history.
+
+Sessions are read and evaluated outside the write transaction, so the op
+first re-reads each session's turn_count and completion inside it. A
+session that took a turn or was completed in the meantime is not written
+(its new turn would be lost) but rescored again, up to ATTEMPTS times.
+"""
+
+import asyncio
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from collections.abc import Callable, Mapping
+
+from sqlalchemy import delete, insert, select, update
+
+from .analytics import replace_reports
+from .checklist_items import OUTCOME_FIELDS, encode_outcome, outcome_rows, outcomes_column, parse_outcomes
+from .database import async_session
+from .evaluation import evaluate_turn, new_report_state, update_report_state, finalize_report, transcript_entry
+from .models import Session, SessionTurn, TurnOutcome
+from .scenario_bundle import dumps_scenarios
+from .scenario_loader import get_snapshot
+from .scenario_reload import reload_scenarios
+from .write_queue import write_queue
+
+_EMPTY = {names: [] for names, _ in OUTCOME_FIELDS}
+
+ATTEMPTS = 3
+
+# Set in pool workers by _init_worker
+_worker_scenarios: Mapping | None = None
+
+
+@dataclass
+class RescoreStats:
+    sessions: int = 0
+    sessions_skipped: int = 0  # scenario no longer exists
+    sessions_busy: int = 0  # kept changing while being rescored; left as they were
+    turns: int = 0
+    turns_changed: int = 0
+    reports: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def turns_per_sec(self) -> float:
+        return self.turns / self.elapsed if self.elapsed > 0 else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "turns_per_sec": round(self.turns_per_sec, 1)}
+
+
+def _init_worker(packed: bytes) -> None:
+    """Pool initializer: the parent's compiled scenarios, so workers score against the same versions."""
+    global _worker_scenarios
+    _worker_scenarios = pickle.loads(packed)
+
+
+def _evaluate_batch(items: list[tuple[str, str, str]], scenarios: Mapping | None = None) -> list[dict]:
+    """Evaluate (scenario_id, node_key, user_text) triples. Runs in worker processes too."""
+    lookup = (scenarios if scenarios is not None else _worker_scenarios).get
+    results = []
+    for scenario_id, node_key, user_text in items:
+        scenario = lookup(scenario_id)
+        node = scenario.nodes.get(node_key) if scenario else None
+        if node is None:
+            # Node removed from the scenario: nothing left to match against
+            results.append(_EMPTY)
+            continue
+        result = evaluate_turn(user_text, node.checklist, node.matcher)
+        del result["notes"]
+        results.append(result)
+    return results
+
+
+async def _evaluate(items: list[tuple[str, str, str]], scenarios: Mapping, pool: ProcessPoolExecutor | None, workers: int) -> list[dict]:
+    loop = asyncio.get_running_loop()
+    if pool is None or len(items) < workers * 2:
+        # In a thread, so an admin rescore does not stall requests on the event loop
+        return await loop.run_in_executor(None, _evaluate_batch, items, scenarios)
+    step = -(-len(items) // workers)
+    parts = await asyncio.gather(*(
+        loop.run_in_executor(pool, _evaluate_batch, items[i:i + step])
+        for i in range(0, len(items), step)
+    ))
+    return [r for part in parts for r in part]
+
+
+async def _rescore_chunk(scenarios, sessions, pool, workers, stats: RescoreStats) -> list[str]:
+    """Rescore and write `sessions`; returns the ids of those that changed meanwhile and were not written."""
+    scenario_of = {s.id: s.scenario_id for s in sessions}
+    async with async_session() as db:
+        turns = (await db.execute(
+            select(
+                SessionTurn.id, SessionTurn.session_id, SessionTurn.turn_index,
+                SessionTurn.node_key, SessionTurn.user_text, outcomes_column(SessionTurn.id),
+            )
+            .where(SessionTurn.session_id.in_(list(scenario_of)))
+            .order_by(SessionTurn.session_id, SessionTurn.turn_index)
+        )).all()
+
+    results = await _evaluate(
+        [(scenario_of[t.session_id], t.node_key, t.user_text) for t in turns], scenarios, pool, workers
+    )
+
+    turn_updates: dict[str, list[tuple[str, dict]]] = {s.id: [] for s in sessions}  # (turn id, outcome)
+    states: dict[str, dict] = {s.id: new_report_state() for s in sessions}
+    transcripts: dict[str, list[dict]] = {s.id: [] for s in sessions}
+    for t, result in zip(turns, results):
+        outcome = encode_outcome(scenario_of[t.session_id], result)
+        if parse_outcomes(t.outcomes) != outcome:
+            turn_updates[t.session_id].append((t.id, outcome))
+
+        scenario = scenarios[scenario_of[t.session_id]]
+        node = scenario.nodes.get(t.node_key)
+        update_report_state(states[t.session_id], result, node.checklist if node else ())
+        transcripts[t.session_id].append(transcript_entry(
+            {"turn_index": t.turn_index, "user_text": t.user_text, **result}, node.text("en") if node else "",
+        ))
+
+    # Rescored sessions are pinned to the version they were just scored against
+    session_updates = {}
+    for s in sessions:
+        values = {"id": s.id, "report_state": states[s.id], "scenario_version": scenarios[s.scenario_id].version}
+        if s.completed_at is not None:
+            report_data = finalize_report(states[s.id], transcripts[s.id])
+            values.update(score=report_data["score"], report_json=report_data)
+        session_updates[s.id] = values
+
+    async def write(db) -> list[str]:
+        # What each session looks like now, inside the write transaction
+        current, stored = {}, {}
+        for r in await db.execute(
+            select(
+                Session.id, Session.turn_count, Session.completed_at,
+                Session.language, Session.started_at, Session.report_json,
+            )
+            .where(Session.id.in_(list(scenario_of)))
+        ):
+            current[r.id] = (r.turn_count, r.completed_at is None)
+            stored[r.id] = r
+        changed = [s.id for s in sessions if current.get(s.id) != (s.turn_count, s.completed_at is None)]
+        unchanged = [s for s in sessions if s.id not in changed]
+        rewritten = [pair for s in unchanged for pair in turn_updates[s.id]]
+        if rewritten:
+            await db.execute(delete(TurnOutcome).where(TurnOutcome.turn_id.in_([turn_id for turn_id, _ in rewritten])))
+            rows = [row for turn_id, outcome in rewritten for row in outcome_rows(turn_id, outcome)]
+            if rows:
+                await db.execute(insert(TurnOutcome), rows)
+        open_rows = [session_updates[s.id] for s in unchanged if s.completed_at is None]
+        completed_rows = [session_updates[s.id] for s in unchanged if s.completed_at is not None]
+        if open_rows:
+            await db.execute(update(Session), open_rows)
+        if completed_rows:
+            await db.execute(update(Session), completed_rows)
+            replaced = []
+            for row in completed_rows:
+                before = stored[row["id"]]
+                if before.report_json != row["report_json"]:
+                    replaced.append((
+                        scenario_of[row["id"]], before.language, before.started_at, before.report_json, row["report_json"],
+                    ))
+            await replace_reports(db, replaced)
+        return changed
+
+    changed = await write_queue.submit(write)
+
+    written = [s for s in sessions if s.id not in changed]
+    stats.sessions += len(written)
+    stats.turns += sum(1 for t in turns if t.session_id not in changed)
+    stats.turns_changed += sum(len(turn_updates[s.id]) for s in written)
+    stats.reports += sum(1 for s in written if s.completed_at is not None)
+    return changed
+
+
+def _session_query():
+    return select(Session.id, Session.scenario_id, Session.completed_at, Session.turn_count)
+
+
+async def _rescore_sessions(scenarios, sessions, pool, workers, stats: RescoreStats) -> None:
+    for _ in range(ATTEMPTS):
+        changed = await _rescore_chunk(scenarios, sessions, pool, workers, stats)
+        if not changed:
+            return
+        # Played or completed while we were scoring them: start over from their current rows
+        async with async_session() as db:
+            sessions = (await db.execute(_session_query().where(Session.id.in_(changed)))).all()
+    stats.sessions_busy += len(changed)
+
+
+async def rescore(
+    scenario_ids: list[str] | None = None,
+    chunk_size: int = 500,
+    workers: int = 0,
+    on_progress: Callable[[RescoreStats], None] | None = None,
+) -> RescoreStats:
+    """
+    Re-evaluate every stored turn (optionally only for `scenario_ids`).
+
+    `workers` > 1 evaluates each chunk on a process pool of that size.
+    `on_progress` is called with the running totals after every chunk.
+    """
+    # Pick up edited files now rather than at the watcher's next poll
+    await reload_scenarios()
+    scenarios = get_snapshot().scenarios  # one consistent set for the whole run
+    stats = RescoreStats()
+    started = time.perf_counter()
+    pool = None
+    if workers > 1:
+        pool = ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(dumps_scenarios(scenarios),))
+    last_id = ""
+    try:
+        while True:
+            async with async_session() as db:
+                query = (
+                    _session_query()
+                    .where(Session.id > last_id)
+                    .order_by(Session.id)
+                    .limit(chunk_size)
+                )
+                if scenario_ids:
+                    query = query.where(Session.scenario_id.in_(scenario_ids))
+                chunk = (await db.execute(query)).all()
+                if not chunk:
+                    break
+                last_id = chunk[-1].id
+
+            sessions = [s for s in chunk if s.scenario_id in scenarios]
+            stats.sessions_skipped += len(chunk) - len(sessions)
+            if sessions:
+                await _rescore_sessions(scenarios, sessions, pool, workers, stats)
+
+            stats.elapsed = time.perf_counter() - started
+            if on_progress:
+                on_progress(stats)
+    finally:
+        if pool:
+            pool.shutdown()
+
+    stats.elapsed = time.perf_counter() - started
+    return stats
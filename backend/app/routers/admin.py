@@ -0,0 +1,95 @@
+"""Admin endpoints — maintenance jobs. Disabled unless ADMIN_TOKEN is set."""
+
+import asyncio
+import os
+import secrets
+import uuid
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException
+from pydantic import BaseModel, Field
+
+from ..rescoring import rescore, RescoreStats
+from ..scenario_loader import ScenarioSetError, get_snapshot
+from ..scenario_reload import reload_scenarios
+from .sessions import session_cache
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+
+def require_admin(x_admin_token: str = Header(default="")):
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=403, detail="Admin API is disabled")
+    if not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid admin token")
+
+
+class RescoreRequest(BaseModel):
+    scenario_ids: Optional[list[str]] = None
+    chunk_size: int = Field(500, ge=1, le=5000)
+    workers: int = Field(0, ge=0, le=32)
+
+
+class RescoreJob(BaseModel):
+    job_id: str
+    status: str  # "running" | "done" | "failed"
+    stats: dict = {}
+    error: Optional[str] = None
+
+
+_jobs: dict[str, RescoreJob] = {}
+_tasks: set[asyncio.Task] = set()
+
+
+@router.post("/rescore", response_model=RescoreJob, dependencies=[Depends(require_admin)])
+async def start_rescore(req: RescoreRequest):
+    """Start a background rescoring job; poll GET /admin/rescore/{job_id}."""
+    job = RescoreJob(job_id=str(uuid.uuid4()), status="running")
+    _jobs[job.job_id] = job
+
+    def progress(stats: RescoreStats):
+        job.stats = stats.as_dict()
+
+    async def run():
+        try:
+            stats = await rescore(req.scenario_ids, req.chunk_size, req.workers, progress)
+            job.stats = stats.as_dict()
+            job.status = "done"
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            # Open sessions may have been re-pinned to another scenario version
+            session_cache.clear()
+
+    task = asyncio.create_task(run())
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+    return job
+
+
+@router.get("/rescore/{job_id}", response_model=RescoreJob, dependencies=[Depends(require_admin)])
+async def get_rescore(job_id: str):
+    job = _jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job
+
+
+class ReloadResult(BaseModel):
+    changed: bool
+    content_hash: str
+    scenarios: int
+
+
+@router.post("/scenarios/reload", response_model=ReloadResult, dependencies=[Depends(require_admin)])
+async def reload_scenario_files():
+    """Publish the scenario files on disk now instead of at the watcher's next poll."""
+    try:
+        changed = await reload_scenarios(force=True)
+    except ScenarioSetError as e:
+        raise HTTPException(status_code=422, detail=e.errors)
+    snapshot = get_snapshot()
+    return ReloadResult(changed=changed, content_hash=snapshot.content_hash, scenarios=len(snapshot.scenarios))
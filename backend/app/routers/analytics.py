@@ -0,0 +1,69 @@
+"""Analytics endpoints — checklist miss rates, answered from precomputed aggregates."""
+
+from datetime import date
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..analytics import week_of
+from ..database import get_db
+from ..models import ChecklistItemStat
+from ..schemas import ChecklistStatsResponse
+
+router = APIRouter(prefix="/analytics", tags=["Analytics"])
+
+
+@router.get("/checklist", response_model=ChecklistStatsResponse)
+async def checklist_stats(
+    scenario_id: Optional[list[str]] = Query(None),
+    lang: Optional[list[str]] = Query(None),
+    since: Optional[date] = Query(None, description="First day to include (rounded down to its week)"),
+    until: Optional[date] = Query(None, description="Last day to include (rounded down to its week)"),
+    critical_only: bool = False,
+    group_by: list[Literal["language", "week"]] = Query([]),
+    min_sessions: int = Query(1, ge=1, description="Hide items reached by fewer sessions"),
+    limit: int = Query(50, ge=1, le=1000),
+    db: AsyncSession = Depends(get_db),
+):
+    """Checklist items ordered by miss rate, most missed first."""
+    stat = ChecklistItemStat
+    sessions = func.sum(stat.sessions)
+    missed = func.sum(stat.missed)
+    keys = [stat.scenario_id, stat.item]
+    if "language" in group_by:
+        keys.append(stat.language)
+    if "week" in group_by:
+        keys.append(stat.week)
+
+    query = (
+        select(
+            *keys,
+            func.max(stat.is_critical).label("is_critical"),
+            sessions.label("sessions"),
+            func.sum(stat.matched).label("matched"),
+            missed.label("missed"),
+            func.sum(stat.critical_missed).label("critical_missed"),
+        )
+        .group_by(*keys)
+        .having(sessions >= min_sessions)
+        .order_by((missed * 1.0 / sessions).desc(), sessions.desc(), stat.scenario_id, stat.item)
+        .limit(limit)
+    )
+    if scenario_id:
+        query = query.where(stat.scenario_id.in_(scenario_id))
+    if lang:
+        query = query.where(stat.language.in_(lang))
+    if since:
+        query = query.where(stat.week >= week_of(since))
+    if until:
+        query = query.where(stat.week <= week_of(until))
+    if critical_only:
+        query = query.where(stat.is_critical.is_(True))
+
+    rows = (await db.execute(query)).all()
+    return ChecklistStatsResponse(items=[
+        {**row._mapping, "is_critical": bool(row.is_critical), "miss_rate": round(row.missed / row.sessions, 4)}
+        for row in rows
+    ])
@@ -0,0 +1,103 @@
+"""Audio endpoints — upload a turn recording, play it back."""
+
+import os
+
+import anyio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..audio import (
+    AUDIO_TYPES, MAX_RECORDING_BYTES, SESSION_QUOTA_BYTES, RecordingTooLarge,
+    delete_files, disk_has_room, recording_path, recording_url, save_stream, session_audio_bytes,
+    rejected_uploads, upload_bytes, uploads,
+)
+from ..database import get_db
+from ..http_range import file_response
+from ..metrics import span
+from ..models import AudioRecording, Session
+from ..schemas import AudioUploadResponse
+from ..write_queue import write_queue
+
+router = APIRouter(tags=["Audio"])
+
+# Ids are random and a recording never changes, so any cached copy stays valid
+CACHE_CONTROL = "private, max-age=31536000, immutable"
+
+
+def _reject(status_code: int, detail: str) -> HTTPException:
+    rejected_uploads.inc()
+    return HTTPException(status_code=status_code, detail=detail)
+
+
+@router.post("/sessions/{session_id}/audio", response_model=AudioUploadResponse, status_code=201)
+async def upload_audio(session_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """
+    Store the recording of a turn, sent as the raw request body with its
+    audio Content-Type. Pass the returned `url` as the turn's user_audio_url.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type not in AUDIO_TYPES:
+        raise HTTPException(status_code=415, detail=f"Unsupported audio type: {content_type or 'none'}")
+    try:
+        declared = int(request.headers.get("content-length", "0"))
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid Content-Length")
+    if declared > MAX_RECORDING_BYTES:
+        raise _reject(413, f"Recording exceeds {MAX_RECORDING_BYTES} bytes")
+
+    row = (await db.execute(
+        select(Session.completed_at).where(Session.id == session_id)
+    )).one_or_none()
+    if row is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if row.completed_at is not None:
+        raise HTTPException(status_code=400, detail="Session already completed")
+    # Checked before reading the body so an over-quota client is turned
+    # away without uploading; the insert below checks again
+    if await session_audio_bytes(db, session_id) + declared > SESSION_QUOTA_BYTES:
+        raise _reject(413, "Session audio quota exceeded")
+    await db.close()
+    if not await anyio.to_thread.run_sync(disk_has_room):
+        raise _reject(507, "Not enough storage for audio")
+
+    try:
+        with span("audio.receive"):
+            audio_id, size = await save_stream(request.stream())
+    except RecordingTooLarge:
+        raise _reject(413, f"Recording exceeds {MAX_RECORDING_BYTES} bytes")
+    if size == 0:
+        await delete_files([audio_id])
+        raise HTTPException(status_code=400, detail="Empty recording")
+
+    async def record(db: AsyncSession) -> None:
+        if await session_audio_bytes(db, session_id) + size > SESSION_QUOTA_BYTES:
+            raise _reject(413, "Session audio quota exceeded")
+        await db.execute(insert(AudioRecording).values(
+            id=audio_id, session_id=session_id, content_type=content_type, size=size,
+        ))
+
+    try:
+        await write_queue.submit(record)
+    except Exception:
+        await delete_files([audio_id])
+        raise
+    uploads.inc()
+    upload_bytes.inc(size)
+    return AudioUploadResponse(audio_id=audio_id, url=recording_url(audio_id), content_type=content_type, size=size)
+
+
+@router.api_route("/audio/{audio_id}", methods=["GET", "HEAD"])
+async def get_audio(audio_id: str, request: Request, db: AsyncSession = Depends(get_db)):
+    """Play back a stored recording; supports Range requests for seeking and resuming."""
+    recording = (await db.execute(
+        select(AudioRecording.content_type, AudioRecording.size).where(AudioRecording.id == audio_id)
+    )).one_or_none()
+    await db.close()
+    path = recording_path(audio_id)
+    if recording is None or not await anyio.to_thread.run_sync(os.path.isfile, path):
+        raise HTTPException(status_code=404, detail="Recording not found")
+    return file_response(
+        request, path, recording.size, f'"{audio_id}"', recording.content_type,
+        {"Cache-Control": CACHE_CONTROL},
+    )
@@ -0,0 +1,38 @@
+"""Export endpoint — every session (and its turns) for offline analysis. Admin only."""
+
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+
+from ..export import ExportFilters, FORMATS, iter_export
+from .admin import require_admin
+
+router = APIRouter(prefix="/export", tags=["Export"], dependencies=[Depends(require_admin)])
+
+
+@router.get("/sessions")
+async def export_sessions(
+    format: Literal["ndjson", "csv"] = "ndjson",
+    since: Optional[datetime] = Query(None, description="Sessions started at or after this time"),
+    until: Optional[datetime] = Query(None, description="Sessions started before this time"),
+    scenario_id: Optional[list[str]] = Query(None),
+    lang: Optional[list[str]] = Query(None),
+    completed_only: bool = False,
+    include_turns: bool = True,
+):
+    """Stream matching sessions, oldest first, as NDJSON (one session per line) or CSV."""
+    filters = ExportFilters(
+        since=since,
+        until=until,
+        scenario_ids=scenario_id,
+        languages=lang,
+        completed_only=completed_only,
+    )
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return StreamingResponse(
+        iter_export(format, filters, include_turns),
+        media_type=FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="sessions-{stamp}.{format}"'},
+    )
@@ -1,7 +1,8 @@
 """Languages endpoint."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from ..schemas import LanguagesResponse, Language
+from ..http_cache import CachedJSON, cached_response
 
 router = APIRouter(tags=["Languages"])
 
@@ -13,7 +14,10 @@ SUPPORTED_LANGUAGES = [
     Language(code="te", name="Telugu", native_name="తెలుగు"),
 ]
 
+# The list is a constant, so it is rendered once at import time
+_RESPONSE = CachedJSON(LanguagesResponse(languages=SUPPORTED_LANGUAGES).model_dump_json().encode())
+
 
 @router.get("/languages", response_model=LanguagesResponse)
-async def get_languages():
-    return LanguagesResponse(languages=SUPPORTED_LANGUAGES)
+async def get_languages(request: Request):
+    return cached_response(request, _RESPONSE, "public, max-age=86400")
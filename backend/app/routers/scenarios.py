@@ -1,15 +1,45 @@
 """Scenarios endpoint."""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Request
 from ..schemas import ScenariosResponse, ScenarioMeta
-from ..scenario_loader import get_scenarios_for_language
+from ..scenario_loader import ScenarioSnapshot, get_snapshot
+from ..http_cache import CachedJSON, cached_response
 
 router = APIRouter(tags=["Scenarios"])
 
+CACHE_CONTROL = "public, max-age=300"
 
-@router.get("/scenarios", response_model=ScenariosResponse)
-async def list_scenarios(lang: str = "en"):
-    scenarios = get_scenarios_for_language(lang)
-    return ScenariosResponse(
+# (content_hash, lang) -> rendered response. Languages without scenarios share
+# the "" entry, so arbitrary ?lang= values cannot grow this dict.
+_responses: dict[tuple[str, str], CachedJSON] = {}
+
+
+def _render(snapshot: ScenarioSnapshot, lang: str) -> CachedJSON:
+    scenarios = snapshot.by_language.get(lang, ())
+    body = ScenariosResponse(
         scenarios=[ScenarioMeta(**s) for s in scenarios]
-    )
+    ).model_dump_json().encode()
+    return CachedJSON(body, etag=f'"{snapshot.content_hash[:32]}-{lang}"')
+
+
+def _cached(snapshot: ScenarioSnapshot, lang: str) -> CachedJSON:
+    content_hash = snapshot.content_hash
+    key = (content_hash, lang if lang in snapshot.by_language else "")
+    cached = _responses.get(key)
+    if cached is None:
+        if any(h != content_hash for h, _ in _responses):
+            _responses.clear()  # scenario files changed; drop stale renders
+        cached = _responses[key] = _render(snapshot, key[1])
+    return cached
+
+
+def prerender() -> None:
+    """Render the list for every language up front (at startup), so no request pays for it."""
+    snapshot = get_snapshot()
+    for lang in (*snapshot.by_language, ""):
+        _cached(snapshot, lang)
+
+
+@router.get("/scenarios", response_model=ScenariosResponse)
+async def list_scenarios(request: Request, lang: str = "en"):
+    return cached_response(request, _cached(get_snapshot(), lang), CACHE_CONTROL)
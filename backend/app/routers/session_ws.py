@@ -0,0 +1,285 @@
+"""
+Session WebSocket — one connection per simulation instead of a POST per turn.
+
+    ws /sessions/{session_id}/ws
+
+The session row and compiled scenario are loaded once when the socket opens
+and held in memory for the life of the connection, so a turn costs one
+message round trip and no database read. Messages are JSON text frames:
+
+    client  {"type": "turn", "node_key": "...", "user_text": "...", "user_audio_url": null}
+    server  {"type": "turn", ...}          same fields as TurnResponse
+    client  {"type": "complete"}           finish before the scenario ends
+    server  {"type": "report", "report": {...}}
+    server  {"type": "error", "detail": "..."}
+
+Turns are acknowledged as soon as they are evaluated and written behind:
+pending rows are flushed every FLUSH_TURNS turns, after FLUSH_IDLE_SECONDS
+without a message, on disconnect and on completion. When a turn reaches
+`__end__` the session is completed and the report pushed without being
+asked for. The connection owns its session while open; if turns arrive
+over HTTP or a rescore re-pins it meanwhile, the next flush detects it
+and the socket is closed with CLOSE_CONFLICT. Turns that were
+acknowledged but not yet written are listed in that last error so the
+client can resubmit them over HTTP:
+
+    server  {"type": "error", "detail": "...", "unsaved_turns": [
+                {"turn_index": 3, "node_key": "...", "user_text": "...", "user_audio_url": null}, ...]}
+"""
+
+import asyncio
+import json
+import logging
+import uuid
+from datetime import datetime, timezone
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+from sqlalchemy import select, insert, update
+
+from ..audio import attach_recordings
+from ..checklist_items import encode_outcome, outcome_rows
+from ..database import async_session
+from ..evaluation import update_report_state
+from ..fast_json import dumps
+from ..metrics import span
+from ..models import Session, SessionTurn, TurnOutcome
+from ..scenario_graph import CompiledScenario, END_NODE
+from ..scenario_loader import pin_version, unpin_version
+from ..scenario_versions import resolve_scenario
+from ..schemas import TurnRequest
+from ..write_queue import write_queue
+from .sessions import finish_session, session_cache, turn_payload
+
+logger = logging.getLogger("sushrusha.ws")
+
+router = APIRouter(tags=["Sessions"])
+
+FLUSH_TURNS = 8
+FLUSH_IDLE_SECONDS = 2.0
+
+# Application close codes (4000-4999)
+CLOSE_NOT_FOUND = 4404
+CLOSE_CONFLICT = 4409
+
+
+class _Conflict(Exception):
+    """The session changed underneath the connection (completed or written elsewhere)."""
+
+
+class _Channel:
+    """In-memory state of one open session; DB writes are batched behind it."""
+
+    def __init__(
+        self, session_id: str, scenario: CompiledScenario, version: str | None,
+        language: str, turn_count: int, report_state: dict,
+    ):
+        self.session_id = session_id
+        self.scenario = scenario
+        self.version = version  # sessions.scenario_version when the socket opened
+        self.language = language
+        self.turn_count = turn_count
+        self.flushed_count = turn_count
+        self.report_state = report_state
+        self.pending: list[dict] = []
+        self.pending_outcomes: list[dict] = []
+        pin_version(scenario)
+
+    def close(self) -> None:
+        """Release the scenario version once nothing is left to write."""
+        unpin_version(self.scenario)
+
+    def turn(self, req: TurnRequest) -> tuple[dict, bool]:
+        """Evaluate a turn and queue its row; returns the TurnResponse payload and whether the scenario ended."""
+        node = self.scenario.nodes.get(req.node_key)
+        if not node:
+            raise ValueError(f"Invalid node key: {req.node_key}")
+
+        with span("evaluate"):
+            eval_result, next_key = node.evaluate(req.user_text)
+        # Everything that can fail comes before the channel state changes
+        outcome = encode_outcome(self.scenario.id, eval_result)
+        self.turn_count += 1
+        update_report_state(self.report_state, eval_result, node.checklist)
+        turn_id = str(uuid.uuid4())
+        self.pending.append({
+            "id": turn_id,
+            "session_id": self.session_id,
+            "turn_index": self.turn_count,
+            "node_key": req.node_key,
+            "user_text": req.user_text,
+            "user_audio_url": req.user_audio_url,
+            "created_at": datetime.now(timezone.utc),
+        })
+        self.pending_outcomes += outcome_rows(turn_id, outcome)
+        payload = turn_payload(self.scenario, next_key, self.language, eval_result, self.turn_count)
+        return payload, next_key == END_NODE
+
+    async def flush(self, complete: bool = False) -> dict | None:
+        """Write pending turns and the running aggregate; with `complete`, also complete the session and return its report."""
+        if not self.pending and not complete:
+            return None
+        rows, outcomes = self.pending, self.pending_outcomes
+
+        async def save(db) -> dict | None:
+            # Guarded on the turn count we last wrote and the version we
+            # evaluate against, so concurrent HTTP turns, an HTTP /complete or
+            # a rescore are detected instead of clobbered
+            claimed = (await db.execute(
+                update(Session)
+                .where(
+                    Session.id == self.session_id,
+                    Session.completed_at.is_(None),
+                    Session.turn_count == self.flushed_count,
+                    Session.scenario_version.is_not_distinct_from(self.version),
+                )
+                .values(turn_count=self.turn_count, report_state=self.report_state)
+                .execution_options(synchronize_session=False)
+            )).rowcount
+            if not claimed:
+                raise _Conflict("Session was modified outside this connection")
+            if rows:
+                await db.execute(insert(SessionTurn), rows)
+                await attach_recordings(db, self.session_id, [(r["id"], r["user_audio_url"]) for r in rows])
+            if outcomes:
+                await db.execute(insert(TurnOutcome), outcomes)
+            if complete:
+                return await finish_session(db, self.session_id, self.scenario, self.report_state)
+            return None
+
+        report = await write_queue.submit(save)
+        if complete:
+            session_cache.discard(self.session_id)
+        self.pending, self.pending_outcomes = [], []
+        self.flushed_count = self.turn_count
+        return report
+
+
+async def _open_channel(session_id: str) -> _Channel | str:
+    """Load the session once; returns an error message instead if it cannot be played."""
+    async with async_session() as db:
+        row = (await db.execute(
+            select(
+                Session.scenario_id, Session.scenario_version, Session.language,
+                Session.turn_count, Session.completed_at, Session.report_state,
+            )
+            .where(Session.id == session_id)
+        )).one_or_none()
+        if row is None:
+            return "Session not found"
+        if row.completed_at is not None:
+            return "Session already completed"
+        scenario = await resolve_scenario(db, row.scenario_id, row.scenario_version)
+    if not scenario:
+        return "Scenario data not found"
+    if row.report_state is None:
+        # Sessions from before running aggregates were kept: stay on HTTP
+        return "Session predates the WebSocket channel; use the HTTP endpoints"
+    return _Channel(session_id, scenario, row.scenario_version, row.language, row.turn_count, row.report_state)
+
+
+_final_flushes: set[asyncio.Task] = set()
+
+
+async def _final_flush(channel: _Channel) -> None:
+    try:
+        await channel.flush()
+    except Exception:
+        logger.exception(
+            "Could not write %d pending turn(s) of session %s", len(channel.pending), channel.session_id
+        )
+
+
+async def _receive_text(websocket: WebSocket) -> str | None:
+    """The next text frame; None for a binary frame. Raises WebSocketDisconnect."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    return message.get("text")
+
+
+async def _send(websocket: WebSocket, message: dict) -> None:
+    await websocket.send_text(dumps(message).decode("utf-8"))
+
+
+@router.websocket("/sessions/{session_id}/ws")
+async def session_socket(websocket: WebSocket, session_id: str):
+    await websocket.accept()
+    channel = await _open_channel(session_id)
+    if isinstance(channel, str):
+        await _send(websocket, {"type": "error", "detail": channel})
+        code = CLOSE_NOT_FOUND if channel == "Session not found" else CLOSE_CONFLICT
+        await websocket.close(code=code)
+        return
+
+    try:
+        while True:
+            timeout = FLUSH_IDLE_SECONDS if channel.pending else None
+            try:
+                text = await asyncio.wait_for(_receive_text(websocket), timeout)
+            except asyncio.TimeoutError:
+                await channel.flush()
+                continue
+            if text is None:
+                await _send(websocket, {"type": "error", "detail": "Messages must be JSON text frames"})
+                continue
+
+            try:
+                message = json.loads(text)
+                kind = message.get("type")
+            except (ValueError, AttributeError):
+                await _send(websocket, {"type": "error", "detail": "Messages must be JSON objects"})
+                continue
+
+            if kind == "turn":
+                try:
+                    payload, ended = channel.turn(TurnRequest.model_validate(message))
+                except ValidationError as e:
+                    await _send(websocket, {"type": "error", "detail": e.errors(include_url=False, include_context=False)})
+                    continue
+                except ValueError as e:
+                    await _send(websocket, {"type": "error", "detail": str(e)})
+                    continue
+                except KeyError:
+                    # An item without an ordinal (see checklist_items); the channel is unchanged
+                    logger.exception("Could not encode a turn of session %s", session_id)
+                    await _send(websocket, {"type": "error", "detail": "Turn could not be recorded"})
+                    continue
+                await _send(websocket, {"type": "turn", **payload})
+                if not ended:
+                    if len(channel.pending) >= FLUSH_TURNS:
+                        await channel.flush()
+                    continue
+            elif kind != "complete":
+                await _send(websocket, {"type": "error", "detail": f"Unknown message type: {kind!r}"})
+                continue
+
+            # Scenario reached __end__, or the client finished early
+            report = await channel.flush(complete=True)
+            await _send(websocket, {"type": "report", "report": report})
+            await websocket.close()
+            return
+    except WebSocketDisconnect:
+        pass
+    except _Conflict as e:
+        # Acknowledged turns that could not be written: hand them back
+        unsaved = [
+            {key: row[key] for key in ("turn_index", "node_key", "user_text", "user_audio_url")}
+            for row in channel.pending
+        ]
+        channel.pending, channel.pending_outcomes = [], []
+        await _send(websocket, {"type": "error", "detail": str(e), "unsaved_turns": unsaved})
+        await websocket.close(code=CLOSE_CONFLICT)
+        return
+    finally:
+        if channel.pending:
+            # Disconnected with acknowledged turns still in memory. The flush
+            # runs as its own task so it finishes even if this handler is
+            # being cancelled (server shutdown, client gone mid-await).
+            task = asyncio.create_task(_final_flush(channel))
+            _final_flushes.add(task)
+            task.add_done_callback(_final_flushes.discard)
+            task.add_done_callback(lambda _: channel.close())
+            await asyncio.shield(task)
+        else:
+            channel.close()
@@ -1,26 +1,146 @@
 """Session endpoints — start, turn, complete, history."""
 
+import base64
+import os
+import time
+import uuid
+from collections import OrderedDict
 from datetime import datetime, timezone
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, insert, update, desc, tuple_, type_coerce, Text
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 
+from ..audio import attach_recordings
 from ..database import get_db
-from ..models import User, Session, SessionTurn
+from ..metrics import Counter, gauge, span
+from ..write_queue import write_queue
+from ..analytics import record_completions
+from ..checklist_items import decode_outcome, encode_outcome, outcome_rows, outcomes_column
+from ..models import User, Session, SessionTurn, TurnOutcome
 from ..schemas import (
     SessionStartRequest, SessionStartResponse,
-    TurnRequest, TurnResponse, TurnEvaluation, Progress,
-    CompleteResponse, Report, ChecklistResult,
-    HistoryResponse, SessionSummary,
+    TurnRequest, TurnResponse,
+    CompleteResponse, Report,
+    HistoryResponse,
     SessionReportResponse,
     NodeContent, ScenarioMeta,
+    BatchSession, BatchEvaluateRequest, BatchEvaluateResponse, BatchSessionResult,
+)
+from ..scenario_loader import get_compiled_scenario, pin_version, unpin_version
+from ..scenario_versions import resolve_scenario, resolve_scenarios
+from ..scenario_graph import CompiledScenario, END_NODE
+from ..fast_json import json_response, splice_json
+from ..evaluation import (
+    evaluate_turn, generate_report,
+    new_report_state, update_report_state, finalize_report, transcript_entry,
 )
-from ..scenario_loader import get_scenario, get_node, get_next_node_key, get_scenarios_for_language
-from ..evaluation import evaluate_turn, generate_report
 
 router = APIRouter(tags=["Sessions"])
 
 
+# ── Active session cache ──────────────────────────────────────
+
+
+class _CachedSession:
+    __slots__ = ("scenario", "language", "version", "expires_at")
+
+    def __init__(self, scenario: CompiledScenario, language: str, version: str | None, expires_at: float):
+        self.scenario = scenario
+        self.language = language
+        self.version = version  # sessions.scenario_version as read; None for sessions from before versioning
+        self.expires_at = expires_at
+
+
+class SessionStateCache:
+    """
+    What /turn needs to know about an open session (its pinned scenario and
+    language), so turns skip the session read entirely.
+
+    Bounded LRU with a sliding TTL: every hit renews an entry, idle ones
+    expire after `ttl` seconds and the least recently used are evicted past
+    `max_entries`. An entry is a few hundred bytes (the scenario is shared
+    with the loader), so the default 50,000 stays around 10-20 MB.
+
+    Entries are filled at start, renewed by each turn and dropped at
+    completion. Each entry pins its scenario version in the loader's LRU
+    (scenario_loader.pin_version) until it leaves the cache. The cache is
+    per process and never trusted for writes: the turn's UPDATE is still
+    guarded on completed_at and on the cached scenario_version, so a session
+    completed, or re-pinned by a rescore, through another worker, the CLI or
+    the WebSocket is caught and dropped here.
+    """
+
+    def __init__(self, max_entries: int = 50_000, ttl: float = 1800.0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _CachedSession] = OrderedDict()
+        self.hits = Counter("sushrusha_session_cache_hits", "Turns served without reading the session row")
+        self.misses = Counter("sushrusha_session_cache_misses", "Turns that had to read the session row")
+        self.evictions = Counter("sushrusha_session_cache_evictions", "Entries evicted over the size cap")
+        self.expirations = Counter("sushrusha_session_cache_expirations", "Entries dropped after the TTL")
+        gauge("sushrusha_session_cache_entries", "Sessions currently cached", lambda: len(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, session_id: str) -> _CachedSession | None:
+        entry = self._entries.get(session_id)
+        now = time.monotonic()
+        if entry is not None and entry.expires_at <= now:
+            del self._entries[session_id]
+            unpin_version(entry.scenario)
+            self.expirations.inc()
+            entry = None
+        if entry is None:
+            self.misses.inc()
+            return None
+        entry.expires_at = now + self.ttl
+        self._entries.move_to_end(session_id)
+        self.hits.inc()
+        return entry
+
+    def put(self, session_id: str, scenario: CompiledScenario, language: str, version: str | None) -> None:
+        if self.max_entries <= 0:
+            return
+        now = time.monotonic()
+        pin_version(scenario)
+        replaced = self._entries.pop(session_id, None)
+        if replaced is not None:
+            unpin_version(replaced.scenario)
+        self._entries[session_id] = _CachedSession(scenario, language, version, now + self.ttl)
+        # With a sliding TTL the oldest entries are the least recently used
+        # ones, so expired entries are always at the front
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries.values()))
+            if oldest.expires_at <= now:
+                unpin_version(entries.popitem(last=False)[1].scenario)
+                self.expirations.inc()
+            elif len(entries) > self.max_entries:
+                unpin_version(entries.popitem(last=False)[1].scenario)
+                self.evictions.inc()
+            else:
+                break
+
+    def discard(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is not None:
+            unpin_version(entry.scenario)
+
+    def clear(self) -> None:
+        for entry in self._entries.values():
+            unpin_version(entry.scenario)
+        self._entries.clear()
+
+
+session_cache = SessionStateCache(
+    max_entries=int(os.getenv("SESSION_CACHE_MAX_ENTRIES", "50000")),
+    ttl=float(os.getenv("SESSION_CACHE_TTL", "1800")),
+)
+
+
 async def _get_or_create_user(db: AsyncSession, device_id: str | None) -> User | None:
     if not device_id:
         return None
@@ -34,216 +154,549 @@ async def _get_or_create_user(db: AsyncSession, device_id: str | None) -> User |
 
 
 @router.post("/sessions/start", response_model=SessionStartResponse)
-async def start_session(req: SessionStartRequest, db: AsyncSession = Depends(get_db)):
-    scenario = get_scenario(req.scenario_id)
+async def start_session(req: SessionStartRequest):
+    scenario = get_compiled_scenario(req.scenario_id)
     if not scenario:
         raise HTTPException(status_code=404, detail="Scenario not found")
 
-    user = await _get_or_create_user(db, req.device_id)
-
-    session = Session(
-        user_id=user.id if user else None,
-        device_id=req.device_id,
-        scenario_id=req.scenario_id,
-        language=req.lang,
-    )
-    db.add(session)
-    await db.commit()
-    await db.refresh(session)
-
     # Get start node
-    node_data = get_node(req.scenario_id, "start", req.lang)
-    if not node_data:
+    start_node = scenario.nodes.get("start")
+    if not start_node:
         raise HTTPException(status_code=500, detail="Scenario has no start node")
 
+    async def create_session(db: AsyncSession) -> str:
+        user = await _get_or_create_user(db, req.device_id)
+        session = Session(
+            user_id=user.id if user else None,
+            device_id=req.device_id,
+            scenario_id=req.scenario_id,
+            scenario_version=scenario.version,
+            language=req.lang,
+            report_state=new_report_state(),
+        )
+        db.add(session)
+        await db.flush()
+        return session.id
+
+    session_id = await write_queue.submit(create_session)
+    session_cache.put(session_id, scenario, req.lang, scenario.version)
+
     return SessionStartResponse(
-        session_id=session.id,
+        session_id=session_id,
         node=NodeContent(
             node_key="start",
-            patient_text=node_data["patient_text"],
-        ),
-        scenario=ScenarioMeta(
-            id=scenario["id"],
-            title=scenario.get("title", {}).get(req.lang, scenario.get("title", {}).get("en", "")),
-            category=scenario.get("category", {}).get(req.lang, scenario.get("category", {}).get("en", "")),
-            difficulty=scenario.get("difficulty", "beginner"),
-            estimated_minutes=scenario.get("estimated_minutes", 10),
-            description=scenario.get("description", {}).get(req.lang, scenario.get("description", {}).get("en", "")),
+            patient_text=start_node.text(req.lang),
         ),
+        scenario=ScenarioMeta(**scenario.meta_for(req.lang)),
     )
 
 
-@router.post("/sessions/{session_id}/turn", response_model=TurnResponse)
-async def submit_turn(session_id: str, req: TurnRequest, db: AsyncSession = Depends(get_db)):
-    # Get session
-    result = await db.execute(select(Session).where(Session.id == session_id))
-    session = result.scalar_one_or_none()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
-    if session.completed_at:
-        raise HTTPException(status_code=400, detail="Session already completed")
-
-    # Get current node checklist
-    node_data = get_node(session.scenario_id, req.node_key, session.language)
-    if not node_data:
-        raise HTTPException(status_code=400, detail=f"Invalid node key: {req.node_key}")
-
-    # Evaluate turn
-    eval_result = evaluate_turn(req.user_text, node_data["expected_checklist"])
-
-    # Count existing turns
-    turn_count_result = await db.execute(
-        select(SessionTurn).where(SessionTurn.session_id == session_id)
-    )
-    existing_turns = turn_count_result.scalars().all()
-    turn_index = len(existing_turns) + 1
-
-    # Save turn
-    turn = SessionTurn(
-        session_id=session_id,
-        turn_index=turn_index,
-        node_key=req.node_key,
-        user_text=req.user_text,
-        user_audio_url=req.user_audio_url,
-        matched_items=eval_result["matched_items"],
-        missed_items=eval_result["missed_items"],
-        critical_missed=eval_result["critical_missed"],
-    )
-    db.add(turn)
-    await db.commit()
-
-    # Get next node
-    next_node_key = get_next_node_key(session.scenario_id, req.node_key, req.user_text)
-    is_complete = next_node_key == "__end__"
-
-    scenario = get_scenario(session.scenario_id)
-    total_estimate = scenario.get("total_turns_estimate", 8) if scenario else 8
-
+def turn_payload(scenario: CompiledScenario, next_key: str, language: str, eval_result: dict, turn_index: int) -> dict:
+    """TurnResponse-shaped dict for an evaluated turn (also sent over the session WebSocket)."""
     next_node = None
+    is_complete = next_key == END_NODE
     if not is_complete:
-        next_data = get_node(session.scenario_id, next_node_key, session.language)
+        next_data = scenario.nodes.get(next_key)
         if next_data:
-            next_node = NodeContent(
-                node_key=next_node_key,
-                patient_text=next_data["patient_text"],
-            )
-
-    return TurnResponse(
-        next_node=next_node,
-        evaluation=TurnEvaluation(**eval_result),
-        progress=Progress(turn_index=turn_index, total_turns_estimate=total_estimate),
-        is_complete=is_complete,
-    )
+            next_node = {
+                "node_key": next_data.key,
+                "patient_text": next_data.text(language),
+                "patient_audio_url": None,
+                "patient_media_url": None,
+            }
+    return {
+        "next_node": next_node,
+        "evaluation": eval_result,
+        "progress": {"turn_index": turn_index, "total_turns_estimate": scenario.total_turns_estimate},
+        "is_complete": is_complete,
+    }
+
+
+# Turns retried after the session was found re-pinned under its cache entry
+TURN_ATTEMPTS = 3
+
+
+class _ScenarioChanged(Exception):
+    """The session's scenario_version is no longer the one the turn was evaluated against."""
+
+
+async def _load_turn_session(db: AsyncSession, session_id: str) -> _CachedSession:
+    """Read what a turn needs about an open session and cache it. Raises HTTPException."""
+    with span("db.execute"):
+        result = await db.execute(
+            select(Session.scenario_id, Session.scenario_version, Session.language, Session.completed_at)
+            .where(Session.id == session_id)
+        )
+    row = result.one_or_none()
+    if not row:
+        await db.close()
+        raise HTTPException(status_code=404, detail="Session not found")
+    if row.completed_at is not None:
+        await db.close()
+        raise HTTPException(status_code=400, detail="Session already completed")
 
+    # Get the scenario version the session started on
+    with span("scenario.lookup"):
+        scenario = await resolve_scenario(db, row.scenario_id, row.scenario_version)
+    if scenario is not None:
+        session_cache.put(session_id, scenario, row.language, row.scenario_version)
+    return _CachedSession(scenario, row.language, row.scenario_version, 0.0)
 
-@router.post("/sessions/{session_id}/complete", response_model=CompleteResponse)
-async def complete_session(session_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Session).where(Session.id == session_id))
-    session = result.scalar_one_or_none()
-    if not session:
-        raise HTTPException(status_code=404, detail="Session not found")
 
-    # Get all turns
+@router.post("/sessions/{session_id}/turn", response_model=TurnResponse)
+async def submit_turn(session_id: str, req: TurnRequest, db: AsyncSession = Depends(get_db)):
+    session = session_cache.get(session_id)
+    for _ in range(TURN_ATTEMPTS):
+        if session is None:
+            session = await _load_turn_session(db, session_id)
+        scenario, language, version = session.scenario, session.language, session.version
+        # Nothing else is read here: return the connection to the pool rather
+        # than holding it while the turn waits for its group commit
+        await db.close()
+        node = scenario.nodes.get(req.node_key) if scenario else None
+        if not node:
+            raise HTTPException(status_code=400, detail=f"Invalid node key: {req.node_key}")
+
+        # Evaluate turn and pick the branch to follow
+        with span("evaluate"):
+            eval_result, next_key = node.evaluate(req.user_text)
+        outcome = encode_outcome(scenario.id, eval_result)
+
+        async def save_turn(db: AsyncSession) -> int:
+            # Claim the next turn index and read the running aggregate in one
+            # statement; ops run one after another inside the group commit, so
+            # concurrent turns for the same session never see the same turn_count.
+            # Guarded on the version the turn was evaluated against, which a
+            # rescore elsewhere may have changed since it was cached.
+            claimed = (await db.execute(
+                update(Session)
+                .where(
+                    Session.id == session_id,
+                    Session.completed_at.is_(None),
+                    Session.scenario_version.is_not_distinct_from(version),
+                )
+                .values(turn_count=Session.turn_count + 1)
+                .returning(Session.turn_count, Session.report_state)
+                .execution_options(synchronize_session=False)
+            )).one_or_none()
+            if claimed is None:
+                session_cache.discard(session_id)
+                completed = await db.scalar(select(Session.completed_at).where(Session.id == session_id))
+                if completed is None:
+                    raise _ScenarioChanged()
+                raise HTTPException(status_code=400, detail="Session already completed")
+            turn_index, report_state = claimed
+
+            turn_id = str(uuid.uuid4())
+            await db.execute(insert(SessionTurn).values(
+                id=turn_id,
+                session_id=session_id,
+                turn_index=turn_index,
+                node_key=req.node_key,
+                user_text=req.user_text,
+                user_audio_url=req.user_audio_url,
+            ))
+            outcomes = outcome_rows(turn_id, outcome)
+            if outcomes:
+                await db.execute(insert(TurnOutcome), outcomes)
+            await attach_recordings(db, session_id, [(turn_id, req.user_audio_url)])
+
+            # Sessions started before report_state existed fall back to generate_report
+            if report_state is not None:
+                update_report_state(report_state, eval_result, node.checklist)
+                await db.execute(
+                    update(Session)
+                    .where(Session.id == session_id)
+                    .values(report_state=report_state)
+                    .execution_options(synchronize_session=False)
+                )
+            return turn_index
+
+        try:
+            with span("write_queue.commit"):
+                turn_index = await write_queue.submit(save_turn)
+            break
+        except _ScenarioChanged:
+            # Re-read the session and evaluate again against its new version
+            session = None
+        except IntegrityError:
+            # Only reachable if turn indexes were assigned outside this endpoint
+            raise HTTPException(status_code=409, detail="Conflicting turn, please retry")
+    else:
+        raise HTTPException(status_code=409, detail="Session is being rescored, please retry")
+
+    with span("serialize"):
+        return json_response(turn_payload(scenario, next_key, language, eval_result, turn_index))
+
+
+async def _load_turns(db: AsyncSession, session_id: str, scenario_id: str) -> list[dict]:
+    """A session's stored turns with their decoded outcomes, in turn order."""
     turns_result = await db.execute(
-        select(SessionTurn).where(SessionTurn.session_id == session_id).order_by(SessionTurn.turn_index)
+        select(
+            SessionTurn.turn_index, SessionTurn.node_key, SessionTurn.user_text, outcomes_column(SessionTurn.id),
+        )
+        .where(SessionTurn.session_id == session_id)
+        .order_by(SessionTurn.turn_index)
     )
-    turns = turns_result.scalars().all()
-
-    # Build turn data for report generation
-    turn_data = [
+    return [
         {
             "node_key": t.node_key,
             "user_text": t.user_text,
-            "matched_items": t.matched_items,
-            "missed_items": t.missed_items,
-            "critical_missed": t.critical_missed,
+            **decode_outcome(scenario_id, t.outcomes),
             "turn_index": t.turn_index,
         }
-        for t in turns
+        for t in turns_result
     ]
 
-    scenario = get_scenario(session.scenario_id)
+
+async def load_transcript(db: AsyncSession, session_id: str, scenario: CompiledScenario) -> list[dict]:
+    """Report transcript of a session, built from its stored turns."""
+    transcript = []
+    for turn in await _load_turns(db, session_id, scenario.id):
+        node = scenario.nodes.get(turn["node_key"])
+        transcript.append(transcript_entry(turn, node.text("en") if node else ""))
+    return transcript
+
+
+async def finish_session(
+    db: AsyncSession, session_id: str, scenario: CompiledScenario, report_state: dict | None,
+) -> dict:
+    """
+    Complete a session from inside a write op: build its report from
+    `report_state` (None for sessions from before running aggregates were
+    kept) and the turns stored so far, write it and count it in the
+    analytics. The caller has checked, in the same transaction, that the
+    session is still open.
+
+    The score, checklist results and suggestions cost the same however long
+    the session was, but the transcript is read back from the turn rows, so
+    completion stays O(turns): about 20-40 us per turn on top of ~15 ms for
+    the commit (benchmarks/bench_complete.py).
+    """
+    if report_state is not None:
+        report_data = finalize_report(report_state, await load_transcript(db, session_id, scenario))
+    else:
+        report_data = generate_report(await _load_turns(db, session_id, scenario.id), scenario.data)
+    completed = (await db.execute(
+        update(Session)
+        .where(Session.id == session_id, Session.completed_at.is_(None))
+        .values(completed_at=datetime.now(timezone.utc), score=report_data["score"], report_json=report_data)
+        .returning(Session.scenario_id, Session.language, Session.started_at)
+        .execution_options(synchronize_session=False)
+    )).one()
+    await record_completions(db, [(*completed, report_data)])
+    return report_data
+
+
+@router.post("/sessions/{session_id}/complete", response_model=CompleteResponse)
+async def complete_session(session_id: str, db: AsyncSession = Depends(get_db)):
+    row = (await db.execute(
+        select(Session.scenario_id, Session.scenario_version, Session.completed_at, Session.report_json)
+        .where(Session.id == session_id)
+    )).one_or_none()
+    if not row:
+        raise HTTPException(status_code=404, detail="Session not found")
+    if row.completed_at is not None:
+        # A retried /complete gets the report it was already given
+        await db.close()
+        return json_response({"report": row.report_json})
+    scenario = await resolve_scenario(db, row.scenario_id, row.scenario_version)
+    await db.close()
     if not scenario:
         raise HTTPException(status_code=500, detail="Scenario data not found")
 
-    report_data = generate_report(turn_data, scenario)
-
-    # Update session
-    session.completed_at = datetime.now(timezone.utc)
-    session.score = report_data["score"]
-    session.report_json = report_data
-    await db.commit()
-
-    return CompleteResponse(
-        report=Report(
-            score=report_data["score"],
-            checklist_results=[ChecklistResult(**cr) for cr in report_data["checklist_results"]],
-            critical_misses=report_data["critical_misses"],
-            suggestions=report_data["suggestions"],
-            transcript=report_data.get("transcript", []),
+    async def save_report(db: AsyncSession) -> dict:
+        # Read inside the write transaction, so a turn committed after the
+        # request started is part of the report rather than left out of it
+        session = (await db.execute(
+            select(Session.scenario_version, Session.completed_at, Session.report_state, Session.report_json)
+            .where(Session.id == session_id)
+        )).one()
+        if session.completed_at is not None:
+            return session.report_json
+        pinned = scenario
+        if session.scenario_version != scenario.version:  # re-pinned by a rescore meanwhile
+            pinned = await resolve_scenario(db, row.scenario_id, session.scenario_version) or scenario
+        return await finish_session(db, session_id, pinned, session.report_state)
+
+    with span("write_queue.commit"):
+        report_data = await write_queue.submit(save_report)
+    session_cache.discard(session_id)
+
+    with span("serialize"):
+        return json_response({"report": report_data})
+
+
+def _as_utc(value: datetime | None) -> datetime | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _evaluate_offline_session(item: BatchSession) -> tuple[dict, list[dict], list[dict], dict | None]:
+    """
+    Replay one offline session through the same evaluation as /turn and /complete.
+
+    Returns the session row, its turn rows, their turn_outcomes rows and the
+    report (None if the session is still open). Raises ValueError with a
+    client-facing message on bad input.
+    """
+    scenario = get_compiled_scenario(item.scenario_id)
+    if not scenario:
+        raise ValueError("Scenario not found")
+
+    session_id = str(uuid.uuid4())
+    started_at = _as_utc(item.started_at) or datetime.now(timezone.utc)
+    state = new_report_state()
+    transcript = []
+    turn_rows, outcomes = [], []
+
+    for turn_index, turn in enumerate(item.turns, start=1):
+        node = scenario.nodes.get(turn.node_key)
+        if not node:
+            raise ValueError(f"Turn {turn_index}: invalid node key: {turn.node_key}")
+        eval_result = evaluate_turn(turn.user_text, node.checklist, node.matcher)
+        outcome = encode_outcome(item.scenario_id, eval_result)
+        update_report_state(state, eval_result, node.checklist)
+        transcript.append(transcript_entry(
+            {"turn_index": turn_index, "user_text": turn.user_text, **eval_result}, node.text("en"),
+        ))
+        turn_id = str(uuid.uuid4())
+        turn_rows.append({
+            "id": turn_id,
+            "session_id": session_id,
+            "turn_index": turn_index,
+            "node_key": turn.node_key,
+            "user_text": turn.user_text,
+            "user_audio_url": turn.user_audio_url,
+            "created_at": started_at,
+        })
+        outcomes += outcome_rows(turn_id, outcome)
+
+    report_data = finalize_report(state, transcript) if item.complete else None
+    session_row = {
+        "id": session_id,
+        "user_id": None,
+        "device_id": item.device_id,
+        "client_id": item.client_id,
+        "scenario_id": item.scenario_id,
+        "scenario_version": scenario.version,
+        "language": item.lang,
+        "started_at": started_at,
+        "completed_at": (_as_utc(item.completed_at) or datetime.now(timezone.utc)) if item.complete else None,
+        "turn_count": len(turn_rows),
+        "score": report_data["score"] if report_data else None,
+        "report_json": report_data,
+        "report_state": state,
+    }
+    return session_row, turn_rows, outcomes, report_data
+
+
+async def _get_or_create_users(db: AsyncSession, device_ids: set[str]) -> dict[str, str]:
+    """Map device_id -> user id, creating missing users with one batched insert."""
+    if not device_ids:
+        return {}
+    await db.execute(
+        sqlite_insert(User).on_conflict_do_nothing(index_elements=["device_id"]),
+        [{"id": str(uuid.uuid4()), "device_id": d} for d in device_ids],
+    )
+    rows = await db.execute(select(User.device_id, User.id).where(User.device_id.in_(device_ids)))
+    return dict(rows.all())
+
+
+@router.post("/sessions/batch-evaluate", response_model=BatchEvaluateResponse)
+async def batch_evaluate(req: BatchEvaluateRequest):
+    """
+    Ingest complete sessions recorded offline in one request.
+
+    Every session is evaluated exactly as if it had been played online; the
+    valid ones are written with one executemany insert per table in a single
+    transaction. Sessions that fail validation are reported individually and
+    do not affect the rest of the batch.
+
+    Retrying an upload is safe: a session whose (device_id, client_id) is
+    already stored is not inserted again, and its result carries the stored
+    session's id and report with `duplicate` set. `accepted` counts only the
+    sessions this request stored; replays are counted in `duplicates`.
+    """
+    results: list[BatchSessionResult] = []
+    session_rows: list[dict] = []
+    turn_rows: list[dict] = []
+    outcomes: dict[str, list[dict]] = {}  # session id -> turn_outcomes rows
+
+    for index, item in enumerate(req.sessions):
+        try:
+            session_row, rows, turn_outcomes, report_data = _evaluate_offline_session(item)
+        except ValueError as e:
+            results.append(BatchSessionResult(index=index, client_id=item.client_id, status="error", error=str(e)))
+            continue
+        session_rows.append(session_row)
+        turn_rows.extend(rows)
+        outcomes[session_row["id"]] = turn_outcomes
+        results.append(BatchSessionResult(
+            index=index,
+            client_id=item.client_id,
+            status="ok",
+            session_id=session_row["id"],
+            report=Report(**report_data) if report_data else None,
+        ))
+
+    async def write(db: AsyncSession) -> dict[str, tuple[str, dict | None]]:
+        users = await _get_or_create_users(db, {r["device_id"] for r in session_rows if r["device_id"]})
+        for row in session_rows:
+            row["user_id"] = users.get(row["device_id"])
+
+        await db.execute(
+            sqlite_insert(Session).on_conflict_do_nothing(index_elements=["device_id", "client_id"]),
+            session_rows,
         )
+        # A keyed row that lost to an earlier upload (or to an earlier row of
+        # this one) was skipped; map it to the session that is stored
+        keys = {(r["device_id"], r["client_id"]) for r in session_rows if r["device_id"] and r["client_id"]}
+        stored = {}
+        if keys:
+            stored = {
+                (r.device_id, r.client_id): (r.id, r.report_json)
+                for r in await db.execute(
+                    select(Session.id, Session.device_id, Session.client_id, Session.report_json)
+                    .where(tuple_(Session.device_id, Session.client_id).in_(keys))
+                )
+            }
+        duplicates = {}
+        for r in session_rows:
+            existing = stored.get((r["device_id"], r["client_id"]))
+            if existing is not None and existing[0] != r["id"]:
+                duplicates[r["id"]] = existing
+
+        turns = [t for t in turn_rows if t["session_id"] not in duplicates]
+        if turns:
+            await db.execute(insert(SessionTurn), turns)
+        outcome_batch = [
+            row for session_id, session_outcomes in outcomes.items() if session_id not in duplicates
+            for row in session_outcomes
+        ]
+        if outcome_batch:
+            await db.execute(insert(TurnOutcome), outcome_batch)
+        await record_completions(db, [
+            (r["scenario_id"], r["language"], r["started_at"], r["report_json"])
+            for r in session_rows if r["report_json"] and r["id"] not in duplicates
+        ])
+        return duplicates
+
+    duplicates = {}
+    if session_rows:
+        with span("write_queue.commit"):
+            duplicates = await write_queue.submit(write)
+        for result in results:
+            if result.session_id in duplicates:
+                session_id, report_data = duplicates[result.session_id]
+                result.session_id = session_id
+                result.report = Report(**report_data) if report_data else None
+                result.duplicate = True
+
+    return BatchEvaluateResponse(
+        results=results,
+        accepted=len(session_rows) - len(duplicates),
+        duplicates=len(duplicates),
+        failed=len(results) - len(session_rows),
     )
 
 
+def _encode_cursor(started_at: datetime, session_id: str) -> str:
+    raw = f"{started_at.isoformat()}|{session_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        started_at, session_id = raw.split("|", 1)
+        return datetime.fromisoformat(started_at), session_id
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _title(scenario: CompiledScenario | None, lang: str) -> str:
+    return scenario.title(lang) if scenario else ""
+
+
 @router.get("/sessions/history", response_model=HistoryResponse)
-async def get_history(device_id: str | None = None, limit: int = 10, db: AsyncSession = Depends(get_db)):
-    query = select(Session).order_by(desc(Session.started_at)).limit(limit)
+async def get_history(
+    device_id: str | None = None,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: str | None = None,
+    db: AsyncSession = Depends(get_db),
+):
+    # Summary columns only; report_json and report_state are never loaded.
+    # Pages are keyed on (started_at, id), so deep pages cost the same as the first.
+    query = (
+        select(
+            Session.id, Session.scenario_id, Session.scenario_version, Session.language,
+            Session.started_at, Session.completed_at, Session.score,
+        )
+        .order_by(desc(Session.started_at), desc(Session.id))
+        .limit(limit + 1)
+    )
     if device_id:
         query = query.where(Session.device_id == device_id)
+    if cursor:
+        query = query.where(tuple_(Session.started_at, Session.id) < _decode_cursor(cursor))
 
-    result = await db.execute(query)
-    sessions = result.scalars().all()
-
-    summaries = []
-    for s in sessions:
-        scenario = get_scenario(s.scenario_id)
-        title = ""
-        if scenario:
-            title = scenario.get("title", {}).get(s.language, scenario.get("title", {}).get("en", ""))
-
-        summaries.append(SessionSummary(
-            session_id=s.id,
-            scenario_id=s.scenario_id,
-            scenario_title=title,
-            language=s.language,
-            started_at=s.started_at.isoformat() if s.started_at else "",
-            completed_at=s.completed_at.isoformat() if s.completed_at else None,
-            score=s.score,
-        ))
+    with span("db.execute"):
+        rows = (await db.execute(query)).all()
+    page = rows[:limit]
+    # Titles as of the version each session was played on
+    scenarios = await resolve_scenarios(db, ((r.scenario_id, r.scenario_version) for r in page))
+
+    summaries = [
+        {
+            "session_id": r.id,
+            "scenario_id": r.scenario_id,
+            "scenario_title": _title(scenarios[(r.scenario_id, r.scenario_version)], r.language),
+            "language": r.language,
+            "started_at": r.started_at.isoformat() if r.started_at else "",
+            "completed_at": r.completed_at.isoformat() if r.completed_at else None,
+            "score": r.score,
+        }
+        for r in page
+    ]
 
-    return HistoryResponse(sessions=summaries)
+    next_cursor = None
+    if len(rows) > limit:
+        last = page[-1]
+        next_cursor = _encode_cursor(last.started_at, last.id)
+
+    with span("serialize"):
+        return json_response({"sessions": summaries, "next_cursor": next_cursor})
 
 
 @router.get("/sessions/{session_id}/report", response_model=SessionReportResponse)
 async def get_session_report(session_id: str, db: AsyncSession = Depends(get_db)):
-    result = await db.execute(select(Session).where(Session.id == session_id))
-    session = result.scalar_one_or_none()
+    # report_json is read as text and written into the response verbatim:
+    # it was produced by generate_report/finalize_report, so it already has
+    # the Report shape and needs no decode/validate/re-encode round trip.
+    with span("db.execute"):
+        result = await db.execute(
+            select(
+                Session.id, Session.scenario_id, Session.scenario_version, Session.language,
+                Session.started_at, Session.completed_at, Session.score,
+                type_coerce(Session.report_json, Text).label("report_json"),
+            ).where(Session.id == session_id)
+        )
+    session = result.one_or_none()
     if not session:
         raise HTTPException(status_code=404, detail="Session not found")
-
-    scenario = get_scenario(session.scenario_id)
-    title = ""
-    if scenario:
-        title = scenario.get("title", {}).get(session.language, scenario.get("title", {}).get("en", ""))
-
-    report = None
-    if session.report_json:
-        rj = session.report_json
-        report = Report(
-            score=rj["score"],
-            checklist_results=[ChecklistResult(**cr) for cr in rj["checklist_results"]],
-            critical_misses=rj["critical_misses"],
-            suggestions=rj["suggestions"],
-            transcript=rj.get("transcript", []),
-        )
-
-    return SessionReportResponse(
-        session_id=session.id,
-        scenario_id=session.scenario_id,
-        scenario_title=title,
-        language=session.language,
-        started_at=session.started_at.isoformat() if session.started_at else "",
-        completed_at=session.completed_at.isoformat() if session.completed_at else None,
-        score=session.score,
-        report=report,
-    )
+    scenario = await resolve_scenario(db, session.scenario_id, session.scenario_version)
+
+    with span("serialize"):
+        return splice_json({
+            "session_id": session.id,
+            "scenario_id": session.scenario_id,
+            "scenario_title": _title(scenario, session.language),
+            "language": session.language,
+            "started_at": session.started_at.isoformat() if session.started_at else "",
+            "completed_at": session.completed_at.isoformat() if session.completed_at else None,
+            "score": session.score,
+        }, "report", session.report_json)
@@ -0,0 +1,94 @@
+"""
+Prebuilt scenario bundle.
+
+`build_scenario_bundle.py` (run in the Docker build) validates and compiles
+every scenario file once and pickles the compiled set, so a cold start
+unpickles it instead of parsing, validating and compiling JSON.
+
+A bundle is only used if it still describes what is on disk: it records
+the content hash of the files it was built from, which the loader checks
+against the current files, and a fingerprint of the code that compiled it
+(this Python version and the sources of the modules that define compiled
+scenarios and their validation). Both sit in a one-line JSON header ahead
+of the pickled payload and are checked before anything is unpickled, so a
+stale or foreign bundle is never deserialized. Anything else falls back to
+compiling the files, so such a bundle costs time, never correctness.
+"""
+
+import hashlib
+import io
+import json
+import logging
+import os
+import pickle
+import sys
+from collections.abc import Mapping
+from types import MappingProxyType
+
+from . import evaluation, normalization, scenario_graph, scenario_validation
+from .scenario_graph import CompiledScenario
+
+logger = logging.getLogger("sushrusha.scenarios")
+
+BUNDLE_FORMAT = 2
+_MAX_HEADER = 4096
+BUNDLE_PATH = os.getenv(
+    "SCENARIO_BUNDLE",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "build", "scenarios.bundle"),
+)
+
+
+def compiler_fingerprint() -> str:
+    """Changes whenever the shape or meaning of a compiled scenario may have."""
+    digest = hashlib.sha256(f"{sys.version_info[0]}.{sys.version_info[1]}".encode())
+    for module in (evaluation, normalization, scenario_graph, scenario_validation):
+        with open(module.__file__, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _mapping_proxy(data: dict) -> Mapping:
+    return MappingProxyType(data)
+
+
+class _Pickler(pickle.Pickler):
+    # Compiled scenarios are read-only views, which pickle cannot store as-is
+    def reducer_override(self, obj):
+        if type(obj) is MappingProxyType:
+            return _mapping_proxy, (dict(obj),)
+        return NotImplemented
+
+
+def dumps_scenarios(scenarios: Mapping[str, CompiledScenario]) -> bytes:
+    """Compiled `scenarios` as bytes another process can `pickle.loads` (e.g. pool workers)."""
+    buffer = io.BytesIO()
+    _Pickler(buffer, protocol=pickle.HIGHEST_PROTOCOL).dump(dict(scenarios))
+    return buffer.getvalue()
+
+
+def write_bundle(scenarios: Mapping[str, CompiledScenario], content_hash: str, path: str = BUNDLE_PATH) -> None:
+    """Write compiled `scenarios` (built from files with `content_hash`) atomically to `path`."""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = f"{path}.tmp"
+    header = {"format": BUNDLE_FORMAT, "fingerprint": compiler_fingerprint(), "content_hash": content_hash}
+    with open(tmp, "wb") as f:
+        f.write(json.dumps(header).encode() + b"\n")
+        _Pickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(dict(scenarios))
+    os.replace(tmp, path)
+
+
+def read_bundle(path: str = BUNDLE_PATH) -> tuple[str, dict[str, CompiledScenario]] | None:
+    """(content_hash, compiled scenarios) from a bundle this code can use; None otherwise."""
+    try:
+        with open(path, "rb") as f:
+            header = json.loads(f.readline(_MAX_HEADER))
+            if header.get("format") != BUNDLE_FORMAT or header.get("fingerprint") != compiler_fingerprint():
+                logger.info("Ignoring scenario bundle %s built by other code", path)
+                return None
+            scenarios = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:  # truncated, or written by incompatible code
+        logger.warning("Ignoring unreadable scenario bundle %s: %s", path, e)
+        return None
+    return header["content_hash"], scenarios
@@ -0,0 +1,204 @@
+"""
+Immutable, precompiled view of a scenario JSON.
+
+Each scenario is compiled once when loaded: patient text is resolved for
+every language up front, checklists are normalized into a KeywordMatcher and
+transitions are flattened into a decision table. The turn path then only does
+dictionary lookups on these objects.
+
+Transitions are tried in file order; the first that fires decides the next
+node and "default" is the fallback:
+
+    {"condition": "keywords", "keywords": ["bleeding"], "romanized_keywords": ["khoon"], "next_node_key": "refer"}
+    {"condition": "critical_missed", "next_node_key": "remind"}
+    {"condition": "critical_missed", "items": ["Ask about bleeding"], "next_node_key": "remind"}
+    {"condition": "default", "next_node_key": "ask_wellbeing"}
+
+Branch keywords are indexed in the node's KeywordMatcher next to its
+checklist, so the scan that scores a turn also picks its branch.
+
+Checklist items and keyword transitions list English keywords under
+`"keywords"` and romanized Hindi ones under `"romanized_keywords"`; only
+the latter (and native-script keywords) match spelling variants such as
+"khun" for "khoon" (see normalization.py).
+
+`"fuzzy": true` at the top level turns on typo-tolerant keyword matching
+for the whole scenario; a checklist item's `"max_edits"` (0 to 2)
+overrides it for that item (see evaluation.KeywordMatcher).
+
+Every compiled scenario carries a content-addressed `version` (a hash of its
+canonical JSON), which sessions record so they keep being scored against
+the content they started on.
+"""
+
+import hashlib
+import json
+from collections.abc import Mapping
+from dataclasses import dataclass
+from types import MappingProxyType
+
+from .evaluation import KeywordMatcher, ChecklistItem, evaluate_hits
+from .normalization import match_keys
+
+END_NODE = "__end__"
+DEFAULT_CONDITION = "default"
+BRANCH_CONDITIONS = ("keywords", "critical_missed")
+
+
+def _resolve(texts: dict, languages: set[str]) -> tuple[Mapping[str, str], str]:
+    """Pre-resolve a {lang: text} dict; unknown languages fall back to English."""
+    fallback = texts.get("en", "")
+    resolved = {lang: texts.get(lang, fallback) for lang in languages | texts.keys()}
+    return MappingProxyType(resolved), fallback
+
+
+@dataclass(frozen=True, slots=True)
+class Branch:
+    """One row of a node's decision table, over the indices `KeywordMatcher.match` returns."""
+
+    indices: frozenset[int]
+    on_miss: bool  # fire when any index is missing (critical_missed) rather than present (keywords)
+    next_node_key: str
+
+    def fires(self, hits: set[int]) -> bool:
+        if self.on_miss:
+            return not self.indices <= hits
+        return not self.indices.isdisjoint(hits)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledNode:
+    key: str
+    patient_text: Mapping[str, str]
+    default_text: str
+    matcher: KeywordMatcher
+    branches: tuple[Branch, ...]  # tried in order before the default
+    next_node_key: str  # default transition
+
+    @property
+    def checklist(self) -> tuple[ChecklistItem, ...]:
+        return self.matcher.items
+
+    def text(self, lang: str) -> str:
+        return self.patient_text.get(lang, self.default_text)
+
+    def next_node(self, hits: set[int]) -> str:
+        """Next node key for a turn whose `matcher.match` result is `hits`."""
+        for branch in self.branches:
+            if branch.fires(hits):
+                return branch.next_node_key
+        return self.next_node_key
+
+    def evaluate(self, user_text: str) -> tuple[dict, str]:
+        """Evaluate a turn and pick the next node from one scan of `user_text`."""
+        hits = self.matcher.match(match_keys(user_text))
+        return evaluate_hits(self.matcher, hits), self.next_node(hits)
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledScenario:
+    id: str
+    version: str
+    data: Mapping  # original JSON, kept for report generation
+    nodes: Mapping[str, CompiledNode]
+    supported_languages: tuple[str, ...]
+    total_turns_estimate: int
+    meta: Mapping[str, Mapping]  # lang -> ScenarioMeta fields
+    default_meta: Mapping
+
+    def meta_for(self, lang: str) -> Mapping:
+        return self.meta.get(lang, self.default_meta)
+
+    def title(self, lang: str) -> str:
+        return self.meta_for(lang)["title"]
+
+
+def _compile_node(node_key: str, node: dict, languages: set[str], fuzzy: bool = False) -> CompiledNode:
+    patient_text, default_text = _resolve(node.get("patient_text", {}), languages)
+    checklist = [ChecklistItem.from_dict(c) for c in node.get("expected_checklist", [])]
+    item_index = {}
+    for idx, check in enumerate(checklist):
+        item_index.setdefault(check.item, idx)
+    critical = frozenset(idx for idx, check in enumerate(checklist) if check.is_critical)
+
+    triggers: list[tuple[list[str], list[str]]] = []
+    rules: list[tuple[frozenset[int], bool, str]] = []
+    default = None
+    for t in node.get("transitions", []):
+        condition, next_key = t.get("condition"), t["next_node_key"]
+        if condition == DEFAULT_CONDITION:
+            # First default wins, as in a linear scan
+            default = default or next_key
+        elif condition == "keywords":
+            rules.append((frozenset([len(checklist) + len(triggers)]), False, next_key))
+            triggers.append((t.get("keywords", []), t.get("romanized_keywords", [])))
+        elif condition == "critical_missed":
+            names = t.get("items")
+            indices = frozenset(item_index[n] for n in names if n in item_index) if names else critical
+            if indices:
+                rules.append((indices, True, next_key))
+        # Unknown conditions never fire; validation reports them
+
+    return CompiledNode(
+        key=node_key,
+        patient_text=patient_text,
+        default_text=default_text,
+        matcher=KeywordMatcher(checklist, triggers, fuzzy),
+        branches=tuple(Branch(*rule) for rule in rules),
+        next_node_key=default or END_NODE,
+    )
+
+
+def canonical_json(data: dict) -> str:
+    """The form a scenario is versioned and stored in: key order and whitespace do not matter."""
+    return json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+
+
+def scenario_version(data: dict) -> str:
+    return hashlib.sha256(canonical_json(data).encode()).hexdigest()[:16]
+
+
+def compile_scenario(data: dict) -> CompiledScenario:
+    """Compile a scenario JSON document into its immutable graph."""
+    supported = tuple(data.get("supported_languages", []))
+    languages = set(supported) | {"en"}
+
+    titles, title_fallback = _resolve(data.get("title", {}), languages)
+    categories, category_fallback = _resolve(data.get("category", {}), languages)
+    descriptions, description_fallback = _resolve(data.get("description", {}), languages)
+
+    def meta(title: str, category: str, description: str) -> Mapping:
+        return MappingProxyType({
+            "id": data["id"],
+            "title": title,
+            "category": category,
+            "difficulty": data.get("difficulty", "beginner"),
+            "estimated_minutes": data.get("estimated_minutes", 10),
+            "description": description,
+        })
+
+    meta_by_lang = {
+        lang: meta(
+            titles.get(lang, title_fallback),
+            categories.get(lang, category_fallback),
+            descriptions.get(lang, description_fallback),
+        )
+        for lang in languages | titles.keys() | categories.keys() | descriptions.keys()
+    }
+
+    fuzzy = data.get("fuzzy") is True
+    nodes = {
+        node_key: _compile_node(node_key, node, languages, fuzzy)
+        for node_key, node in data.get("nodes", {}).items()
+    }
+
+    return CompiledScenario(
+        id=data["id"],
+        version=scenario_version(data),
+        data=data,
+        nodes=MappingProxyType(nodes),
+        supported_languages=supported,
+        total_turns_estimate=data.get("total_turns_estimate", 8),
+        meta=MappingProxyType(meta_by_lang),
+        default_meta=meta(title_fallback, category_fallback, description_fallback),
+    )
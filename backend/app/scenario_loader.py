@@ -1,78 +1,287 @@
-"""Scenario loader — reads JSON files from the data/scenarios directory."""
+"""
+Scenario loader — reads JSON files from the data/scenarios directory.
 
+The loaded set is an immutable `ScenarioSnapshot`, published by swapping a
+single module reference, so a reader sees either the old set or the new one
+and never a mix. Callers that need several lookups to agree (one request,
+one WebSocket session) should take `get_snapshot()` once. A new snapshot is
+only built from files that all parse and pass scenario_validation; see
+scenario_reload.py for the background watcher that publishes it.
+
+Scenarios replaced by a reload stay available by version from a bounded
+LRU (SCENARIO_VERSION_CACHE entries, default 32), so sessions pinned to
+them keep resolving without a database read; scenario_versions.py falls
+back to the stored JSON on a miss. Versions that open sessions hold
+(`pin_version`, taken by the session cache and WebSocket channels) are
+never evicted, so the cap can be exceeded while they are in use.
+
+The first set is taken from the prebuilt bundle (scenario_bundle.py) when
+it matches the files, which skips parsing and compiling them at startup.
+"""
+
+import hashlib
 import json
+import logging
 import os
-from typing import Any
+from collections import Counter, OrderedDict
+from dataclasses import dataclass
+from types import MappingProxyType
+from collections.abc import Mapping
+
+from .scenario_bundle import read_bundle
+from .scenario_graph import CompiledScenario, compile_scenario, END_NODE
+from .scenario_validation import validate_scenario
+
+logger = logging.getLogger("sushrusha.scenarios")
+
+SCENARIOS_DIR = os.getenv(
+    "SCENARIOS_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "scenarios"),
+)
+
+# (filename, mtime_ns, size) per scenario file: a cheap change check
+Signature = tuple[tuple[str, int, int], ...]
+
+
+class ScenarioSetError(ValueError):
+    """The scenario files on disk do not form a valid set; `errors` lists why."""
+
+    def __init__(self, errors: list[str]):
+        super().__init__("; ".join(errors))
+        self.errors = errors
+
+
+@dataclass(frozen=True, slots=True)
+class ScenarioSnapshot:
+    scenarios: Mapping[str, CompiledScenario]
+    by_language: Mapping[str, tuple[Mapping, ...]]  # lang -> ScenarioMeta fields
+    titles: Mapping[tuple[str, str], str]
+    content_hash: str  # SHA-256 over every file; changes whenever any of them does
+    signature: Signature
+
 
-SCENARIOS_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "scenarios")
+_snapshot: ScenarioSnapshot | None = None
 
-_cache: dict[str, dict] = {}
+VERSION_CACHE_SIZE = int(os.getenv("SCENARIO_VERSION_CACHE", "32"))
+_versions: OrderedDict[tuple[str, str], CompiledScenario] = OrderedDict()
+_pins: Counter[tuple[str, str]] = Counter()
 
 
-def _load_all() -> dict[str, dict]:
-    """Load all scenario JSON files, cached after first call."""
-    if _cache:
-        return _cache
-    for filename in os.listdir(SCENARIOS_DIR):
+def scan_signature() -> Signature:
+    entries = []
+    for filename in sorted(os.listdir(SCENARIOS_DIR)):
         if filename.endswith(".json"):
-            path = os.path.join(SCENARIOS_DIR, filename)
-            with open(path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                _cache[data["id"]] = data
-    return _cache
+            st = os.stat(os.path.join(SCENARIOS_DIR, filename))
+            entries.append((filename, st.st_mtime_ns, st.st_size))
+    return tuple(entries)
+
+
+def scan_content_hash(signature: Signature) -> str:
+    """The content hash build_snapshot would give the files in `signature`, without parsing them."""
+    digest = hashlib.sha256()
+    for filename, _, _ in signature:
+        with open(os.path.join(SCENARIOS_DIR, filename), "rb") as f:
+            digest.update(filename.encode() + b"\0" + f.read() + b"\0")
+    return digest.hexdigest()
+
+
+def make_snapshot(compiled: dict[str, CompiledScenario], content_hash: str, signature: Signature = ()) -> ScenarioSnapshot:
+    by_language: dict[str, list[Mapping]] = {}
+    titles: dict[tuple[str, str], str] = {}
+    for scenario in compiled.values():
+        for lang in scenario.supported_languages:
+            by_language.setdefault(lang, []).append(scenario.meta_for(lang))
+        for lang, meta in scenario.meta.items():
+            titles[(scenario.id, lang)] = meta["title"]
+    return ScenarioSnapshot(
+        scenarios=MappingProxyType(dict(compiled)),
+        by_language=MappingProxyType({lang: tuple(metas) for lang, metas in by_language.items()}),
+        titles=MappingProxyType(titles),
+        content_hash=content_hash,
+        signature=signature,
+    )
+
+
+def build_snapshot() -> ScenarioSnapshot:
+    """
+    Read, validate and compile every scenario file. Raises ScenarioSetError
+    (e.g. for a file caught half-written) without touching the published set.
+    """
+    signature = scan_signature()
+    compiled: dict[str, CompiledScenario] = {}
+    errors: list[str] = []
+    digest = hashlib.sha256()
+    for filename, _, _ in signature:
+        path = os.path.join(SCENARIOS_DIR, filename)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            data = json.loads(raw)
+        except (OSError, ValueError) as e:
+            errors.append(f"[{filename}] {e}")
+            continue
+        digest.update(filename.encode() + b"\0" + raw + b"\0")
+        problems = validate_scenario(data, filename)
+        if not problems and data["id"] in compiled:
+            problems = [f"[{filename}] Duplicate scenario id: {data['id']}"]
+        if problems:
+            errors.extend(problems)
+            continue
+        compiled[data["id"]] = compile_scenario(data)
+    if errors:
+        raise ScenarioSetError(errors)
+    return make_snapshot(compiled, digest.hexdigest(), signature)
+
+
+def publish(snapshot: ScenarioSnapshot) -> None:
+    """Make `snapshot` the set every later lookup sees."""
+    global _snapshot
+    previous, _snapshot = _snapshot, snapshot
+    if previous is not None:
+        # Sessions pinned to replaced content will ask for it next
+        for scenario in previous.scenarios.values():
+            current = snapshot.scenarios.get(scenario.id)
+            if current is None or current.version != scenario.version:
+                remember_version(scenario)
+
+
+def remember_version(scenario: CompiledScenario) -> None:
+    key = (scenario.id, scenario.version)
+    _versions[key] = scenario
+    _versions.move_to_end(key)
+    _trim_versions()
+
+
+def pin_version(scenario: CompiledScenario) -> None:
+    """Keep `scenario` in the version LRU until the matching `unpin_version`."""
+    _pins[(scenario.id, scenario.version)] += 1
+
+
+def unpin_version(scenario: CompiledScenario) -> None:
+    key = (scenario.id, scenario.version)
+    _pins[key] -= 1
+    if _pins[key] <= 0:
+        del _pins[key]
+        _trim_versions()
+
+
+def _trim_versions() -> None:
+    """Evict least recently used versions past the cap, skipping pinned ones."""
+    excess = len(_versions) - VERSION_CACHE_SIZE
+    if excess <= 0:
+        return
+    for key in [key for key in _versions if key not in _pins][:excess]:
+        del _versions[key]
+
+
+def get_scenario_version(scenario_id: str, version: str | None) -> CompiledScenario | None:
+    """
+    `version` of a scenario if it is published or cached, else None.
+    A None `version` (sessions from before versioning) means the published one.
+    """
+    scenario = get_snapshot().scenarios.get(scenario_id)
+    if scenario is not None and (version is None or scenario.version == version):
+        return scenario
+    if version is None:
+        return None
+    key = (scenario_id, version)
+    scenario = _versions.get(key)
+    if scenario is not None:
+        _versions.move_to_end(key)
+    return scenario
+
+
+def load_snapshot() -> ScenarioSnapshot:
+    """The files on disk as a snapshot: from the prebuilt bundle if it matches them, else compiled now."""
+    signature = scan_signature()
+    bundled = read_bundle()
+    if bundled is not None:
+        content_hash, compiled = bundled
+        if content_hash == scan_content_hash(signature):
+            return make_snapshot(compiled, content_hash, signature)
+        logger.info("Scenario bundle is out of date; compiling the scenario files")
+    return build_snapshot()
+
+
+def get_snapshot() -> ScenarioSnapshot:
+    """The published scenario set, loaded on first use."""
+    snapshot = _snapshot
+    if snapshot is None:
+        snapshot = load_snapshot()
+        publish(snapshot)
+    return snapshot
+
+
+def _load_all() -> Mapping[str, CompiledScenario]:
+    return get_snapshot().scenarios
+
+
+def load_scenarios() -> None:
+    """Compile every scenario eagerly (called at startup)."""
+    get_snapshot()
+
+
+def get_content_hash() -> str:
+    """SHA-256 over every loaded scenario file; changes whenever any of them does."""
+    return get_snapshot().content_hash
 
 
 def get_all_scenarios() -> dict[str, dict]:
-    return _load_all()
+    return {sid: s.data for sid, s in _load_all().items()}
 
 
-def get_scenarios_for_language(lang: str) -> list[dict]:
+def get_scenarios_for_language(lang: str) -> tuple[Mapping, ...]:
     """Return scenario metadata list for a given language."""
-    results = []
-    for sid, s in _load_all().items():
-        if lang in s.get("supported_languages", []):
-            results.append({
-                "id": s["id"],
-                "title": s.get("title", {}).get(lang, s.get("title", {}).get("en", "")),
-                "category": s.get("category", {}).get(lang, s.get("category", {}).get("en", "")),
-                "difficulty": s.get("difficulty", "beginner"),
-                "estimated_minutes": s.get("estimated_minutes", 10),
-                "description": s.get("description", {}).get(lang, s.get("description", {}).get("en", "")),
-            })
-    return results
+    return get_snapshot().by_language.get(lang, ())
 
 
-def get_scenario(scenario_id: str) -> dict | None:
+def get_scenario_title(scenario_id: str, lang: str) -> str:
+    """Scenario title in `lang` (English fallback); "" for unknown scenarios."""
+    snapshot = get_snapshot()
+    title = snapshot.titles.get((scenario_id, lang))
+    if title is None:
+        scenario = snapshot.scenarios.get(scenario_id)
+        title = scenario.title(lang) if scenario else ""
+    return title
+
+
+def get_compiled_scenarios() -> Mapping[str, CompiledScenario]:
+    return _load_all()
+
+
+def get_compiled_scenario(scenario_id: str) -> CompiledScenario | None:
     return _load_all().get(scenario_id)
 
 
+def get_scenario(scenario_id: str) -> dict | None:
+    scenario = _load_all().get(scenario_id)
+    return scenario.data if scenario else None
+
+
 def get_node(scenario_id: str, node_key: str, lang: str = "en") -> dict | None:
     """Get a specific node with text resolved to the requested language."""
-    scenario = get_scenario(scenario_id)
+    scenario = get_compiled_scenario(scenario_id)
     if not scenario:
         return None
-    node = scenario.get("nodes", {}).get(node_key)
+    node = scenario.nodes.get(node_key)
     if not node:
         return None
+    raw = scenario.data["nodes"][node_key]
     return {
         "node_key": node_key,
-        "patient_text": node.get("patient_text", {}).get(lang, node.get("patient_text", {}).get("en", "")),
-        "expected_checklist": node.get("expected_checklist", []),
-        "transitions": node.get("transitions", []),
+        "patient_text": node.text(lang),
+        "expected_checklist": raw.get("expected_checklist", []),
+        "matcher": node.matcher,
+        "transitions": raw.get("transitions", []),
     }
 
 
 def get_next_node_key(scenario_id: str, current_node_key: str, user_text: str = "") -> str:
     """Determine the next node based on transition rules. Returns '__end__' if scenario is complete."""
-    scenario = get_scenario(scenario_id)
+    scenario = get_compiled_scenario(scenario_id)
     if not scenario:
-        return "__end__"
-    node = scenario.get("nodes", {}).get(current_node_key)
+        return END_NODE
+    node = scenario.nodes.get(current_node_key)
     if not node:
-        return "__end__"
-    transitions = node.get("transitions", [])
-    # For MVP, just use the default transition
-    for t in transitions:
-        if t.get("condition") == "default":
-            return t["next_node_key"]
-    return "__end__"
+        return END_NODE
+    return node.evaluate(user_text)[1]
@@ -0,0 +1,104 @@
+"""
+Hot reload of scenario files.
+
+`ScenarioWatcher` polls the scenario directory's file signature (names,
+mtimes, sizes) every SCENARIO_RELOAD_INTERVAL seconds (default 5, 0 turns
+it off). When it changes, the new set is read, validated and compiled in a
+worker thread, its checklist items get ordinals and its versions are
+recorded, and only then is it published as the new snapshot, so no request
+ever pays for a reload or sees a half-built set. Sessions already running
+stay on the version they started with (scenario_versions.py). Files that
+fail validation (including one caught half-written) are logged and skipped
+until they change again; the current set stays live.
+"""
+
+import asyncio
+import logging
+import os
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .checklist_items import sync_checklist_items
+from .scenario_loader import ScenarioSetError, ScenarioSnapshot, Signature, build_snapshot, get_snapshot, publish, scan_signature
+from .scenario_versions import record_versions
+from .write_queue import write_queue
+
+logger = logging.getLogger("sushrusha.scenarios")
+
+_lock = asyncio.Lock()
+
+
+async def reload_scenarios(force: bool = False) -> bool:
+    """
+    Publish the scenario files on disk if they changed (or always, with
+    `force`). Returns True if the published content changed. Raises
+    ScenarioSetError, leaving the current set live, if the files are invalid.
+    """
+    async with _lock:
+        current = get_snapshot()
+        if not force and await asyncio.to_thread(scan_signature) == current.signature:
+            return False
+        snapshot = await asyncio.to_thread(build_snapshot)
+        changed = snapshot.content_hash != current.content_hash
+        if changed:
+            await write_queue.submit(_record_snapshot(snapshot))
+        publish(snapshot)
+    if changed:
+        logger.info("Published %d scenario(s), content %s", len(snapshot.scenarios), snapshot.content_hash[:12])
+    return changed
+
+
+def _record_snapshot(snapshot: ScenarioSnapshot):
+    def sync(session) -> None:
+        conn = session.connection()
+        # Items new in this set need ordinals before any turn can store them,
+        # and sessions started on it need its JSON once it is replaced
+        sync_checklist_items(conn, scenarios=snapshot.scenarios)
+        record_versions(conn, snapshot.scenarios)
+
+    async def op(db: AsyncSession) -> None:
+        await db.run_sync(sync)
+    return op
+
+
+class ScenarioWatcher:
+    def __init__(self, interval: float = 5.0):
+        self.interval = interval
+        self._task: asyncio.Task | None = None
+        self._rejected: Signature | None = None
+
+    def start(self) -> None:
+        if self.interval > 0 and (self._task is None or self._task.done()):
+            self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.check()
+            except Exception:  # keep watching
+                logger.exception("Scenario reload failed")
+
+    async def check(self) -> bool:
+        signature = await asyncio.to_thread(scan_signature)
+        if signature == get_snapshot().signature or signature == self._rejected:
+            return False
+        try:
+            return await reload_scenarios(force=True)
+        except ScenarioSetError as e:
+            self._rejected = signature
+            logger.error("Scenario files rejected, keeping the current set: %s", "; ".join(e.errors))
+            return False
+
+
+scenario_watcher = ScenarioWatcher(float(os.getenv("SCENARIO_RELOAD_INTERVAL", "5")))
@@ -0,0 +1,133 @@
+"""
+Structural checks for scenario JSON, shared by validate_scenarios.py and
+the scenario loader (which refuses to publish a set that fails them).
+"""
+
+from .evaluation import MAX_EDITS
+from .normalization import match_keys
+from .scenario_graph import BRANCH_CONDITIONS, DEFAULT_CONDITION, END_NODE
+
+REQUIRED_FIELDS = ("id", "title", "category", "supported_languages", "nodes")
+
+
+def validate_scenario(data: dict, source: str = "") -> list[str]:
+    """Problems with one parsed scenario file, as printable messages; empty if valid."""
+    if not isinstance(data, dict):
+        return [f"[{source}] Scenario file must contain a JSON object"]
+    errors = []
+    scenario_id = data.get("id", source)
+
+    for field in REQUIRED_FIELDS:
+        if field not in data:
+            errors.append(f"[{scenario_id}] Missing required field: {field}")
+
+    if not isinstance(data.get("fuzzy", False), bool):
+        errors.append(f"[{scenario_id}] 'fuzzy' must be true or false")
+
+    nodes = data.get("nodes", {})
+    if "start" not in nodes:
+        errors.append(f"[{scenario_id}] Missing 'start' node")
+
+    edges: dict[str, set[str]] = {}
+    for node_key, node in nodes.items():
+        if "patient_text" not in node:
+            errors.append(f"[{scenario_id}] Node '{node_key}' missing patient_text")
+
+        transitions = node.get("transitions", [])
+        if not transitions:
+            errors.append(f"[{scenario_id}] Node '{node_key}' has no transitions (dead-end!)")
+        elif not any(t.get("condition") == DEFAULT_CONDITION for t in transitions):
+            errors.append(f"[{scenario_id}] Node '{node_key}' has no default transition")
+
+        edges[node_key] = set()
+        for t in transitions:
+            next_key = t.get("next_node_key", "")
+            if next_key != END_NODE and next_key not in nodes:
+                errors.append(
+                    f"[{scenario_id}] Node '{node_key}' transitions to unknown node '{next_key}'"
+                )
+            else:
+                edges[node_key].add(next_key)
+            errors.extend(_validate_branch(scenario_id, node_key, node, t))
+
+        for item in node.get("expected_checklist", []):
+            if "item" not in item:
+                errors.append(f"[{scenario_id}] Node '{node_key}' has checklist item without 'item' name")
+            if not item.get("keywords") and not item.get("romanized_keywords"):
+                errors.append(f"[{scenario_id}] Node '{node_key}' checklist item '{item.get('item', '?')}' has no keywords")
+            max_edits = item.get("max_edits")
+            if max_edits is not None and (
+                not isinstance(max_edits, int) or isinstance(max_edits, bool) or not 0 <= max_edits <= MAX_EDITS
+            ):
+                errors.append(
+                    f"[{scenario_id}] Node '{node_key}' checklist item '{item.get('item', '?')}' "
+                    f"max_edits must be an integer from 0 to {MAX_EDITS}"
+                )
+            for keyword in (*item.get("keywords", []), *item.get("romanized_keywords", [])):
+                if keyword.strip() and not match_keys(keyword):
+                    errors.append(
+                        f"[{scenario_id}] Node '{node_key}' keyword '{keyword}' has no words to match"
+                    )
+
+    if "start" in nodes:
+        errors.extend(_validate_reachability(scenario_id, edges))
+
+    return errors
+
+
+def _validate_branch(scenario_id: str, node_key: str, node: dict, transition: dict) -> list[str]:
+    condition = transition.get("condition")
+    if condition == DEFAULT_CONDITION:
+        return []
+    where = f"[{scenario_id}] Node '{node_key}'"
+    if condition not in BRANCH_CONDITIONS:
+        known = ", ".join((DEFAULT_CONDITION, *BRANCH_CONDITIONS))
+        return [f"{where} has transition with unknown condition '{condition}' (expected one of: {known})"]
+
+    errors = []
+    if condition == "keywords":
+        keywords = [*(transition.get("keywords") or []), *(transition.get("romanized_keywords") or [])]
+        if not any(kw.strip() for kw in keywords):
+            errors.append(f"{where} keywords transition has no keywords")
+        for keyword in keywords:
+            if keyword.strip() and not match_keys(keyword):
+                errors.append(f"{where} transition keyword '{keyword}' has no words to match")
+    else:
+        checklist = node.get("expected_checklist", [])
+        names = transition.get("items")
+        if names:
+            known_items = {item.get("item") for item in checklist}
+            for name in names:
+                if name not in known_items:
+                    errors.append(f"{where} critical_missed transition names unknown item '{name}'")
+        elif not any(item.get("type") == "critical" for item in checklist):
+            errors.append(f"{where} critical_missed transition but the node has no critical items")
+    return errors
+
+
+def _validate_reachability(scenario_id: str, edges: dict[str, set[str]]) -> list[str]:
+    """Every node reachable from 'start', and the end reachable from every node."""
+    reached = _closure({"start"}, edges)
+    reverse: dict[str, set[str]] = {}
+    for source, targets in edges.items():
+        for target in targets:
+            reverse.setdefault(target, set()).add(source)
+    finishing = _closure({END_NODE}, reverse)
+
+    errors = []
+    for node_key in edges:
+        if node_key not in reached:
+            errors.append(f"[{scenario_id}] Node '{node_key}' is unreachable from 'start'")
+        elif node_key not in finishing:
+            errors.append(f"[{scenario_id}] Node '{node_key}' never reaches '{END_NODE}' (dead-end loop)")
+    return errors
+
+
+def _closure(roots: set[str], edges: dict[str, set[str]]) -> set[str]:
+    seen, stack = set(roots), list(roots)
+    while stack:
+        for target in edges.get(stack.pop(), ()):
+            if target not in seen:
+                seen.add(target)
+                stack.append(target)
+    return seen
@@ -0,0 +1,77 @@
+"""
+Content-addressed scenario versions.
+
+Every scenario set that goes live is recorded in `scenario_versions`
+(canonical JSON keyed by scenario id and content hash) and new sessions
+store the version they start on. Turns, completion and reports then resolve
+that exact version: from the published snapshot or the loader's LRU when
+possible, otherwise by recompiling the stored JSON, so a scenario edit never
+changes how a session already in progress is scored.
+"""
+
+import json
+from collections.abc import Iterable, Mapping
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .models import ScenarioVersion
+from .scenario_graph import CompiledScenario, canonical_json, compile_scenario
+from .scenario_loader import get_compiled_scenario, get_compiled_scenarios, get_scenario_version, remember_version
+
+
+def record_versions(conn: Connection, scenarios: Mapping[str, CompiledScenario] | None = None) -> None:
+    """
+    Store the versions of `scenarios` (default: the published set) not stored
+    yet. Synchronous, for init_db, migrations and `run_sync`.
+    """
+    scenarios = scenarios if scenarios is not None else get_compiled_scenarios()
+    rows = [
+        {"scenario_id": s.id, "version": s.version, "data": canonical_json(s.data)}
+        for s in scenarios.values()
+    ]
+    if rows:
+        conn.execute(sqlite_insert(ScenarioVersion).on_conflict_do_nothing(), rows)
+
+
+def _compile_stored(data: str) -> CompiledScenario:
+    scenario = compile_scenario(json.loads(data))
+    remember_version(scenario)
+    return scenario
+
+
+async def resolve_scenario(db: AsyncSession, scenario_id: str, version: str | None) -> CompiledScenario | None:
+    """The scenario content a session is pinned to; None if the scenario is unknown."""
+    scenario = get_scenario_version(scenario_id, version)
+    if scenario is not None or version is None:
+        return scenario
+    data = await db.scalar(
+        select(ScenarioVersion.data)
+        .where(ScenarioVersion.scenario_id == scenario_id, ScenarioVersion.version == version)
+    )
+    if data is None:
+        # Version never recorded (e.g. database copied without it): best effort
+        return get_compiled_scenario(scenario_id)
+    return _compile_stored(data)
+
+
+async def resolve_scenarios(
+    db: AsyncSession,
+    pinned: Iterable[tuple[str, str | None]],
+) -> dict[tuple[str, str | None], CompiledScenario | None]:
+    """`resolve_scenario` for many (scenario_id, version) pairs, with one query for all misses."""
+    resolved = {key: get_scenario_version(*key) for key in set(pinned)}
+    missing = [key for key, scenario in resolved.items() if scenario is None and key[1] is not None]
+    if missing:
+        rows = await db.execute(
+            select(ScenarioVersion.scenario_id, ScenarioVersion.version, ScenarioVersion.data)
+            .where(tuple_(ScenarioVersion.scenario_id, ScenarioVersion.version).in_(missing))
+        )
+        for row in rows:
+            resolved[(row.scenario_id, row.version)] = _compile_stored(row.data)
+        for key in missing:
+            if resolved[key] is None:
+                resolved[key] = get_compiled_scenario(key[0])
+    return resolved
@@ -1,6 +1,7 @@
 """Pydantic request / response schemas for the API."""
 
 from __future__ import annotations
+from datetime import datetime
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -76,6 +77,14 @@ class TurnResponse(BaseModel):
     is_complete: bool = False
 
 
+# ── Audio ──────────────────────────────────────────────
+class AudioUploadResponse(BaseModel):
+    audio_id: str
+    url: str  # send back as the turn's user_audio_url
+    content_type: str
+    size: int
+
+
 # ── Report / Complete ──────────────────────────────────
 class ChecklistResult(BaseModel):
     item: str
@@ -108,6 +117,7 @@ class SessionSummary(BaseModel):
 
 class HistoryResponse(BaseModel):
     sessions: list[SessionSummary]
+    next_cursor: Optional[str] = None  # pass back as ?cursor= for the next page
 
 
 class SessionReportResponse(BaseModel):
@@ -119,3 +129,62 @@ class SessionReportResponse(BaseModel):
     completed_at: Optional[str] = None
     score: Optional[float] = None
     report: Optional[Report] = None
+
+
+# ── Batch sync (offline devices) ───────────────────────
+class BatchTurn(BaseModel):
+    node_key: str
+    user_text: str
+    user_audio_url: Optional[str] = None
+
+
+class BatchSession(BaseModel):
+    # Device-side id, echoed back in the result. With device_id it makes the
+    # upload idempotent: a session already stored under the pair is not stored again.
+    client_id: Optional[str] = Field(None, max_length=128)
+    device_id: Optional[str] = None
+    lang: str
+    scenario_id: str
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    turns: list[BatchTurn] = Field(default_factory=list, max_length=200)
+    complete: bool = True
+
+
+class BatchEvaluateRequest(BaseModel):
+    sessions: list[BatchSession] = Field(..., max_length=500)
+
+
+class BatchSessionResult(BaseModel):
+    index: int
+    client_id: Optional[str] = None
+    status: str  # "ok" | "error"
+    session_id: Optional[str] = None
+    error: Optional[str] = None
+    report: Optional[Report] = None
+    duplicate: bool = False  # stored by an earlier upload; session_id and report are that session's
+
+
+class BatchEvaluateResponse(BaseModel):
+    results: list[BatchSessionResult]
+    accepted: int  # stored by this request
+    duplicates: int = 0  # already stored by an earlier upload
+    failed: int
+
+
+# ── Analytics ──────────────────────────────────────────
+class ChecklistItemStats(BaseModel):
+    scenario_id: str
+    item: str
+    is_critical: bool
+    language: Optional[str] = None  # set when grouped by language
+    week: Optional[str] = None  # set when grouped by week (Monday, YYYY-MM-DD)
+    sessions: int
+    matched: int
+    missed: int
+    critical_missed: int
+    miss_rate: float  # missed / sessions
+
+
+class ChecklistStatsResponse(BaseModel):
+    items: list[ChecklistItemStats]
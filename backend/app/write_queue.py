@@ -0,0 +1,171 @@
+"""
+Write-behind queue with group commit.
+
+SQLite has one writer at a time and every commit is a WAL append plus a
+sync, so one transaction per request caps turn throughput at the commit
+rate. Requests instead hand their writes to `write_queue.submit(op)`:
+a single flusher task collects ops from all concurrent requests, runs them
+in one transaction and commits once, then resolves every caller. A
+request is therefore acknowledged only after its rows are committed.
+
+    async def op(db: AsyncSession) -> T: ...   # DML only, no commit
+    result = await write_queue.submit(op)
+
+Each op runs in its own SAVEPOINT. An op may raise to reject its request
+(e.g. HTTPException, or a constraint violation): whatever it wrote is
+rolled back to its savepoint, the exception is re-raised to that caller
+and the rest of the batch still commits. If the commit itself fails, the
+transaction is rolled back and the ops are retried one per transaction so
+only the offending request sees the error.
+
+The flusher is the process's only writer, so no lock is needed around a
+batch: per-session ordering comes from the ops' own guarded UPDATEs (e.g.
+the turn_count claim), and writers in other processes (the rescore CLI)
+wait on SQLite's busy_timeout.
+
+Batches form naturally: whatever is submitted while one commit is in
+flight goes into the next, so a lone request pays no batching delay.
+
+Tuning (environment):
+    WRITE_BATCH_MAX_OPS   ops per group commit (default 64)
+    WRITE_BATCH_DELAY_MS  extra time to wait for a batch to fill (default 0)
+    WRITE_QUEUE_DEPTH     queued ops before submit() blocks callers (default 1024)
+"""
+
+import asyncio
+import logging
+import os
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .database import async_session
+from .metrics import span
+
+logger = logging.getLogger("sushrusha.write_queue")
+
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+
+class _Pending:
+    __slots__ = ("op", "future")
+
+    def __init__(self, op: WriteOp, future: asyncio.Future):
+        self.op = op
+        self.future = future
+
+
+class WriteQueue:
+    def __init__(self, max_ops: int = 64, max_delay: float = 0.0, max_depth: int = 1024):
+        self.max_ops = max_ops
+        self.max_delay = max_delay
+        self.max_depth = max_depth
+        self._queue: asyncio.Queue[_Pending] | None = None
+        self._task: asyncio.Task | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _ensure_started(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._task is None or self._task.done():
+            # First use, or a new event loop (CLI scripts, tests)
+            self._loop = loop
+            self._queue = asyncio.Queue(self.max_depth)
+            self._task = loop.create_task(self._run(self._queue))
+        return self._queue
+
+    async def submit(self, op: WriteOp) -> Any:
+        """Run `op` in the next group commit; returns its result once committed."""
+        queue = self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        # Blocks while the queue is full: backpressure on callers
+        await queue.put(_Pending(op, future))
+        return await future
+
+    async def stop(self) -> None:
+        """Flush everything queued so far and stop the flusher."""
+        if self._task is None or self._task.done() or self._loop is not asyncio.get_running_loop():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self, queue: asyncio.Queue) -> None:
+        while True:
+            batch = [await queue.get()]
+            if self.max_delay and queue.qsize() < self.max_ops - 1:
+                # Let concurrent requests join this commit; skipped when the
+                # queue is already deep enough to fill a batch
+                await asyncio.sleep(self.max_delay)
+            while len(batch) < self.max_ops and not queue.empty():
+                batch.append(queue.get_nowait())
+            try:
+                await self._flush(batch)
+            except Exception as e:  # never let the flusher die
+                logger.exception("Group commit of %d op(s) failed", len(batch))
+                for item in batch:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+            finally:
+                for _ in batch:
+                    queue.task_done()
+
+    async def _flush(self, batch: list[_Pending]) -> None:
+        results: list[tuple[_Pending, Any, BaseException | None]] = []
+        async with async_session() as db:
+            try:
+                # pysqlite only opens a transaction before DML, so without an
+                # explicit BEGIN the first SAVEPOINT would be outermost and
+                # its RELEASE would commit that op on its own
+                await db.execute(text("BEGIN IMMEDIATE"))
+                for item in batch:
+                    try:
+                        async with db.begin_nested():
+                            result = await item.op(db)
+                    except Exception as e:
+                        results.append((item, None, e))
+                    else:
+                        results.append((item, result, None))
+                with span("db.group_commit"):
+                    await db.commit()
+            except SQLAlchemyError:
+                await db.rollback()
+                results = None
+
+        if results is None:
+            await self._flush_individually(batch)
+            return
+        for item, result, error in results:
+            if item.future.done():  # caller went away
+                continue
+            if error is not None:
+                item.future.set_exception(error)
+            else:
+                item.future.set_result(result)
+
+    async def _flush_individually(self, batch: list[_Pending]) -> None:
+        for item in batch:
+            async with async_session() as db:
+                try:
+                    result = await item.op(db)
+                    await db.commit()
+                except Exception as e:
+                    await db.rollback()
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                    continue
+            if not item.future.done():
+                item.future.set_result(result)
+
+
+write_queue = WriteQueue(
+    max_ops=int(os.getenv("WRITE_BATCH_MAX_OPS", "64")),
+    max_delay=float(os.getenv("WRITE_BATCH_DELAY_MS", "0")) / 1000,
+    max_depth=int(os.getenv("WRITE_QUEUE_DEPTH", "1024")),
+)
@@ -0,0 +1,30 @@
+"""Rebuild the checklist miss-rate aggregates from the reports of completed sessions."""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from app.analytics import rebuild_checklist_stats
+from app.database import engine, init_db
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", dest="scenario_ids",
+                        help="Only rebuild this scenario's rows (repeatable)")
+    args = parser.parse_args()
+
+    async def run():
+        await init_db()
+        async with engine.begin() as conn:
+            return await conn.run_sync(rebuild_checklist_stats, args.scenario_ids)
+
+    started = time.perf_counter()
+    counted = asyncio.run(run())
+    print(f"[OK] Aggregated {counted} completed session(s) in {time.perf_counter() - started:.1f}s.")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
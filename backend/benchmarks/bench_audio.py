@@ -0,0 +1,192 @@
+"""
+Audio upload and playback benchmark against a real server process.
+
+Starts `python -m uvicorn app.main:app` on a free port with a throwaway
+database and AUDIO_DIR, then:
+
+    upload      `--concurrency` clients each stream a `--size-mb` recording
+                to POST /sessions/{id}/audio (throughput, and how far the
+                server's resident memory rose while they ran)
+    range       GET /audio/{id} for a 64 KiB byte range at random offsets
+    download    GET /audio/{id} for whole recordings
+
+Memory is read from /proc, so the rss figures are Linux only. With --compare,
+results are checked against benchmarks/baselines/audio.json.
+
+    cd backend && python -m benchmarks.bench_audio
+    cd backend && python -m benchmarks.bench_audio --concurrency 32 --size-mb 10 --save-baseline
+    cd backend && python -m benchmarks.bench_audio --concurrency 32 --size-mb 10 --compare
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+from benchmarks.common import add_result_arguments, finish, latency_summary
+
+PIECE = 64 * 1024
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _rss_mb(pid: int) -> float:
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return 0.0
+
+
+async def _wait_ready(client: httpx.AsyncClient, proc: subprocess.Popen, timeout: float = 60.0) -> None:
+    t0 = time.perf_counter()
+    while True:
+        try:
+            if (await client.get("/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        if proc.poll() is not None:
+            raise RuntimeError(f"Server exited with {proc.returncode}")
+        if time.perf_counter() - t0 > timeout:
+            raise RuntimeError(f"Server not ready within {timeout}s")
+        await asyncio.sleep(0.05)
+
+
+async def run(args, base_url: str, pid: int) -> dict:
+    size = int(args.size_mb * 1024 * 1024)
+    piece = os.urandom(PIECE)
+
+    async def body():
+        sent = 0
+        while sent < size:
+            chunk = piece[:size - sent]
+            sent += len(chunk)
+            yield chunk
+
+    results = {}
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=300.0, limits=limits) as client:
+        start = await client.post("/sessions/start", json={"scenario_id": "s1_antenatal", "lang": "en"})
+        session_id = start.json()["session_id"]
+
+        rss_before = peak = _rss_mb(pid)
+        done = False
+
+        async def watch():
+            nonlocal peak
+            while not done:
+                peak = max(peak, _rss_mb(pid))
+                await asyncio.sleep(0.01)
+
+        async def upload():
+            t = time.perf_counter()
+            r = await client.post(f"/sessions/{session_id}/audio", content=body(), headers={"Content-Type": "audio/ogg"})
+            r.raise_for_status()
+            return r.json()["url"], (time.perf_counter() - t) * 1000
+
+        watcher = asyncio.create_task(watch())
+        t0 = time.perf_counter()
+        uploaded = await asyncio.gather(*(upload() for _ in range(args.concurrency)))
+        elapsed = time.perf_counter() - t0
+        done = True
+        await watcher
+        urls = [url for url, _ in uploaded]
+        results["upload"] = {
+            **latency_summary([ms for _, ms in uploaded]),
+            "mb_per_sec": round(args.concurrency * size / 1024 / 1024 / elapsed, 1),
+            "rss_before_mb": round(rss_before, 1),
+            "rss_growth_mb": round(peak - rss_before, 1),
+        }
+
+        rng = random.Random(0)
+        latencies = []
+        for _ in range(args.requests):
+            offset = rng.randrange(0, max(size - PIECE, 1))
+            t = time.perf_counter()
+            r = await client.get(rng.choice(urls), headers={"Range": f"bytes={offset}-{offset + PIECE - 1}"})
+            latencies.append((time.perf_counter() - t) * 1000)
+            assert r.status_code == 206, r.status_code
+        results["range"] = {**latency_summary(latencies), "requests_per_sec": round(1000 * len(latencies) / sum(latencies), 1)}
+
+        latencies = []
+        for url in urls:
+            t = time.perf_counter()
+            r = await client.get(url)
+            latencies.append((time.perf_counter() - t) * 1000)
+            assert len(r.content) == size
+        results["download"] = {
+            **latency_summary(latencies),
+            "mb_per_sec": round(len(urls) * size / 1024 / 1024 / (sum(latencies) / 1000), 1),
+        }
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16, help="Simultaneous uploads")
+    parser.add_argument("--size-mb", type=float, default=5.0, help="Size of each recording")
+    parser.add_argument("--requests", type=int, default=500, help="Range requests")
+    add_result_arguments(parser, "audio.json")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    port = _free_port()
+    env = {
+        **os.environ,
+        "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+        "AUDIO_DIR": os.path.join(tmp, "audio"),
+        "AUDIO_MAX_BYTES": str(int(args.size_mb * 1024 * 1024) + 1),
+        "AUDIO_SESSION_QUOTA_BYTES": str(10 ** 12),
+        "AUDIO_MIN_FREE_BYTES": "0",
+        "SCENARIO_RELOAD_INTERVAL": "0",
+    }
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    async def bench():
+        async with httpx.AsyncClient(base_url=base_url) as client:
+            await _wait_ready(client, proc)
+        return await run(args, base_url, proc.pid)
+
+    try:
+        results = asyncio.run(bench())
+    finally:
+        proc.terminate()
+        proc.wait()
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    print(f"{args.concurrency} concurrent uploads of {args.size_mb} MB\n")
+    up = results["upload"]
+    print(f"  upload    {up['mb_per_sec']:>8,.1f} MB/s   p50 {up['p50_ms']:>9,.1f} ms   "
+          f"server rss {up['rss_before_mb']:,.1f} MB +{up['rss_growth_mb']:,.1f} MB at peak")
+    rg = results["range"]
+    print(f"  range     {rg['requests_per_sec']:>8,.1f} req/s  p50 {rg['p50_ms']:>9,.2f} ms   p99 {rg['p99_ms']:,.2f} ms")
+    dl = results["download"]
+    print(f"  download  {dl['mb_per_sec']:>8,.1f} MB/s   p50 {dl['p50_ms']:>9,.1f} ms")
+    finish(results, args, concurrency=args.concurrency, size_mb=args.size_mb)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark POST /sessions/{id}/complete against the number of turns played.
+
+The score, checklist results and suggestions come from the running
+aggregate and cost the same for any session, but the report's transcript
+is built from the stored turns, so completion reads every turn once. This
+measures how much that costs as sessions get longer: open sessions with
+each turn count are seeded through /sessions/batch-evaluate on a temp
+database and completed in-process through httpx's ASGI transport.
+
+    cd backend && python -m benchmarks.bench_complete
+    cd backend && python -m benchmarks.bench_complete --turns 1 20 200 --sessions 50
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.scenario_loader import get_compiled_scenario
+
+from benchmarks.common import latency_summary
+
+
+async def _seed(client: httpx.AsyncClient, turns: int, sessions: int) -> list[str]:
+    scenario = get_compiled_scenario("s2_postnatal")
+    keys = list(scenario.nodes)
+    body = {"sessions": [{
+        "lang": "hi",
+        "scenario_id": scenario.id,
+        "turns": [
+            {"node_key": keys[i % len(keys)], "user_text": "namaste didi, bukhar ya khoon to nahi? " * 4}
+            for i in range(turns)
+        ],
+        "complete": False,
+    } for _ in range(sessions)]}
+    r = await client.post("/sessions/batch-evaluate", json=body)
+    r.raise_for_status()
+    return [result["session_id"] for result in r.json()["results"]]
+
+
+async def _measure(client: httpx.AsyncClient, session_ids: list[str]) -> dict:
+    latencies = []
+    for session_id in session_ids:
+        t0 = time.perf_counter()
+        r = await client.post(f"/sessions/{session_id}/complete")
+        latencies.append((time.perf_counter() - t0) * 1000)
+        r.raise_for_status()
+    return latency_summary(latencies)
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, nargs="+", default=[10, 50, 200], help="Turn counts to measure (at most 200: batch-evaluate's limit)")
+    parser.add_argument("--sessions", type=int, default=30, help="Sessions completed per turn count")
+    args = parser.parse_args()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            await _measure(client, await _seed(client, 1, 5))  # warm-up
+            results = {n: await _measure(client, await _seed(client, n, args.sessions)) for n in args.turns}
+
+    print(f"POST complete, {args.sessions} sessions per turn count")
+    first, base = next(iter(results.items()))
+    for n, res in results.items():
+        # Cost of each turn beyond the smallest count: the transcript's share
+        per_turn = (res["mean_ms"] - base["mean_ms"]) * 1000 / (n - first) if n != first else 0.0
+        print(
+            f"  {n:>6} turns  mean {res['mean_ms']:8.3f} ms  p50 {res['p50_ms']:8.3f} ms  "
+            f"p95 {res['p95_ms']:8.3f} ms  (+{per_turn:.1f} us/turn)"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,104 @@
+"""
+Microbenchmarks for the evaluation hot path on synthetic scenarios.
+
+Times match_keys, evaluate_turn (with the precompiled matcher and with one
+built per call), CompiledNode.evaluate on the same scenario with branching
+transitions (turn evaluation plus branch selection), exact versus fuzzy
+matching of an utterance with typos in half of its keywords (typos_exact,
+typos_fuzzy), generate_report and scenario_loader.get_node, on a
+scenario scaled to hundreds of checklist items per node and long worker
+utterances (see benchmarks/synthetic.py). With --compare, results are
+checked against benchmarks/baselines/micro.json.
+
+    cd backend && python -m benchmarks.bench_micro
+    cd backend && python -m benchmarks.bench_micro --items 300 --words 1000 --save-baseline
+    cd backend && python -m benchmarks.bench_micro --items 300 --words 1000 --compare
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import scenario_loader
+from app.evaluation import evaluate_turn, generate_report
+from app.normalization import match_keys
+from app.scenario_graph import compile_scenario
+
+from benchmarks.common import add_result_arguments, finish
+from benchmarks.synthetic import make_scenario, make_transcript, make_utterance
+
+
+def bench(fn, number: int, repeat: int) -> dict:
+    """Per-call time of `fn()` in microseconds, best and median over `repeat` runs."""
+    fn()  # warm-up
+    runs = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            fn()
+        runs.append((time.perf_counter() - t0) / number * 1e6)
+    return {"min_us": round(min(runs), 3), "median_us": round(statistics.median(runs), 3), "calls": number * repeat}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--nodes", type=int, default=10)
+    parser.add_argument("--items", type=int, default=200, help="Checklist items per node")
+    parser.add_argument("--keywords", type=int, default=6, help="Keywords per checklist item")
+    parser.add_argument("--words", type=int, default=400, help="Words per worker utterance")
+    parser.add_argument("--turns", type=int, default=60, help="Turns in the generate_report transcript")
+    parser.add_argument("--repeat", type=int, default=5)
+    add_result_arguments(parser, "micro.json")
+    args = parser.parse_args()
+
+    data = make_scenario(nodes=args.nodes, items_per_node=args.items, keywords_per_item=args.keywords)
+    compiled = compile_scenario(data)
+    snapshot = scenario_loader.get_snapshot()
+    scenario_loader.publish(scenario_loader.make_snapshot({**snapshot.scenarios, data["id"]: compiled}, snapshot.content_hash))
+    node = compiled.nodes["start"]
+    branching = compile_scenario(make_scenario(
+        nodes=args.nodes, items_per_node=args.items, keywords_per_item=args.keywords, branching=True,
+    ))
+    branching_node = branching.nodes["start"]
+    fuzzy_data = make_scenario(
+        nodes=args.nodes, items_per_node=args.items, keywords_per_item=args.keywords, fuzzy=True,
+    )
+    typos = make_utterance(fuzzy_data, "start", args.words, typo_rate=0.5)
+    fuzzy_node = compile_scenario(fuzzy_data).nodes["start"]
+    typos_exact_node = compile_scenario({**fuzzy_data, "fuzzy": False}).nodes["start"]
+    utterance = make_utterance(data, "start", args.words)
+    transcript = make_transcript(data, args.turns, args.words)
+    for turn in transcript:
+        n = compiled.nodes[turn["node_key"]]
+        turn.update(evaluate_turn(turn["user_text"], n.checklist, n.matcher))
+
+    cases = {
+        "normalize": (lambda: match_keys(utterance), 2000),
+        "evaluate_turn": (lambda: evaluate_turn(utterance, node.checklist, node.matcher), 500),
+        "evaluate_and_branch": (lambda: branching_node.evaluate(utterance), 500),
+        "typos_exact": (lambda: typos_exact_node.evaluate(typos), 500),
+        "typos_fuzzy": (lambda: fuzzy_node.evaluate(typos), 200),
+        "evaluate_turn_uncompiled": (lambda: evaluate_turn(utterance, data["nodes"]["start"]["expected_checklist"]), 20),
+        "generate_report": (lambda: generate_report(transcript, data), 10),
+        "get_node": (lambda: scenario_loader.get_node(data["id"], "node_1", "hi"), 20000),
+    }
+
+    print(
+        f"{args.nodes} nodes x {args.items} items x {args.keywords} keywords, "
+        f"{args.words}-word utterances, {args.turns}-turn report\n"
+    )
+    results = {}
+    for name, (fn, number) in cases.items():
+        results[name] = res = bench(fn, number, args.repeat)
+        print(f"  {name:<26} min {res['min_us']:>12,.3f} us   median {res['median_us']:>12,.3f} us")
+
+    finish(results, args, nodes=args.nodes, items=args.items, keywords=args.keywords,
+           words=args.words, turns=args.turns)
+
+
+if __name__ == "__main__":
+    main()
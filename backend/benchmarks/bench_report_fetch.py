@@ -0,0 +1,120 @@
+"""
+Benchmark GET /sessions/{id}/report: raw report_json path vs the old model path.
+
+The old handler (ORM load, Report/SessionReportResponse construction and
+response_model validation) is mounted next to the real one on a temp
+database, and both are driven in-process through httpx's ASGI transport.
+
+    cd backend && python -m benchmarks.bench_report_fetch --turns 60 --requests 500
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/bench.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi import Depends, HTTPException
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import get_db
+from app.main import app
+from app.models import Session
+from app.scenario_loader import get_compiled_scenario, get_scenario_title
+from app.schemas import SessionReportResponse, Report, ChecklistResult
+
+
+@app.get("/bench/legacy-report/{session_id}", response_model=SessionReportResponse, include_in_schema=False)
+async def legacy_report(session_id: str, db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(Session).where(Session.id == session_id))
+    session = result.scalar_one_or_none()
+    if not session:
+        raise HTTPException(status_code=404, detail="Session not found")
+    rj = session.report_json
+    report = Report(
+        score=rj["score"],
+        checklist_results=[ChecklistResult(**cr) for cr in rj["checklist_results"]],
+        critical_misses=rj["critical_misses"],
+        suggestions=rj["suggestions"],
+        transcript=rj.get("transcript", []),
+    )
+    return SessionReportResponse(
+        session_id=session.id,
+        scenario_id=session.scenario_id,
+        scenario_title=get_scenario_title(session.scenario_id, session.language),
+        language=session.language,
+        started_at=session.started_at.isoformat(),
+        completed_at=session.completed_at.isoformat() if session.completed_at else None,
+        score=session.score,
+        report=report,
+    )
+
+
+async def _seed(client: httpx.AsyncClient, turns: int) -> str:
+    scenario = get_compiled_scenario("s2_postnatal")
+    keys = list(scenario.nodes)
+    body = {"sessions": [{
+        "lang": "hi",
+        "scenario_id": scenario.id,
+        "turns": [
+            {"node_key": keys[i % len(keys)], "user_text": "namaste didi, bukhar ya khoon to nahi? " * 4}
+            for i in range(turns)
+        ],
+    }]}
+    r = await client.post("/sessions/batch-evaluate", json=body)
+    r.raise_for_status()
+    return r.json()["results"][0]["session_id"]
+
+
+async def _measure(client: httpx.AsyncClient, url: str, n: int) -> dict:
+    for _ in range(min(n, 20)):  # warm-up
+        (await client.get(url)).raise_for_status()
+    latencies = []
+    cpu_start = time.process_time()
+    for _ in range(n):
+        t0 = time.perf_counter()
+        r = await client.get(url)
+        latencies.append((time.perf_counter() - t0) * 1000)
+    cpu = time.process_time() - cpu_start
+    r.raise_for_status()
+    latencies.sort()
+    return {
+        "mean_ms": round(statistics.fmean(latencies), 3),
+        "p50_ms": round(latencies[len(latencies) // 2], 3),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95)], 3),
+        "cpu_ms_per_request": round(cpu * 1000 / n, 3),
+        "bytes": len(r.content),
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=60, help="Turns in the benchmarked session's transcript")
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            session_id = await _seed(client, args.turns)
+            legacy = await _measure(client, f"/bench/legacy-report/{session_id}", args.requests)
+            fast = await _measure(client, f"/sessions/{session_id}/report", args.requests)
+
+    print(f"GET report, {args.turns}-turn transcript, {args.requests} requests")
+    for name, res in (("model path", legacy), ("raw path", fast)):
+        print(
+            f"  {name:<11} mean {res['mean_ms']:.3f} ms  p50 {res['p50_ms']:.3f} ms  "
+            f"p95 {res['p95_ms']:.3f} ms  cpu {res['cpu_ms_per_request']:.3f} ms/req  ({res['bytes']} bytes)"
+        )
+    print(f"  speedup (mean latency): {legacy['mean_ms'] / fast['mean_ms']:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
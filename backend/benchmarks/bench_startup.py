@@ -0,0 +1,134 @@
+"""
+Cold start benchmark: time from launching the server process to the first
+successful POST /sessions/start.
+
+Each run starts `python -m uvicorn app.main:app` on a free port and polls
+/sessions/start until it returns 200, on a copy of the scenario directory
+(plus `--synthetic` generated scenarios, to show how startup scales with
+content). Cases:
+
+    bundle      prebuilt scenario bundle, existing database (a restart)
+    no_bundle   scenario files compiled at startup, existing database
+    fresh_db    prebuilt scenario bundle, empty database (a first deploy)
+
+With --compare, results are checked against benchmarks/baselines/startup.json.
+
+    cd backend && python -m benchmarks.bench_startup
+    cd backend && python -m benchmarks.bench_startup --runs 10 --synthetic 50 --save-baseline
+    cd backend && python -m benchmarks.bench_startup --runs 10 --synthetic 50 --compare
+"""
+
+import argparse
+import json
+import os
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx
+
+from app.scenario_loader import SCENARIOS_DIR
+
+from benchmarks.common import add_result_arguments, finish
+from benchmarks.synthetic import make_scenario
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def time_to_first_start(env: dict, timeout: float = 60.0) -> float:
+    """Milliseconds from spawning the server to its first successful /sessions/start."""
+    port = _free_port()
+    url = f"http://127.0.0.1:{port}/sessions/start"
+    body = {"scenario_id": "s1_antenatal", "lang": "en", "device_id": "bench-startup"}
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            while True:
+                try:
+                    if client.post(url, json=body).status_code == 200:
+                        return (time.perf_counter() - t0) * 1000
+                except httpx.TransportError:
+                    pass
+                if proc.poll() is not None:
+                    raise RuntimeError(f"Server exited with {proc.returncode}: {proc.stderr.read().decode()[-2000:]}")
+                if time.perf_counter() - t0 > timeout:
+                    raise RuntimeError(f"No successful /sessions/start within {timeout}s")
+                time.sleep(0.005)
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Server starts per case")
+    parser.add_argument("--synthetic", type=int, default=20, help="Generated scenarios added to the real ones")
+    add_result_arguments(parser, "startup.json")
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp()
+    scenarios_dir = os.path.join(tmp, "scenarios")
+    shutil.copytree(SCENARIOS_DIR, scenarios_dir)
+    for i in range(args.synthetic):
+        # 6 x 10 distinct checklist items stays under the per-scenario limit
+        data = make_scenario(scenario_id=f"bench_synthetic_{i}", nodes=6, items_per_node=10, seed=i)
+        with open(os.path.join(scenarios_dir, f"bench_synthetic_{i}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+
+    base_env = {
+        **os.environ,
+        "SCENARIOS_DIR": scenarios_dir,
+        "SCENARIO_RELOAD_INTERVAL": "0",
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    bundle = os.path.join(tmp, "scenarios.bundle")
+    subprocess.run(
+        [sys.executable, "build_scenario_bundle.py", "--output", bundle],
+        cwd=BACKEND_DIR, env=base_env, check=True, stdout=subprocess.DEVNULL,
+    )
+    existing_db = f"sqlite+aiosqlite:///{os.path.join(tmp, 'existing.db')}"
+    missing_bundle = os.path.join(tmp, "missing.bundle")
+
+    cases = {
+        "bundle": lambda run: {"SCENARIO_BUNDLE": bundle, "DATABASE_URL": existing_db},
+        "no_bundle": lambda run: {"SCENARIO_BUNDLE": missing_bundle, "DATABASE_URL": existing_db},
+        "fresh_db": lambda run: {
+            "SCENARIO_BUNDLE": bundle,
+            "DATABASE_URL": f"sqlite+aiosqlite:///{os.path.join(tmp, f'fresh_{run}.db')}",
+        },
+    }
+
+    print(f"{len(os.listdir(scenarios_dir))} scenarios, {args.runs} server starts per case\n")
+    time_to_first_start({**base_env, **cases["bundle"](0)})  # creates the existing database
+    results = {}
+    for name, case_env in cases.items():
+        runs = [time_to_first_start({**base_env, **case_env(run)}) for run in range(args.runs)]
+        results[name] = res = {
+            "min_ms": round(min(runs), 1),
+            "median_ms": round(statistics.median(runs), 1),
+            "max_ms": round(max(runs), 1),
+            "runs": len(runs),
+        }
+        print(f"  {name:<10} min {res['min_ms']:>9,.1f} ms   median {res['median_ms']:>9,.1f} ms   max {res['max_ms']:>9,.1f} ms")
+
+    shutil.rmtree(tmp, ignore_errors=True)
+    finish(results, args, runs=args.runs, scenarios=len(os.listdir(SCENARIOS_DIR)) + args.synthetic)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Shared helpers for the benchmark scripts: percentiles, result files and
+baseline comparison.
+
+Result files look like
+
+    {"meta": {...}, "results": {"<benchmark>": {"<metric>": number, ...}}}
+
+Metrics ending in `_ms` or `_us` are latencies (lower is better); metrics
+ending in `_per_sec` are throughputs (higher is better). Anything else is
+informational and never compared.
+
+Baselines are absolute timings from whatever machine saved them, so a run
+is only compared against one when asked to (`--compare`), and is meant to
+be compared with a baseline saved on the same machine: record one with
+`--save-baseline` before a change, then rerun with `--compare` after it.
+"""
+
+import json
+import os
+import platform
+import sys
+from datetime import datetime, timezone
+
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list (q in 0..100)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def latency_summary(latencies_ms: list[float]) -> dict:
+    values = sorted(latencies_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(sum(values) / len(values), 3) if values else 0.0,
+        "p50_ms": round(percentile(values, 50), 3),
+        "p95_ms": round(percentile(values, 95), 3),
+        "p99_ms": round(percentile(values, 99), 3),
+        "max_ms": round(values[-1], 3) if values else 0.0,
+    }
+
+
+def write_results(path: str, results: dict, **meta) -> None:
+    payload = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            **meta,
+        },
+        "results": results,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(payload, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def _direction(metric: str) -> int:
+    """+1 if higher is worse, -1 if lower is worse, 0 if not compared."""
+    if metric.endswith(("_ms", "_us")):
+        return 1
+    if metric.endswith("_per_sec"):
+        return -1
+    return 0
+
+
+def compare(results: dict, baseline_path: str, tolerance: float) -> list[str]:
+    """
+    Print a comparison against `baseline_path` and return the regressions:
+    metrics that got worse than the baseline by more than `tolerance`
+    (a fraction, e.g. 0.2 for 20%).
+    """
+    with open(baseline_path, encoding="utf-8") as f:
+        saved = json.load(f)
+    baseline = saved["results"]
+
+    regressions = []
+    print(f"\nCompared with {os.path.relpath(baseline_path)} (tolerance {tolerance:.0%}):")
+    here = {"python": platform.python_version(), "machine": platform.machine()}
+    elsewhere = {k: saved["meta"].get(k) for k in here if saved["meta"].get(k) != here[k]}
+    if elsewhere:
+        print(f"  note: baseline was saved with {elsewhere}, this run has {here}; timings may not be comparable")
+    for name, metrics in results.items():
+        base = baseline.get(name)
+        if base is None:
+            print(f"  {name}: no baseline")
+            continue
+        for metric, value in metrics.items():
+            direction = _direction(metric)
+            old = base.get(metric)
+            if not direction or not old:
+                continue
+            change = (value - old) / old
+            worse = change * direction > tolerance
+            flag = "REGRESSION" if worse else "ok"
+            print(f"  {name:<32} {metric:<14} {old:>12,.3f} -> {value:>12,.3f}  {change:+7.1%}  {flag}")
+            if worse:
+                regressions.append(f"{name} {metric} {change:+.1%}")
+    return regressions
+
+
+def finish(results: dict, args, **meta) -> None:
+    """Handle the --output/--save-baseline/--compare options shared by every script."""
+    if args.output:
+        write_results(args.output, results, **meta)
+        print(f"\nResults written to {args.output}")
+    if args.save_baseline:
+        write_results(args.baseline, results, **meta)
+        print(f"\nBaseline written to {args.baseline}")
+        return
+    if not args.compare:
+        return
+    if os.path.exists(args.baseline):
+        regressions = compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n[FAIL] {len(regressions)} regression(s): " + "; ".join(regressions))
+            sys.exit(1)
+        print("\n[OK] No regressions.")
+    else:
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one.")
+
+
+def add_result_arguments(parser, default_baseline: str) -> None:
+    parser.add_argument("--output", help="Also write results to this JSON file")
+    parser.add_argument("--baseline", default=os.path.join(BASELINE_DIR, default_baseline),
+                        help="Baseline JSON to save or compare against (default: %(default)s)")
+    parser.add_argument("--compare", action="store_true",
+                        help="Compare with the baseline and exit 1 on regressions; "
+                             "only meaningful for a baseline saved on this machine")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Overwrite the baseline with this run instead of comparing")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="Allowed slowdown before a metric counts as a regression (default: %(default)s)")
@@ -0,0 +1,145 @@
+"""
+End-to-end load driver: simulated trainees running start -> turns -> complete.
+
+Each trainee picks a scenario and language, walks the scenario node by node
+with utterances that hit part of each node's checklist, then completes the
+session. `--concurrency` trainees run at once. By default the app runs
+in-process (httpx ASGI transport) on a fresh temporary SQLite database;
+pass --url to load a running server instead.
+
+Reports p50/p95/p99 latency per endpoint and overall requests/sec, and,
+with --compare, checks them against benchmarks/baselines/load.json.
+
+    cd backend && python -m benchmarks.load_test --trainees 200 --concurrency 20
+    cd backend && python -m benchmarks.load_test --url http://localhost:8000 --output load.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", f"sqlite+aiosqlite:///{tempfile.mkdtemp()}/load.db")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.main import app
+from app.scenario_loader import get_all_scenarios
+
+from benchmarks.common import add_result_arguments, finish, latency_summary
+
+FILLER = "haan didi theek hai aap batao kya hua kab se ho raha hai".split()
+
+
+def _utterance(rng: random.Random, node: dict) -> str:
+    words = rng.sample(FILLER, 6)
+    for item in node.get("expected_checklist", []):
+        if rng.random() < 0.7:
+            words.append(rng.choice(item["keywords"]))
+    rng.shuffle(words)
+    return " ".join(words)
+
+
+class Recorder:
+    def __init__(self):
+        self.latencies: dict[str, list[float]] = {}
+        self.errors = 0
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> dict:
+        t0 = time.perf_counter()
+        r = await client.request(method, url, **kwargs)
+        self.latencies.setdefault(name, []).append((time.perf_counter() - t0) * 1000)
+        if r.status_code != 200:
+            self.errors += 1
+            raise RuntimeError(f"{method} {url} -> {r.status_code}: {r.text[:200]}")
+        return r.json()
+
+
+async def _trainee(client, rec: Recorder, scenarios: dict, rng: random.Random, n: int) -> None:
+    scenario = scenarios[rng.choice(sorted(scenarios))]
+    lang = rng.choice(scenario.get("supported_languages", ["en"]))
+    started = await rec.request(client, "POST /sessions/start", "POST", "/sessions/start", json={
+        "device_id": f"load-device-{n % 50}", "lang": lang, "scenario_id": scenario["id"],
+    })
+    session_id = started["session_id"]
+    node_key = started["node"]["node_key"]
+    while True:
+        turn = await rec.request(
+            client, "POST /sessions/{session_id}/turn", "POST", f"/sessions/{session_id}/turn",
+            json={"node_key": node_key, "user_text": _utterance(rng, scenario["nodes"][node_key])},
+        )
+        if turn["is_complete"]:
+            break
+        node_key = turn["next_node"]["node_key"]
+    await rec.request(client, "POST /sessions/{session_id}/complete", "POST", f"/sessions/{session_id}/complete")
+    await rec.request(client, "GET /sessions/{session_id}/report", "GET", f"/sessions/{session_id}/report")
+
+
+async def run(args) -> tuple[dict, float, int]:
+    rec = Recorder()
+    rng = random.Random(args.seed)
+    queue: asyncio.Queue[int] = asyncio.Queue()
+    for n in range(args.trainees):
+        queue.put_nowait(n)
+
+    async def worker(client, scenarios):
+        while not queue.empty():
+            n = queue.get_nowait()
+            await _trainee(client, rec, scenarios, random.Random(rng.random()), n)
+
+    async def drive(client):
+        scenarios = get_all_scenarios()
+        t0 = time.perf_counter()
+        await asyncio.gather(*(worker(client, scenarios) for _ in range(args.concurrency)))
+        return time.perf_counter() - t0
+
+    limits = httpx.Limits(max_connections=args.concurrency)
+    if args.url:
+        async with httpx.AsyncClient(base_url=args.url, limits=limits, timeout=60) as client:
+            elapsed = await drive(client)
+    else:
+        async with app.router.lifespan_context(app):
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://load", timeout=60) as client:
+                elapsed = await drive(client)
+
+    total = sum(len(v) for v in rec.latencies.values())
+    results = {name: latency_summary(values) for name, values in rec.latencies.items()}
+    results["overall"] = {
+        **latency_summary([x for v in rec.latencies.values() for x in v]),
+        "requests_per_sec": round(total / elapsed, 1),
+        "sessions_per_sec": round(args.trainees / elapsed, 1),
+    }
+    return results, elapsed, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--trainees", type=int, default=200, help="Sessions to run end to end")
+    parser.add_argument("--concurrency", type=int, default=20, help="Trainees running at once")
+    parser.add_argument("--url", help="Base URL of a running server (default: in-process app on a temp DB)")
+    parser.add_argument("--seed", type=int, default=1)
+    add_result_arguments(parser, "load.json")
+    args = parser.parse_args()
+
+    results, elapsed, total = asyncio.run(run(args))
+
+    target = args.url or "in-process app"
+    print(f"{args.trainees} trainees, concurrency {args.concurrency}, {target}: {total} requests in {elapsed:.2f}s\n")
+    for name, res in results.items():
+        print(
+            f"  {name:<36} n={res['count']:<6} p50 {res['p50_ms']:>8.2f} ms  "
+            f"p95 {res['p95_ms']:>8.2f} ms  p99 {res['p99_ms']:>8.2f} ms"
+        )
+    overall = results["overall"]
+    print(f"\n  {overall['requests_per_sec']:,.1f} requests/sec, {overall['sessions_per_sec']:,.1f} sessions/sec")
+
+    finish(results, args, trainees=args.trainees, concurrency=args.concurrency, target=target)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Deterministic synthetic scenarios and transcripts for benchmarks.
+
+Real scenarios have a handful of checklist items per node; these scale the
+same JSON shape up to hundreds of items and long worker utterances so that
+matching and report costs are measurable.
+"""
+
+import random
+import string
+
+# Mix of English and romanized Hindi stems, like real worker utterances
+_STEMS = (
+    "bleed", "fever", "swell", "head", "pain", "iron", "tablet", "rest", "deliver", "hospital",
+    "baby", "move", "feed", "ors", "zinc", "water", "danger", "sign", "vaccine", "weight",
+    "khoon", "bukhar", "sujan", "dard", "khana", "paani", "dawai", "aaram", "bachcha", "doodh",
+)
+
+
+def _words(rng: random.Random, n: int, letters: bool = False) -> list[str]:
+    if letters:
+        # Digits never match fuzzily, and stem + suffix words would all be
+        # within a couple of edits of each other, so fuzzy scenarios get
+        # random letter words of realistic length instead
+        return ["".join(rng.choices(string.ascii_lowercase, k=rng.randrange(4, 10))) for _ in range(n)]
+    return [f"{rng.choice(_STEMS)}{rng.randrange(1000)}" for _ in range(n)]
+
+
+def _typo(rng: random.Random, word: str) -> str:
+    """`word` with one letter replaced, dropped or doubled, like a speech-to-text slip."""
+    i = rng.randrange(1, len(word))
+    kind = rng.randrange(3)
+    if kind == 0:
+        return word[:i] + rng.choice(string.ascii_lowercase) + word[i + 1:]
+    if kind == 1:
+        return word[:i] + word[i + 1:]
+    return word[:i] + word[i] + word[i:]
+
+
+def make_scenario(
+    scenario_id: str = "bench_synthetic",
+    nodes: int = 10,
+    items_per_node: int = 100,
+    keywords_per_item: int = 6,
+    seed: int = 7,
+    branching: bool = False,
+    fuzzy: bool = False,
+) -> dict:
+    """
+    A linear scenario with `nodes` nodes of `items_per_node` checklist items
+    each. With `branching`, every node also gets a keyword branch and a
+    critical-miss branch (both leading on) ahead of its default transition.
+    With `fuzzy`, keyword matching is typo-tolerant and keywords are
+    letters only.
+    """
+    rng = random.Random(seed)
+    node_keys = ["start"] + [f"node_{i}" for i in range(1, nodes)]
+    scenario_nodes = {}
+    for i, key in enumerate(node_keys):
+        checklist = []
+        for j in range(items_per_node):
+            keywords = _words(rng, keywords_per_item, fuzzy)
+            # Some multi-word phrases, as in the real files ("since when", "call 108")
+            keywords[0] = f"{keywords[0]} {rng.choice(_STEMS)}"
+            checklist.append({
+                "item": f"Checklist item {i}.{j}",
+                "type": "critical" if j % 10 == 0 else "normal",
+                "keywords": keywords,
+            })
+        next_key = node_keys[i + 1] if i + 1 < len(node_keys) else "__end__"
+        transitions = [{"condition": "default", "next_node_key": next_key}]
+        if branching:
+            transitions[:0] = [
+                {"condition": "keywords", "keywords": _words(rng, keywords_per_item, fuzzy), "next_node_key": next_key},
+                {"condition": "critical_missed", "next_node_key": next_key},
+            ]
+        scenario_nodes[key] = {
+            "patient_text": {"en": f"Patient line {i}", "hi": f"मरीज़ {i}"},
+            "expected_checklist": checklist,
+            "transitions": transitions,
+        }
+    scenario = {
+        "id": scenario_id,
+        "title": {"en": "Synthetic benchmark scenario", "hi": "बेंचमार्क"},
+        "category": {"en": "Benchmark"},
+        "difficulty": "advanced",
+        "estimated_minutes": nodes,
+        "description": {"en": "Generated for benchmarks."},
+        "supported_languages": ["en", "hi"],
+        "total_turns_estimate": nodes,
+        "nodes": scenario_nodes,
+    }
+    if fuzzy:
+        scenario["fuzzy"] = True
+    return scenario
+
+
+def make_utterance(
+    scenario: dict,
+    node_key: str,
+    words: int = 400,
+    hit_rate: float = 0.5,
+    seed: int = 11,
+    typo_rate: float = 0.0,
+) -> str:
+    """
+    A long worker utterance for `node_key`: `words` filler words with one
+    keyword from roughly `hit_rate` of the node's checklist items mixed in,
+    `typo_rate` of them misspelled by one edit.
+    """
+    rng = random.Random(seed)
+    tokens = _words(rng, words, scenario.get("fuzzy", False))
+    for item in scenario["nodes"][node_key]["expected_checklist"]:
+        if rng.random() < hit_rate:
+            keyword = rng.choice(item["keywords"])
+            if rng.random() < typo_rate:
+                keyword = " ".join(_typo(rng, w) for w in keyword.split())
+            tokens.insert(rng.randrange(len(tokens) + 1), keyword)
+    text = " ".join(tokens)
+    # Punctuation and casing for match_keys to chew on
+    return text.replace("0 ", "0, ").replace("5 ", "5! ").title()
+
+
+def make_transcript(scenario: dict, turns: int, words: int = 400) -> list[dict]:
+    """`turns` turns cycling through the scenario's nodes, shaped like SessionTurn rows."""
+    node_keys = list(scenario["nodes"])
+    transcript = []
+    for i in range(turns):
+        key = node_keys[i % len(node_keys)]
+        transcript.append({"turn_index": i + 1, "node_key": key, "user_text": make_utterance(scenario, key, words, seed=i)})
+    return transcript
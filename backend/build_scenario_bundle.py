@@ -0,0 +1,28 @@
+"""Validate and compile all scenario JSON files into the prebuilt bundle loaded at startup."""
+
+import argparse
+import sys
+
+from app.scenario_bundle import BUNDLE_PATH, write_bundle
+from app.scenario_loader import SCENARIOS_DIR, ScenarioSetError, build_snapshot
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", default=BUNDLE_PATH, help=f"Bundle path (default: {BUNDLE_PATH})")
+    args = parser.parse_args()
+
+    try:
+        snapshot = build_snapshot()
+    except ScenarioSetError as e:
+        print(f"[FAIL] {len(e.errors)} error(s) found in {SCENARIOS_DIR}:")
+        for error in e.errors:
+            print(f"  - {error}")
+        sys.exit(1)
+
+    write_bundle(snapshot.scenarios, snapshot.content_hash, args.output)
+    print(f"[OK] {len(snapshot.scenarios)} scenario(s), content {snapshot.content_hash[:12]} -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
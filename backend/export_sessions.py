@@ -0,0 +1,48 @@
+"""Export sessions and their turns as NDJSON or CSV (same output as GET /export/sessions)."""
+
+import argparse
+import asyncio
+import sys
+from datetime import datetime
+
+from app.database import init_db
+from app.export import ExportFilters, iter_export
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--output", "-o", help="Output file (default: stdout)")
+    parser.add_argument("--since", type=datetime.fromisoformat, help="Sessions started at or after (ISO 8601)")
+    parser.add_argument("--until", type=datetime.fromisoformat, help="Sessions started before (ISO 8601)")
+    parser.add_argument("--scenario", action="append", dest="scenario_ids", help="Scenario id (repeatable)")
+    parser.add_argument("--lang", action="append", dest="languages", help="Language code (repeatable)")
+    parser.add_argument("--completed-only", action="store_true")
+    parser.add_argument("--no-turns", action="store_true", help="One record per session, without turns")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="Rows encoded per output chunk")
+    parser.add_argument("--page-size", type=int, default=1000, help="Sessions read per transaction")
+    args = parser.parse_args()
+
+    filters = ExportFilters(
+        since=args.since,
+        until=args.until,
+        scenario_ids=args.scenario_ids,
+        languages=args.languages,
+        completed_only=args.completed_only,
+    )
+
+    async def run(out):
+        await init_db()
+        async for chunk in iter_export(args.format, filters, not args.no_turns, args.chunk_size, args.page_size):
+            out.write(chunk)
+
+    if args.output:
+        with open(args.output, "wb") as out:
+            asyncio.run(run(out))
+        print(f"[OK] Exported to {args.output}", file=sys.stderr)
+    else:
+        asyncio.run(run(sys.stdout.buffer))
+
+
+if __name__ == "__main__":
+    main()
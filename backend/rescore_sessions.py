@@ -0,0 +1,46 @@
+"""Re-evaluate stored turns, reports and scores after scenario keyword changes."""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from app.database import init_db
+from app.rescoring import rescore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--scenario", action="append", dest="scenario_ids",
+                        help="Only rescore sessions of this scenario (repeatable)")
+    parser.add_argument("--chunk-size", type=int, default=500, help="Sessions per transaction")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                        help="Evaluation processes (1 = evaluate in-process)")
+    args = parser.parse_args()
+
+    def progress(stats):
+        print(
+            f"  {stats.sessions} sessions, {stats.turns} turns "
+            f"({stats.turns_changed} changed), {stats.turns_per_sec:,.0f} turns/sec",
+            flush=True,
+        )
+
+    async def run():
+        await init_db()
+        return await rescore(args.scenario_ids, args.chunk_size, args.workers, progress)
+
+    stats = asyncio.run(run())
+    print(
+        f"\n[OK] Rescored {stats.sessions} session(s), {stats.turns} turn(s) in {stats.elapsed:.1f}s "
+        f"({stats.turns_per_sec:,.0f} turns/sec); {stats.turns_changed} turn(s) and "
+        f"{stats.reports} report(s) rewritten."
+    )
+    if stats.sessions_skipped:
+        print(f"[WARN] Skipped {stats.sessions_skipped} session(s) whose scenario no longer exists.")
+    if stats.sessions_busy:
+        print(f"[WARN] Left {stats.sessions_busy} session(s) that kept changing while being rescored; run again.")
+    sys.exit(0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,33 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Before app.database is imported: tests never touch data/sushrusha.db
+_DATA_DIR = tempfile.mkdtemp(prefix="sushrusha-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(_DATA_DIR, 'test.db')}"
+os.environ["AUDIO_DIR"] = os.path.join(_DATA_DIR, "audio")
+os.environ["SCENARIO_BUNDLE"] = os.path.join(_DATA_DIR, "scenarios.bundle")
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+async def app(anyio_backend):
+    """The app with its startup and shutdown run around the test."""
+    from app.main import app
+    async with app.router.lifespan_context(app):
+        yield app
+
+
+@pytest.fixture
+async def client(app):
+    import httpx
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
@@ -0,0 +1,74 @@
+import pytest
+from sqlalchemy import create_engine
+
+from app.checklist_items import (
+    CRITICAL_MISSED, MATCHED, MISSED, decode_outcome, encode_outcome, outcome_rows, parse_outcomes, sync_checklist_items,
+)
+from app.database import Base
+from app.models import ScenarioChecklistItem
+from app.scenario_graph import compile_scenario
+
+
+def _scenario(items: list[tuple[str, str]]) -> dict:
+    return {
+        "id": "t1", "title": {"en": "T"}, "category": {"en": "c"}, "supported_languages": ["en"],
+        "nodes": {"start": {
+            "patient_text": {"en": "hi"},
+            "expected_checklist": [{"item": name, "type": kind, "keywords": [name]} for name, kind in items],
+            "transitions": [{"condition": "default", "next_node_key": "__end__"}],
+        }},
+    }
+
+
+@pytest.fixture
+def conn():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine, tables=[ScenarioChecklistItem.__table__])
+    with engine.begin() as conn:
+        yield conn
+
+
+def _sync(conn, items):
+    scenario = compile_scenario(_scenario(items))
+    sync_checklist_items(conn, scenarios={scenario.id: scenario})
+
+
+def _packed(outcome: dict[int, int]) -> str:
+    return ",".join(str(row["ordinal"] * 8 + row["outcome"]) for row in outcome_rows("turn", outcome))
+
+
+def test_round_trip(conn):
+    _sync(conn, [("greet", "normal"), ("bleeding", "critical"), ("fever", "normal")])
+    result = {"matched_items": ["greet"], "missed_items": ["bleeding", "fever"], "critical_missed": ["bleeding"]}
+    outcome = encode_outcome("t1", result)
+    assert outcome == {0: MATCHED, 1: MISSED | CRITICAL_MISSED, 2: MISSED}
+    assert parse_outcomes(_packed(outcome)) == outcome
+    assert decode_outcome("t1", _packed(outcome)) == result
+
+
+def test_empty_outcome():
+    assert parse_outcomes(None) == {}
+    assert decode_outcome("t1", None) == {"matched_items": [], "missed_items": [], "critical_missed": []}
+
+
+def test_ordinals_survive_edits(conn):
+    _sync(conn, [("greet", "normal"), ("bleeding", "critical")])
+    stored = _packed(encode_outcome("t1", {"matched_items": ["bleeding"], "missed_items": [], "critical_missed": []}))
+    # Item removed and another added: the stored outcome still decodes to the old name
+    _sync(conn, [("fever", "normal"), ("greet", "normal")])
+    assert decode_outcome("t1", stored)["matched_items"] == ["bleeding"]
+    assert encode_outcome("t1", {"matched_items": ["fever"], "missed_items": [], "critical_missed": []}) == {2: MATCHED}
+
+
+def test_no_item_limit(conn):
+    names = [f"item{i}" for i in range(200)]
+    _sync(conn, [(name, "normal") for name in names])
+    result = {"matched_items": names[::2], "missed_items": names[1::2], "critical_missed": []}
+    assert decode_outcome("t1", _packed(encode_outcome("t1", result))) == result
+
+
+def test_unknown_ordinals_are_skipped(conn, caplog):
+    _sync(conn, [("greet", "normal")])
+    packed = _packed({0: MATCHED, 7: MISSED | CRITICAL_MISSED})
+    assert decode_outcome("t1", packed) == {"matched_items": ["greet"], "missed_items": [], "critical_missed": []}
+    assert "unknown checklist item ordinal 7 of scenario t1" in caplog.text
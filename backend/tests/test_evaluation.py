@@ -0,0 +1,153 @@
+import pytest
+
+from app.evaluation import KeywordMatcher, ROMANIZED_ENDINGS, _prefix_edit_distance, evaluate_turn, fuzzy_edits
+from app.normalization import match_keys
+from app.scenario_loader import get_compiled_scenarios
+
+
+@pytest.mark.parametrize("keyword, word, limit, expected", [
+    ("kick", "kick", 0, 0),
+    ("kick", "kicks", 0, 0),  # a prefix of the word matches outright
+    ("headache", "hedache", 2, 1),  # deletion
+    ("headache", "headdache", 2, 1),  # insertion
+    ("headache", "hesdache", 2, 1),  # substitution
+    ("headache", "hedaches", 2, 1),  # and inflected
+    ("headache", "headachex", 2, 1),  # trailing letter inserted
+    ("swelling", "sweling", 1, 1),
+    ("swelling", "swlng", 2, None),  # three edits
+    ("headache", "hed", 2, None),  # word too short to cover the keyword
+    ("fever", "fevr", 0, None),
+    ("rest", "resting", 0, 0),
+    ("stop", "stopped", 0, 0),  # doubled final letter
+    ("rest", "restaurant", 2, None),  # a longer word, not an inflection
+    ("fever", "never", 1, None),  # the first letter is never edited
+    ("bleeding", "pleading", 2, None),
+])
+def test_prefix_edit_distance(keyword, word, limit, expected):
+    assert _prefix_edit_distance(keyword, word, limit) == expected
+
+
+def test_prefix_edit_distance_is_the_minimum():
+    # "abcd" -> "axcd": one substitution, not a deletion plus an insertion
+    assert _prefix_edit_distance("abcd", "axcd", 2) == 1
+
+
+def _matched(text: str, checklist: list[dict]) -> list[str]:
+    return evaluate_turn(text, checklist)["matched_items"]
+
+
+def test_english_keywords_are_not_folded():
+    checklist = [{"item": "sip", "keywords": ["sip"]}, {"item": "well", "keywords": ["well"]}]
+    assert _matched("the ship was late", checklist) == []
+    assert _matched("are you well", checklist) == ["well"]
+    assert _matched("any weal", checklist) == []
+
+
+def test_romanized_keywords_fold_spellings_and_scripts():
+    checklist = [{"item": "blood", "keywords": ["blood"], "romanized_keywords": ["khoon", "sir dard"]}]
+    for text in ("khoon aa raha hai", "KHUN", "खून", "sir dard hai", "सिर दर्द"):
+        assert _matched(text, checklist) == ["blood"], text
+    assert _matched("blooded", checklist) == ["blood"]
+
+
+def test_native_script_keywords_are_romanized():
+    checklist = [{"item": "water", "keywords": ["पानी"]}]
+    assert _matched("paani do", checklist) == ["water"]
+
+
+@pytest.mark.parametrize("text, matched", [
+    ("please rest", True),
+    ("resting well", True),
+    ("rests", True),
+    ("at a restaurant", False),
+    ("restore", False),
+    ("interest", False),
+])
+def test_keywords_match_inflections_only(text, matched):
+    assert bool(_matched(text, [{"item": "rest", "keywords": ["rest"]}])) == matched
+
+
+def test_romanized_inflections():
+    matcher = KeywordMatcher([{"item": "medicine", "romanized_keywords": ["dawai"]}])
+    assert matcher.match(match_keys("dawaiyon se")) == {0}
+    assert matcher.match(match_keys("dawaikhana")) == set()
+    assert "yon" in ROMANIZED_ENDINGS
+
+
+def test_short_romanized_stems_match_whole_words():
+    matcher = KeywordMatcher([{"item": "pain", "romanized_keywords": ["dard"]}])
+    assert matcher.match(match_keys("dard hai")) == {0}
+    assert matcher.match(match_keys("dardon se")) == set()
+
+
+@pytest.mark.parametrize("text, romanized, matched", [
+    ("please do not come late", ["laat"], False),
+    ("keep the tape on", ["tap"], False),
+    ("i hate this", ["haath"], False),
+    ("laat maarta hai", ["laat"], True),
+    ("tap hai", ["tap"], True),
+    ("haath dhona", ["haath"], True),
+])
+def test_romanized_near_misses(text, romanized, matched):
+    matcher = KeywordMatcher([{"item": "x", "romanized_keywords": romanized}])
+    assert bool(matcher.match(match_keys(text))) == matched
+
+
+def test_english_keyword_words_skip_the_romanized_index():
+    # "sip" folds to the romanized keyword "sip" too, but is an English keyword of the node
+    checklist = [{"item": "sip", "keywords": ["sip"]}, {"item": "drink", "romanized_keywords": ["sip"]}]
+    assert KeywordMatcher(checklist).match(match_keys("sip it")) == {0}
+    assert KeywordMatcher(checklist).match(match_keys("seep it")) == {1}
+
+
+def test_trigger_groups_index_after_items():
+    matcher = KeywordMatcher([{"item": "a", "keywords": ["fever"]}], triggers=[(["bleeding"], ["khoon"])])
+    assert matcher.match(match_keys("khun")) == {1}
+    assert matcher.match(match_keys("fever and bleeding")) == {0, 1}
+
+
+@pytest.mark.parametrize("key, edits", [
+    ("fever", 0), ("bleed", 0), ("sujan", 0), ("108mg", 0),
+    ("bleeding", 1), ("headache", 1), ("swelling", 1),
+    ("convulsion", 1), ("dehydration", 2), ("breastfeeding", 2),
+])
+def test_fuzzy_edits(key, edits):
+    assert fuzzy_edits(key) == edits
+
+
+def test_fuzzy_edits_respects_the_threshold():
+    assert fuzzy_edits("dehydration", 1) == 1
+    assert fuzzy_edits("dehydration", 0) == 0
+
+
+FUZZY_CHECKLIST = [
+    {"item": "fever", "keywords": ["fever"]},
+    {"item": "bleeding", "keywords": ["bleeding"]},
+    {"item": "headache", "keywords": ["headache"]},
+    {"item": "dehydration", "keywords": ["dehydration"]},
+]
+
+
+@pytest.mark.parametrize("text, matched", [
+    ("any hedache", ["headache"]),
+    ("bleding at all", ["bleeding"]),
+    ("dehidratin signs", ["dehydration"]),
+    ("headaches and bleedings", ["bleeding", "headache"]),
+    # Near misses: other words, not typos
+    ("she never had it", []),
+    ("blinding light", []),
+    ("pleading with her", []),
+])
+def test_fuzzy_near_misses(text, matched):
+    matcher = KeywordMatcher(FUZZY_CHECKLIST, fuzzy=True)
+    assert sorted(FUZZY_CHECKLIST[i]["item"] for i in matcher.match(match_keys(text))) == matched
+
+
+@pytest.mark.parametrize("scenario_id, node_key, text", [
+    ("s1_antenatal", "fetal_movement", "Please do not come late to the clinic"),
+    ("s2_postnatal", "mother_health", "Keep the tape on"),
+    ("s2_postnatal", "hygiene", "I hate this"),
+])
+def test_bundled_scenarios_near_misses(scenario_id, node_key, text):
+    node = get_compiled_scenarios()[scenario_id].nodes[node_key]
+    assert evaluate_turn(text, node.checklist, node.matcher)["matched_items"] == []
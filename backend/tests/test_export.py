@@ -0,0 +1,50 @@
+import itertools
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import update
+
+from app.database import async_session
+from app.export import ExportFilters, iter_export
+from app.models import Session
+
+pytestmark = pytest.mark.anyio
+
+# Each test gets its own day, so sessions other tests created stay out of its export
+_days = (datetime(2001, 1, 1) + timedelta(days=n) for n in itertools.count())
+
+
+async def _export(fmt: str, filters: ExportFilters, include_turns: bool = True, **sizes) -> bytes:
+    return b"".join([chunk async for chunk in iter_export(fmt, filters, include_turns, **sizes)])
+
+
+async def _sessions(client, count: int, started_at: datetime) -> list[str]:
+    ids = []
+    for i in range(count):
+        r = await client.post("/sessions/start", json={"lang": "en", "scenario_id": "s1_antenatal"})
+        session_id = r.json()["session_id"]
+        for _ in range(i % 3):
+            r = await client.post(f"/sessions/{session_id}/turn", json={"node_key": "start", "user_text": "namaste didi"})
+            assert r.status_code == 200, r.text
+        ids.append(session_id)
+    # Ties on started_at are broken by id, across page boundaries too
+    async with async_session() as db:
+        await db.execute(update(Session).where(Session.id.in_(ids)).values(started_at=started_at))
+        await db.commit()
+    return ids
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+@pytest.mark.parametrize("include_turns", [True, False])
+async def test_paged_export_matches_a_single_page(client, fmt, include_turns):
+    day = next(_days)
+    ids = await _sessions(client, 7, day)
+    filters = ExportFilters(since=day, until=day + timedelta(days=1))
+    whole = await _export(fmt, filters, include_turns, page_size=1000)
+    assert await _export(fmt, filters, include_turns, page_size=2, chunk_size=3) == whole
+    if fmt == "ndjson":
+        lines = [json.loads(line) for line in whole.splitlines()]
+        assert [line["session_id"] for line in lines] == sorted(ids)
+        if include_turns:
+            assert sorted(len(line["turns"]) for line in lines) == [0, 0, 0, 1, 1, 2, 2]
@@ -0,0 +1,53 @@
+import unicodedata
+
+import pytest
+
+from app.normalization import fold_keys, match_keys, romanize
+
+
+@pytest.mark.parametrize("word, expected", [
+    ("खून", "khuun"),
+    ("पानी", "paanii"),
+    ("हलचल", "halchal"),  # medial schwa deleted
+    ("আরাম", "aaraam"),
+    ("রক্ত", "rakt"),  # virama
+    ("தலைவலி", "talaivali"),  # Tamil keeps its inherent vowels
+    ("ज़्यादा", "zyaadaa"),  # nukta
+    ("१०८", "108"),
+])
+def test_romanize(word, expected):
+    assert romanize(word) == expected
+
+
+def test_romanize_leaves_latin_alone():
+    assert romanize("headache") == "headache"
+    assert romanize("café") == "café"
+
+
+def test_native_script_and_romanized_spellings_fold_together():
+    assert fold_keys(match_keys("खून")) == fold_keys(match_keys("khoon")) == fold_keys(match_keys("khun")) == ["kun"]
+    assert fold_keys(match_keys("पानी")) == fold_keys(match_keys("paani"))
+    assert match_keys("खून") == ["kun"]  # native script is folded as it is keyed
+
+
+def test_latin_words_are_not_folded():
+    assert match_keys("ship shin bleeding Wash") == ["ship", "shin", "bleeding", "wash"]
+    assert fold_keys(match_keys("ship")) == ["sip"]  # only when compared as romanized Hindi
+
+
+def test_fold_keys_is_idempotent():
+    keys = fold_keys(match_keys("khoon shh bachcha zyaada sir-dard"))
+    assert fold_keys(keys) == keys
+
+
+def test_unicode_forms_and_invisible_characters():
+    composed = unicodedata.normalize("NFC", "ज़्यादा")
+    decomposed = unicodedata.normalize("NFD", "ज़्यादा")
+    assert match_keys(composed) == match_keys(decomposed)
+    assert match_keys("सिर‍दर्द") == match_keys("सिरदर्द")
+    assert match_keys("he­ad​ache") == match_keys("headache")
+
+
+def test_punctuation_of_any_script_breaks_words():
+    assert match_keys("Pain? BLEEDING!! पानी।दर्द") == match_keys("pain bleeding पानी दर्द")
+    assert match_keys("  ...  ") == []
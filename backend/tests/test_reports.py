@@ -0,0 +1,65 @@
+import random
+
+import pytest
+from sqlalchemy import update
+
+from app.database import async_session
+from app.evaluation import (
+    evaluate_turn, finalize_report, generate_report, new_report_state, transcript_entry, update_report_state,
+)
+from app.models import Session
+from app.scenario_loader import get_compiled_scenarios
+
+SCENARIO_IDS = sorted(get_compiled_scenarios())
+
+
+def _random_turns(scenario, rng: random.Random, count: int) -> list[tuple[str, str]]:
+    """(node_key, user_text) pairs: random nodes, utterances mixing their keywords with filler."""
+    node_keys = sorted(scenario.nodes)
+    turns = []
+    for _ in range(count):
+        node = scenario.nodes[rng.choice(node_keys)]
+        words = [kw for check in node.checklist for kw in (*check.keywords, *check.romanized)]
+        picked = rng.sample(words, k=min(len(words), rng.randint(0, 3)))
+        turns.append((node.key, " ".join([*picked, *rng.sample(["ok", "didi", "and", "please", "haan"], k=2)])))
+    return turns
+
+
+@pytest.mark.parametrize("scenario_id", SCENARIO_IDS)
+@pytest.mark.parametrize("seed", range(25))
+def test_running_aggregate_matches_generate_report(scenario_id, seed):
+    rng = random.Random(seed)
+    scenario = get_compiled_scenarios()[scenario_id]
+    state, transcript, turns = new_report_state(), [], []
+    for turn_index, (node_key, text) in enumerate(_random_turns(scenario, rng, rng.randint(0, 12)), start=1):
+        node = scenario.nodes[node_key]
+        result = evaluate_turn(text, node.checklist, node.matcher)
+        turn = {"node_key": node_key, "user_text": text, "turn_index": turn_index, **result}
+        update_report_state(state, result, node.checklist)
+        transcript.append(transcript_entry(turn, node.text("en")))
+        turns.append(turn)
+    assert finalize_report(state, transcript) == generate_report(turns, scenario.data)
+
+
+async def _play(client, turns: list[tuple[str, str]]) -> str:
+    r = await client.post("/sessions/start", json={"lang": "en", "scenario_id": "s2_postnatal"})
+    session_id = r.json()["session_id"]
+    for node_key, text in turns:
+        r = await client.post(f"/sessions/{session_id}/turn", json={"node_key": node_key, "user_text": text})
+        assert r.status_code == 200, r.text
+    return session_id
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("seed", range(5))
+async def test_sessions_without_running_aggregate_get_the_same_report(client, seed):
+    turns = _random_turns(get_compiled_scenarios()["s2_postnatal"], random.Random(seed), 8)
+    kept, migrated = await _play(client, turns), await _play(client, turns)
+    # As left by a database from before report_state existed
+    async with async_session() as db:
+        await db.execute(update(Session).where(Session.id == migrated).values(report_state=None))
+        await db.commit()
+
+    reports = [(await client.post(f"/sessions/{sid}/complete")).json()["report"] for sid in (kept, migrated)]
+    assert reports[0] == reports[1]
+    assert len(reports[0]["transcript"]) == len(turns)
@@ -0,0 +1,53 @@
+import pytest
+from sqlalchemy import select, update
+
+from app.analytics import rebuild_checklist_stats
+from app.database import async_session, engine
+from app.models import ChecklistItemStat, Session
+from app.rescoring import rescore
+
+pytestmark = pytest.mark.anyio
+
+STALE_REPORT = {
+    "score": 0, "critical_misses": [], "suggestions": [], "transcript": [],
+    "checklist_results": [{"item": "Removed item", "status": "missed", "is_critical": True}],
+}
+
+
+async def _stats() -> list[tuple]:
+    async with async_session() as db:
+        rows = await db.execute(select(ChecklistItemStat).order_by(
+            ChecklistItemStat.scenario_id, ChecklistItemStat.language, ChecklistItemStat.week, ChecklistItemStat.item,
+        ))
+        return [
+            (s.scenario_id, s.language, s.week, s.item, s.is_critical, s.sessions, s.matched, s.missed, s.critical_missed)
+            for s in rows.scalars()
+        ]
+
+
+async def _rebuild() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(rebuild_checklist_stats)
+
+
+async def test_rescore_moves_stats_to_the_new_reports(client):
+    texts = ["namaste didi", "any bleeding or headache", "khoon to nahi aaya", "take rest"]
+    body = {"sessions": [{
+        "lang": lang, "scenario_id": "s1_antenatal",
+        "turns": [{"node_key": "start", "user_text": text} for text in texts[:n]],
+    } for n in range(1, len(texts) + 1) for lang in ("en", "hi")]}
+    session_ids = [r["session_id"] for r in (await client.post("/sessions/batch-evaluate", json=body)).json()["results"]]
+
+    # Reports scored against some earlier version of the scenario, counted as such
+    async with async_session() as db:
+        await db.execute(update(Session).where(Session.id.in_(session_ids)).values(report_json=STALE_REPORT))
+        await db.commit()
+    await _rebuild()
+    assert any(row[3] == "Removed item" for row in await _stats())
+
+    stats = await rescore(["s1_antenatal"], chunk_size=3)
+    assert stats.reports >= len(session_ids)
+    adjusted = await _stats()
+    assert not any(row[3] == "Removed item" for row in adjusted)
+    await _rebuild()
+    assert adjusted == await _stats()
@@ -0,0 +1,40 @@
+from app import scenario_bundle
+from app.scenario_bundle import read_bundle, write_bundle
+from app.scenario_loader import get_compiled_scenarios
+
+_unpickled = []
+
+
+def _record():
+    _unpickled.append(True)
+    return "payload"
+
+
+class _SideEffect:
+    def __reduce__(self):
+        return _record, ()
+
+
+def test_bundle_round_trip(tmp_path):
+    path = str(tmp_path / "scenarios.bundle")
+    scenarios = get_compiled_scenarios()
+    write_bundle(scenarios, "abc", path)
+    content_hash, loaded = read_bundle(path)
+    assert content_hash == "abc"
+    assert loaded.keys() == scenarios.keys()
+
+
+def test_foreign_bundle_is_not_unpickled(tmp_path, monkeypatch):
+    path = str(tmp_path / "scenarios.bundle")
+    write_bundle({"x": _SideEffect()}, "abc", path)
+    _unpickled.clear()
+    monkeypatch.setattr(scenario_bundle, "compiler_fingerprint", lambda: "other code")
+    assert read_bundle(path) is None
+    assert not _unpickled
+
+
+def test_unreadable_bundle_is_ignored(tmp_path):
+    path = tmp_path / "scenarios.bundle"
+    path.write_bytes(b"\x80\x05 not a header")
+    assert read_bundle(str(path)) is None
+    assert read_bundle(str(tmp_path / "missing.bundle")) is None
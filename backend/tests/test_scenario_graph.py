@@ -0,0 +1,17 @@
+from app.scenario_graph import Branch
+
+
+def test_keyword_branch_fires_on_any_hit():
+    branch = Branch(frozenset({3, 4}), on_miss=False, next_node_key="x")
+    assert branch.fires({4})
+    assert branch.fires({0, 3, 4})
+    assert not branch.fires({0, 1})
+    assert not branch.fires(set())
+
+
+def test_critical_missed_branch_fires_unless_all_hit():
+    branch = Branch(frozenset({0, 1}), on_miss=True, next_node_key="x")
+    assert branch.fires(set())
+    assert branch.fires({0, 2})
+    assert not branch.fires({0, 1})
+    assert not branch.fires({0, 1, 2})
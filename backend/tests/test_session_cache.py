@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import select, update
+
+from app.database import async_session
+from app.models import Session
+from app.rescoring import rescore
+from app.routers import sessions
+from app.routers.sessions import session_cache
+from app.scenario_loader import get_compiled_scenario
+
+
+@pytest.fixture
+def cache():
+    """The process's cache, emptied around the test."""
+    session_cache.clear()
+    yield session_cache
+    session_cache.clear()
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Seconds on the cache's clock; advance with clock[0] += n."""
+    clock = [1000.0]
+    monkeypatch.setattr(sessions, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+    return clock
+
+
+def test_evicts_the_least_recently_used_past_max_entries(cache, clock, monkeypatch):
+    monkeypatch.setattr(cache, "max_entries", 2)
+    scenario = get_compiled_scenario("s1_antenatal")
+    evictions = cache.evictions.value
+    cache.put("a", scenario, "en", scenario.version)
+    cache.put("b", scenario, "en", scenario.version)
+    assert cache.get("a") is not None  # "b" is now the least recently used
+    cache.put("c", scenario, "en", scenario.version)
+    assert len(cache) == 2
+    assert cache.evictions.value == evictions + 1
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+
+
+def test_entries_expire_after_the_ttl_unless_renewed(cache, clock, monkeypatch):
+    monkeypatch.setattr(cache, "ttl", 60.0)
+    scenario = get_compiled_scenario("s1_antenatal")
+    cache.put("idle", scenario, "en", scenario.version)
+    cache.put("busy", scenario, "en", scenario.version)
+    clock[0] += 45
+    assert cache.get("busy") is not None
+    clock[0] += 45
+    assert cache.get("idle") is None
+    assert cache.get("busy") is not None
+
+
+@pytest.mark.anyio
+async def test_turn_bypasses_an_entry_a_rescore_re_pinned(client, cache):
+    r = await client.post("/sessions/start", json={"lang": "en", "scenario_id": "s1_antenatal"})
+    session_id = r.json()["session_id"]
+    current = get_compiled_scenario("s1_antenatal").version
+    assert cache.get(session_id).version == current
+
+    # Cached while the session was pinned to an older version, which a rescore then replaced
+    async with async_session() as db:
+        await db.execute(update(Session).where(Session.id == session_id).values(scenario_version="older"))
+        await db.commit()
+    cache.put(session_id, get_compiled_scenario("s1_antenatal"), "en", "older")
+    await rescore(["s1_antenatal"])
+
+    r = await client.post(f"/sessions/{session_id}/turn", json={"node_key": "start", "user_text": "namaste"})
+    assert r.status_code == 200, r.text
+    assert r.json()["progress"]["turn_index"] == 1
+    assert cache.get(session_id).version == current
+    async with async_session() as db:
+        assert await db.scalar(select(Session.scenario_version).where(Session.id == session_id)) == current
@@ -0,0 +1,54 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+from app.database import async_session
+from app.models import Session, SessionTurn
+
+pytestmark = pytest.mark.anyio
+
+
+async def _start(client, **extra) -> str:
+    r = await client.post("/sessions/start", json={"lang": "en", "scenario_id": "s1_antenatal", **extra})
+    assert r.status_code == 200, r.text
+    return r.json()["session_id"]
+
+
+async def test_concurrent_turns_get_consecutive_indexes(client):
+    session_id = await _start(client)
+    n = 30
+    responses = await asyncio.gather(*(
+        client.post(f"/sessions/{session_id}/turn", json={"node_key": "start", "user_text": f"namaste {i}"})
+        for i in range(n)
+    ))
+    assert all(r.status_code == 200 for r in responses), [r.text for r in responses if r.status_code != 200]
+    assert sorted(r.json()["progress"]["turn_index"] for r in responses) == list(range(1, n + 1))
+
+    async with async_session() as db:
+        stored = list(await db.scalars(
+            select(SessionTurn.turn_index).where(SessionTurn.session_id == session_id).order_by(SessionTurn.turn_index)
+        ))
+    assert stored == list(range(1, n + 1))
+
+    report = (await client.post(f"/sessions/{session_id}/complete")).json()["report"]
+    assert len(report["transcript"]) == n
+    assert sorted(entry["worker"] for entry in report["transcript"]) == sorted(f"namaste {i}" for i in range(n))
+
+
+async def test_replayed_batch_creates_one_session(client):
+    body = {"sessions": [{
+        "client_id": "offline-1", "device_id": "batch-replay", "lang": "en", "scenario_id": "s1_antenatal",
+        "turns": [{"node_key": "start", "user_text": "namaste"}],
+    }]}
+    first = (await client.post("/sessions/batch-evaluate", json=body)).json()
+    second = (await client.post("/sessions/batch-evaluate", json=body)).json()
+    assert (first["accepted"], first["duplicates"], first["failed"]) == (1, 0, 0)
+    assert (second["accepted"], second["duplicates"], second["failed"]) == (0, 1, 0)
+    assert second["results"][0]["duplicate"]
+    assert second["results"][0]["session_id"] == first["results"][0]["session_id"]
+    assert second["results"][0]["report"] == first["results"][0]["report"]
+
+    async with async_session() as db:
+        stored = await db.scalar(select(func.count()).select_from(Session).where(Session.device_id == "batch-replay"))
+    assert stored == 1
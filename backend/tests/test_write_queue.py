@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from sqlalchemy import insert, select
+
+from app.database import async_session
+from app.models import User
+from app.write_queue import WriteQueue
+
+pytestmark = pytest.mark.anyio
+
+
+def _add_user(device_id: str, fail: Exception | None = None):
+    async def op(db):
+        await db.execute(insert(User).values(device_id=device_id))
+        if fail is not None:
+            raise fail
+        return device_id
+    return op
+
+
+async def _stored(*device_ids: str) -> set[str]:
+    async with async_session() as db:
+        return set(await db.scalars(select(User.device_id).where(User.device_id.in_(device_ids))))
+
+
+async def test_failing_op_rolls_back_alone(app):
+    queue = WriteQueue(max_delay=0.05)
+    results = await asyncio.gather(
+        queue.submit(_add_user("wq-a")),
+        queue.submit(_add_user("wq-b", fail=KeyError("item"))),
+        queue.submit(_add_user("wq-c")),
+        return_exceptions=True,
+    )
+    await queue.stop()
+    assert results[0] == "wq-a" and results[2] == "wq-c"
+    assert isinstance(results[1], KeyError)
+    # Written before it raised, and rolled back with it
+    assert await _stored("wq-a", "wq-b", "wq-c") == {"wq-a", "wq-c"}
+
+
+async def test_constraint_violation_fails_only_its_op(app):
+    queue = WriteQueue(max_delay=0.05)
+    results = await asyncio.gather(
+        queue.submit(_add_user("wq-d")),
+        queue.submit(_add_user("wq-d")),
+        queue.submit(_add_user("wq-e")),
+        return_exceptions=True,
+    )
+    await queue.stop()
+    assert results[0] == "wq-d" and results[2] == "wq-e"
+    assert isinstance(results[1], Exception)
+    assert await _stored("wq-d", "wq-e") == {"wq-d", "wq-e"}